@@ -0,0 +1,33 @@
+"""add_subscriptions_period_end_index
+
+Revision ID: d4e5f6g7h8i9
+Revises: c3d4e5f6g7h8
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e5f6g7h8i9'
+down_revision: Union[str, Sequence[str], None] = 'c3d4e5f6g7h8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index the period end of active subscriptions for the rollover job."""
+    op.create_index(
+        'idx_subscriptions_current_period_end',
+        'subscriptions',
+        ['current_period_end'],
+        postgresql_where=sa.text("status = 'active'")
+    )
+
+
+def downgrade() -> None:
+    """Drop the period end index."""
+    op.drop_index('idx_subscriptions_current_period_end', table_name='subscriptions')
@@ -35,6 +35,17 @@ class Settings(BaseSettings):
     jwt_algorithm: str = "HS256"
     jwt_expire_minutes: int = 60 * 24 * 7  # 7 days
 
+    # Verified JWT cache (per process), entries live until token exp
+    token_cache_max_size: int = 10_000
+
+    # Plan catalog (per process) and Cache-Control max-age of plan responses
+    plan_catalog_ttl_seconds: float = 300.0
+    plan_cache_max_age_seconds: int = 300
+
+    # Authenticated principal cache (per process)
+    principal_cache_ttl_seconds: int = 30
+    principal_cache_max_size: int = 10_000
+
     # Session (for OAuth state management)
     session_secret_key: str = "change-me-in-production-session"
 
@@ -46,10 +57,69 @@ class Settings(BaseSettings):
     deepgram_api_key: str = ""
     deepgram_model: str = "nova-3"
     deepgram_language: str = "multi"
+    deepgram_max_concurrency: int = 64
+    deepgram_max_keepalive_connections: int = 20
+    deepgram_live_url: str = "wss://api.deepgram.com/v1/listen"
+    deepgram_slow_call_seconds: float = 20.0
+
+    # Long recordings are split into segments transcribed in parallel
+    deepgram_chunk_min_seconds: int = 300
+    deepgram_chunk_seconds: int = 120
+    deepgram_chunk_parallelism: int = 8
+
+    # Asynchronous transcription pipeline (in-process workers)
+    transcription_workers: int = 8
+    transcription_queue_size: int = 100
+
+    # Background failure of recordings stuck in TRANSCRIBING (crashed or
+    # killed worker), releasing their quota unit. The age must exceed the
+    # longest transcription, i.e. a live session of the longest plan limit.
+    stale_recording_sweep_interval_seconds: float = 300.0
+    stale_recording_after_seconds: float = 7200.0
+
+    # Background expiry of trials past their end date
+    trial_sweep_interval_seconds: float = 300.0
+
+    # Background renewal of billing periods (quota refill from the plan)
+    period_rollover_interval_seconds: float = 3600.0
+    period_rollover_batch_size: int = 1000
 
     # External Services - LLM
     mistral_api_key: str = ""
     llm_provider: Literal["mistral", "azure_openai"] = "mistral"
+    llm_max_connections: int = 32
+    llm_max_keepalive_connections: int = 10
+    llm_timeout_seconds: int = 60
+
+    # Secondary LLM for hedged/failover requests (disabled when empty).
+    # Only Mistral: the Azure OpenAI client cannot extract SOAP notes yet
+    llm_fallback_provider: Literal["", "mistral"] = ""
+    llm_fallback_model: str = "mistral-small-latest"
+    llm_hedge_percentile: float = 0.95
+    llm_hedge_min_delay_seconds: float = 10.0
+    llm_slow_call_seconds: float = 25.0
+
+    # Transcripts above the threshold are extracted as overlapping chunks
+    # (map) whose partial notes are merged (reduce)
+    llm_map_reduce_threshold_tokens: int = 12000
+    llm_map_reduce_chunk_tokens: int = 6000
+    llm_map_reduce_overlap_tokens: int = 300
+    llm_map_reduce_parallelism: int = 4
+
+    # Circuit breakers around Deepgram and LLM calls
+    circuit_breaker_failure_threshold: int = 5
+    circuit_breaker_reset_seconds: float = 30.0
+
+    # End-to-end request deadlines; provider timeouts, retries and retry
+    # waits are sized from the time left (recording + note uses the sum)
+    transcription_deadline_seconds: float = 30.0
+    note_deadline_seconds: float = 60.0
+
+    # LLM result cache (per process), entries are encrypted with this
+    # Fernet key; a random key is generated at startup when empty
+    llm_result_cache_ttl_seconds: int = 3600
+    llm_result_cache_max_size: int = 1000
+    llm_result_cache_encryption_key: str = ""
 
     # Azure OpenAI (alternative)
     azure_openai_endpoint: str = ""
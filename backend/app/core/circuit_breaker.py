@@ -0,0 +1,238 @@
+"""Circuit breaker for calls to external providers (Deepgram, LLM).
+
+After a run of failed or too slow calls the circuit opens and further
+calls fail immediately instead of waiting for timeouts and retries, so
+workers, database connections and sockets stay available for other
+traffic during a provider incident. Once the reset timeout has elapsed
+the circuit half-opens: a probe call is let through, and its outcome
+closes the circuit again or re-opens it.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker states."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open."""
+
+    def __init__(self, name: str, retry_after_seconds: float) -> None:
+        """
+        Initialize the error.
+
+        Args:
+            name: Name of the protected provider
+            retry_after_seconds: Time until the next probe is allowed
+        """
+        self.name = name
+        self.retry_after_seconds = retry_after_seconds
+        super().__init__(
+            f"{name} unavailable (circuit open, retry in {retry_after_seconds:.0f}s)"
+        )
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker with half-open probes.
+
+    Args:
+        name: Name of the protected provider, used in logs and health output
+        failure_threshold: Consecutive failures (or slow calls) opening the circuit
+        reset_timeout_seconds: Time the circuit stays open before a probe
+        slow_call_seconds: Optional duration above which a successful call
+            counts as a failure
+        half_open_max_calls: Concurrent probe calls allowed when half-open
+        is_failure: Optional predicate telling whether an exception reflects
+            a provider problem (e.g. not a 4xx caused by the request);
+            every exception counts by default
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout_seconds: float = 30.0,
+        slow_call_seconds: float | None = None,
+        half_open_max_calls: int = 1,
+        is_failure: Callable[[BaseException], bool] | None = None,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.slow_call_seconds = slow_call_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self._is_failure = is_failure or (lambda exc: True)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Close the circuit and clear counters."""
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+            self._opened_at = 0.0
+            self._probes = 0
+            self.times_opened = 0
+            self.rejected = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state, half-open once the reset timeout has elapsed."""
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now: float) -> CircuitState:
+        """Move an open circuit to half-open when its timeout elapsed (lock held)."""
+        if (
+            self._state is CircuitState.OPEN
+            and now - self._opened_at >= self.reset_timeout_seconds
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def _before_call(self) -> None:
+        """
+        Admit a call or reject it.
+
+        Raises:
+            CircuitOpenError: If the circuit is open or the probe slots are taken
+        """
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            if state is CircuitState.CLOSED:
+                return
+            if state is CircuitState.HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return
+            self.rejected += 1
+            retry_after = max(0.0, self._opened_at + self.reset_timeout_seconds - now)
+        raise CircuitOpenError(self.name, retry_after)
+
+    def _release(self) -> None:
+        """Free the probe slot of an admitted call that ended without an outcome."""
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+
+    def _record(self, failed: bool) -> None:
+        """Update the state with the outcome of an admitted call."""
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+            if not failed:
+                if self._state is not CircuitState.CLOSED:
+                    logger.info("Circuit %s closed", self.name)
+                self._state = CircuitState.CLOSED
+                self._failures = 0
+                return
+            self._failures += 1
+            if self._state is CircuitState.HALF_OPEN or (
+                self._failures >= self.failure_threshold
+            ):
+                if self._state is not CircuitState.OPEN:
+                    self.times_opened += 1
+                    logger.warning(
+                        "Circuit %s opened after %d failures", self.name, self._failures
+                    )
+                self._state = CircuitState.OPEN
+                self._opened_at = time.monotonic()
+
+    @asynccontextmanager
+    async def guard(self, timed: bool = True) -> AsyncIterator[None]:
+        """
+        Protect the calls made inside the block.
+
+        Args:
+            timed: Count a block slower than slow_call_seconds as a failure;
+                False for blocks spanning several calls (e.g. the segments
+                of one recording), whose duration says nothing of one call
+
+        Raises:
+            CircuitOpenError: Without running the block, if the circuit is open
+        """
+        self._before_call()
+        start = time.monotonic()
+        try:
+            yield
+        except Exception as exc:
+            self._record(failed=self._is_failure(exc))
+            raise
+        except BaseException:
+            # Cancellation (e.g. a hedged request losing, or a sibling segment
+            # failing) says nothing of the provider: neither success nor failure
+            self._release()
+            raise
+        elapsed = time.monotonic() - start
+        slow = (
+            timed and self.slow_call_seconds is not None and elapsed > self.slow_call_seconds
+        )
+        if slow:
+            logger.warning("Slow call to %s: %.1fs", self.name, elapsed)
+        self._record(failed=slow)
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Get the breaker state for monitoring.
+
+        Returns:
+            Dictionary with state, consecutive failures, open count and rejections
+        """
+        state = self.state
+        return {
+            "state": state.value,
+            "consecutiveFailures": self._failures,
+            "timesOpened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def circuit_breaker(name: str, **kwargs: Any) -> CircuitBreaker:
+    """
+    Get or create the process-wide circuit breaker of a provider.
+
+    Args:
+        name: Provider name
+        **kwargs: CircuitBreaker options, used on creation only
+
+    Returns:
+        The provider's CircuitBreaker
+    """
+    breaker = _breakers.get(name)
+    if breaker is None:
+        breaker = _breakers[name] = CircuitBreaker(name, **kwargs)
+    return breaker
+
+
+def circuit_breaker_states() -> dict[str, dict[str, Any]]:
+    """
+    Get the state of every circuit breaker.
+
+    Returns:
+        Breaker snapshots keyed by provider name
+    """
+    return {name: breaker.snapshot() for name, breaker in _breakers.items()}
+
+
+def reset_circuit_breakers() -> None:
+    """Close every circuit (tests and manual recovery)."""
+    for breaker in _breakers.values():
+        breaker.reset()
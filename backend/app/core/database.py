@@ -50,3 +50,32 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             raise
         finally:
             await session.close()
+
+
+def get_session_maker() -> async_sessionmaker[AsyncSession]:
+    """
+    Dependency that provides the session factory.
+
+    For work that outlives the request's get_db session, e.g. the body
+    of a streamed response, which runs after that session is closed.
+
+    Returns:
+        The application's session factory
+    """
+    return async_session_maker
+
+
+async def release_connection(db: AsyncSession) -> None:
+    """
+    Commit the session's current transaction and return its connection to the pool.
+
+    Call this before awaiting a slow external service (Deepgram, LLM) so the
+    pooled connection is not held for the duration of the call. The session
+    stays usable: loaded objects keep their state (expire_on_commit=False)
+    and the next query transparently checks out a new connection.
+
+    Args:
+        db: Database session
+    """
+    if db.in_transaction():
+        await db.commit()
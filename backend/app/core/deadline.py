@@ -0,0 +1,162 @@
+"""Per-request deadlines for calls to external providers.
+
+An endpoint creates a Deadline from its end-to-end latency budget and
+passes it down to the transcription and extraction services, which size
+provider timeouts, retry waits and the number of attempts from the time
+that is left instead of fixed values.
+"""
+
+import threading
+import time
+from collections import Counter
+
+from tenacity import RetryCallState
+from tenacity.stop import stop_base
+from tenacity.wait import wait_base
+
+
+class DeadlineExceededError(Exception):
+    """Raised when a request has no time left for a stage."""
+
+    def __init__(self, stage: str) -> None:
+        """
+        Initialize the error.
+
+        Args:
+            stage: Stage that could not run in time (e.g. "transcription")
+        """
+        self.stage = stage
+        super().__init__(f"Deadline exceeded before {stage}")
+
+
+class Deadline:
+    """
+    Point in time by which a request must be answered.
+
+    Args:
+        budget_seconds: Time allowed from now
+    """
+
+    def __init__(self, budget_seconds: float) -> None:
+        self.budget_seconds = budget_seconds
+        self.expires_at = time.monotonic() + budget_seconds
+
+    def remaining(self) -> float:
+        """Seconds left, 0 once expired."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """Whether no time is left."""
+        return self.remaining() <= 0
+
+    def timeout(self, cap: float) -> float:
+        """
+        Bound a provider timeout by the remaining time.
+
+        Args:
+            cap: The provider's usual timeout in seconds
+
+        Returns:
+            The smaller of cap and the remaining time
+        """
+        return min(cap, self.remaining())
+
+    def check(self, stage: str) -> None:
+        """
+        Ensure there is time left before starting a stage.
+
+        Args:
+            stage: Stage about to run, used in the metric
+
+        Raises:
+            DeadlineExceededError: If the deadline has passed
+        """
+        if self.expired:
+            record_deadline_exceeded(stage)
+            raise DeadlineExceededError(stage)
+
+
+_exceeded: Counter[str] = Counter()
+_lock = threading.Lock()
+
+
+def record_deadline_exceeded(stage: str) -> None:
+    """
+    Count a request that ran out of time.
+
+    Args:
+        stage: Stage during which the deadline was exceeded
+    """
+    with _lock:
+        _exceeded[stage] += 1
+
+
+def deadline_stats() -> dict[str, int]:
+    """
+    Get the deadline-exceeded counters for monitoring.
+
+    Returns:
+        Number of exceeded deadlines per stage
+    """
+    with _lock:
+        return dict(_exceeded)
+
+
+def reset_deadline_stats() -> None:
+    """Reset the deadline-exceeded counters."""
+    with _lock:
+        _exceeded.clear()
+
+
+def _deadline_of(retry_state: RetryCallState) -> Deadline | None:
+    """Get the deadline passed as keyword argument to the retried function."""
+    deadline = retry_state.kwargs.get("deadline")
+    return deadline if isinstance(deadline, Deadline) else None
+
+
+class wait_within_deadline(wait_base):  # noqa: N801 - tenacity naming
+    """
+    Tenacity wait capped so an attempt still fits before the deadline.
+
+    The retried function must receive its Deadline as the "deadline"
+    keyword argument; without one the base wait is used unchanged.
+
+    Args:
+        base: Wait strategy used when time allows
+        min_attempt_seconds: Time an attempt needs to be worth making
+    """
+
+    def __init__(self, base: wait_base, min_attempt_seconds: float) -> None:
+        self.base = base
+        self.min_attempt_seconds = min_attempt_seconds
+
+    def __call__(self, retry_state: RetryCallState) -> float:
+        wait = self.base(retry_state)
+        deadline = _deadline_of(retry_state)
+        if deadline is None:
+            return wait
+        return max(0.0, min(wait, deadline.remaining() - self.min_attempt_seconds))
+
+
+class stop_at_deadline(stop_base):  # noqa: N801 - tenacity naming
+    """
+    Tenacity stop when too little time is left for another attempt.
+
+    The retried function must receive its Deadline as the "deadline"
+    keyword argument; without one this never stops. Combine it with
+    wait_within_deadline, which shortens the wait so that an attempt
+    still gets min_attempt_seconds.
+
+    Args:
+        min_attempt_seconds: Time an attempt needs to be worth making
+    """
+
+    def __init__(self, min_attempt_seconds: float) -> None:
+        self.min_attempt_seconds = min_attempt_seconds
+
+    def __call__(self, retry_state: RetryCallState) -> bool:
+        deadline = _deadline_of(retry_state)
+        if deadline is None:
+            return False
+        return deadline.remaining() < self.min_attempt_seconds
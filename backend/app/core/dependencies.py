@@ -1,41 +1,70 @@
-"""FastAPI dependencies for authentication and authorization."""
+"""FastAPI dependencies for authentication and authorization.
+
+Authenticated principals are cached in-process (see app.core.principal)
+so most authenticated requests skip the database round trip entirely.
+"""
 
 from typing import Annotated
 from uuid import UUID
 
 from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import HTTPConnection
 
 from app.core.database import get_db
 from app.core.exceptions import UnauthorizedException
+from app.core.principal import AuthPrincipal, principal_cache
 from app.core.security import (
     InvalidTokenError,
     TokenExpiredError,
     verify_token,
 )
-from app.models.user import User
 from app.services import auth as auth_service
 
 # Cookie name for authentication token
 COOKIE_NAME = "access_token"
 
 
+async def _load_principal(db: AsyncSession, user_id: UUID) -> AuthPrincipal | None:
+    """
+    Get a principal from the in-process cache, loading it on a miss.
+
+    Args:
+        db: Database session (only used on a cache miss)
+        user_id: User's UUID
+
+    Returns:
+        The AuthPrincipal, or None if the user does not exist
+    """
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        principal = await auth_service.get_auth_principal(db, user_id)
+        if principal is not None:
+            principal_cache.set(user_id, principal)
+    return principal
+
+
 async def get_current_user(
-    request: Request,
+    request: HTTPConnection,
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> User:
+) -> AuthPrincipal:
     """
     FastAPI dependency to get the current authenticated user.
 
     Extracts the JWT from the httpOnly cookie, verifies it,
-    and returns the corresponding user from the database.
+    and returns the corresponding user principal.
+
+    The principal is a lightweight snapshot (profile, admin flag and
+    subscription status) served from the principal cache, or loaded in a
+    single query on a miss. Endpoints that need a user's recordings or
+    quota must query them explicitly.
 
     Args:
-        request: FastAPI request object containing cookies
+        request: Incoming request or WebSocket containing cookies
         db: Database session
 
     Returns:
-        The authenticated User
+        The authenticated AuthPrincipal
 
     Raises:
         UnauthorizedException: If not authenticated, token invalid/expired,
@@ -44,7 +73,7 @@ async def get_current_user(
     Usage:
         @router.get("/protected")
         async def protected_route(
-            current_user: Annotated[User, Depends(get_current_user)]
+            current_user: Annotated[AuthPrincipal, Depends(get_current_user)]
         ):
             return {"user_id": current_user.id}
     """
@@ -87,8 +116,8 @@ async def get_current_user(
             code="INVALID_TOKEN",
         )
 
-    # Get user from database
-    user = await auth_service.get_user_by_id(db, user_id)
+    # Get principal from cache or database
+    user = await _load_principal(db, user_id)
     if not user:
         raise UnauthorizedException(
             message="User not found",
@@ -101,7 +130,7 @@ async def get_current_user(
 async def get_current_user_optional(
     request: Request,
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> User | None:
+) -> AuthPrincipal | None:
     """
     FastAPI dependency to optionally get the current user.
 
@@ -113,12 +142,12 @@ async def get_current_user_optional(
         db: Database session
 
     Returns:
-        The authenticated User or None if not authenticated
+        The authenticated AuthPrincipal or None if not authenticated
 
     Usage:
         @router.get("/public")
         async def public_route(
-            current_user: Annotated[User | None, Depends(get_current_user_optional)]
+            current_user: Annotated[AuthPrincipal | None, Depends(get_current_user_optional)]
         ):
             if current_user:
                 return {"authenticated": True, "user_id": current_user.id}
@@ -142,12 +171,12 @@ async def get_current_user_optional(
     except ValueError:
         return None
 
-    return await auth_service.get_user_by_id(db, user_id)
+    return await _load_principal(db, user_id)
 
 
 async def get_current_admin_user(
-    current_user: Annotated[User, Depends(get_current_user)],
-) -> User:
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
+) -> AuthPrincipal:
     """
     FastAPI dependency to get the current user and verify admin privileges.
 
@@ -155,7 +184,7 @@ async def get_current_admin_user(
         current_user: The authenticated user
 
     Returns:
-        The authenticated admin User
+        The authenticated admin AuthPrincipal
 
     Raises:
         UnauthorizedException: If user is not an admin
@@ -163,7 +192,7 @@ async def get_current_admin_user(
     Usage:
         @router.get("/admin/dashboard")
         async def admin_dashboard(
-            admin: Annotated[User, Depends(get_current_admin_user)]
+            admin: Annotated[AuthPrincipal, Depends(get_current_admin_user)]
         ):
             return {"admin_id": admin.id}
     """
@@ -176,6 +205,6 @@ async def get_current_admin_user(
 
 
 # Type aliases for cleaner dependency injection
-CurrentUser = Annotated[User, Depends(get_current_user)]
-OptionalUser = Annotated[User | None, Depends(get_current_user_optional)]
-AdminUser = Annotated[User, Depends(get_current_admin_user)]
+CurrentUser = Annotated[AuthPrincipal, Depends(get_current_user)]
+OptionalUser = Annotated[AuthPrincipal | None, Depends(get_current_user_optional)]
+AdminUser = Annotated[AuthPrincipal, Depends(get_current_admin_user)]
@@ -121,6 +121,28 @@ class RateLimitedException(ApiException):
         )
 
 
+def error_body(exc: ApiException) -> dict[str, Any]:
+    """
+    Build the standardized error body for an ApiException.
+
+    Shared by the HTTP exception handler and WebSocket endpoints, which
+    send the same body as a JSON message before closing.
+
+    Args:
+        exc: The raised ApiException
+
+    Returns:
+        Dictionary with the error code, message and details
+    """
+    return {
+        "error": {
+            "code": exc.code,
+            "message": exc.message,
+            "details": exc.details,
+        }
+    }
+
+
 async def api_exception_handler(request: Request, exc: ApiException) -> JSONResponse:
     """
     Handle ApiException and return standardized error response.
@@ -134,11 +156,5 @@ async def api_exception_handler(request: Request, exc: ApiException) -> JSONResp
     """
     return JSONResponse(
         status_code=exc.status_code,
-        content={
-            "error": {
-                "code": exc.code,
-                "message": exc.message,
-                "details": exc.details,
-            }
-        },
+        content=error_body(exc),
     )
@@ -0,0 +1,237 @@
+"""Background job queue abstraction with an in-process asyncio implementation.
+
+The queue interface is deliberately small (start/stop/enqueue) so the
+in-process implementation can later be swapped for an external broker
+(Redis, SQS, ...) without touching the endpoints that enqueue work.
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from typing import Generic, TypeVar
+
+import sentry_sdk
+
+logger = logging.getLogger(__name__)
+
+J = TypeVar("J")
+
+
+class JobQueueFullError(Exception):
+    """Raised when a job cannot be enqueued because the queue is full."""
+
+    pass
+
+
+class BaseJobQueue(ABC, Generic[J]):
+    """Abstract interface for background job queues."""
+
+    @abstractmethod
+    async def start(self) -> None:
+        """Start consuming jobs."""
+        ...
+
+    @abstractmethod
+    async def stop(self) -> None:
+        """Stop consuming jobs, giving in-flight jobs a chance to finish."""
+        ...
+
+    @abstractmethod
+    async def enqueue(self, job: J) -> None:
+        """
+        Submit a job for background processing.
+
+        Args:
+            job: Job payload
+
+        Raises:
+            JobQueueFullError: If the queue cannot accept more jobs
+        """
+        ...
+
+
+class InProcessJobQueue(BaseJobQueue[J]):
+    """
+    Bounded asyncio queue consumed by a fixed pool of worker tasks.
+
+    Jobs live only in process memory: they are lost if the process dies,
+    which is why `on_abandon` is called for jobs still queued at shutdown
+    and for jobs interrupted when the workers are cancelled.
+
+    Args:
+        handler: Coroutine function processing one job
+        workers: Number of concurrent worker tasks
+        max_size: Maximum number of queued (not yet started) jobs
+        on_abandon: Optional coroutine function called for jobs that are
+            still queued or in progress when the queue stops
+        shutdown_timeout: Seconds to wait for queued jobs to drain on stop
+        name: Queue name used in logs and task names
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[J], Awaitable[None]],
+        workers: int,
+        max_size: int,
+        on_abandon: Callable[[J], Awaitable[None]] | None = None,
+        shutdown_timeout: float = 30.0,
+        name: str = "jobs",
+    ) -> None:
+        self.handler = handler
+        self.workers = workers
+        self.on_abandon = on_abandon
+        self.shutdown_timeout = shutdown_timeout
+        self.name = name
+        self._queue: asyncio.Queue[J] = asyncio.Queue(maxsize=max_size)
+        self._tasks: list[asyncio.Task[None]] = []
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs waiting for a worker."""
+        return self._queue.qsize()
+
+    @property
+    def running(self) -> bool:
+        """Whether worker tasks are running."""
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        """Spawn the worker tasks (idempotent)."""
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"{self.name}-worker-{i}")
+            for i in range(self.workers)
+        ]
+        logger.info("Started %d %s workers", self.workers, self.name)
+
+    async def stop(self) -> None:
+        """Drain the queue (bounded by shutdown_timeout), then cancel workers."""
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=self.shutdown_timeout)
+        except TimeoutError:
+            logger.warning(
+                "%s queue did not drain within %.0fs, %d jobs abandoned",
+                self.name,
+                self.shutdown_timeout,
+                self._queue.qsize(),
+            )
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        while not self._queue.empty():
+            job = self._queue.get_nowait()
+            self._queue.task_done()
+            await self._abandon(job)
+
+    async def enqueue(self, job: J) -> None:
+        """
+        Submit a job without waiting for queue space.
+
+        Args:
+            job: Job payload
+
+        Raises:
+            JobQueueFullError: If max_size jobs are already waiting
+        """
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull as e:
+            raise JobQueueFullError(f"{self.name} queue is full") from e
+
+    async def _worker(self) -> None:
+        """Process jobs forever; a failing job never kills the worker."""
+        while True:
+            job = await self._queue.get()
+            try:
+                await self.handler(job)
+            except asyncio.CancelledError:
+                # Stopped mid-job: the job will never finish
+                await self._abandon(job)
+                raise
+            except Exception as e:
+                logger.error("Unhandled error in %s job: %s", self.name, e, exc_info=True)
+                sentry_sdk.capture_exception(e)
+            finally:
+                self._queue.task_done()
+
+    async def _abandon(self, job: J) -> None:
+        """Pass a job that will not run to completion to on_abandon, never raising."""
+        if self.on_abandon is None:
+            return
+        try:
+            await self.on_abandon(job)
+        except Exception as e:
+            logger.error("Error abandoning %s job: %s", self.name, e, exc_info=True)
+            sentry_sdk.capture_exception(e)
+
+
+class PeriodicTask:
+    """
+    Coroutine run at a fixed interval by a single background task.
+
+    Used for set-based maintenance (e.g. expiring trials) that would
+    otherwise be done row by row on the request path. A failing run is
+    logged and reported, and the next run happens at the next interval.
+
+    Args:
+        func: Coroutine function run at each interval
+        interval_seconds: Time between the end of a run and the next one
+        name: Task name used in logs
+        run_on_start: Run once immediately when started
+    """
+
+    def __init__(
+        self,
+        func: Callable[[], Awaitable[object]],
+        interval_seconds: float,
+        name: str = "periodic",
+        run_on_start: bool = True,
+    ) -> None:
+        self.func = func
+        self.interval_seconds = interval_seconds
+        self.name = name
+        self.run_on_start = run_on_start
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the background task is running."""
+        return self._task is not None
+
+    async def start(self) -> None:
+        """Spawn the background task (idempotent)."""
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._loop(), name=self.name)
+        logger.info("Started %s every %.0fs", self.name, self.interval_seconds)
+
+    async def stop(self) -> None:
+        """Cancel the background task, interrupting a run in progress."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def run_once(self) -> None:
+        """Run the coroutine now; a failure is logged, never raised."""
+        try:
+            await self.func()
+        except Exception as e:
+            logger.error("Unhandled error in %s: %s", self.name, e, exc_info=True)
+            sentry_sdk.capture_exception(e)
+
+    async def _loop(self) -> None:
+        """Run forever at the configured interval."""
+        if not self.run_on_start:
+            await asyncio.sleep(self.interval_seconds)
+        while True:
+            await self.run_once()
+            await asyncio.sleep(self.interval_seconds)
@@ -0,0 +1,70 @@
+"""Authenticated principal snapshot and its in-process cache."""
+
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+from app.config import get_settings
+from app.core.cache import TTLCache
+
+settings = get_settings()
+
+
+@dataclass(frozen=True, slots=True)
+class AuthPrincipal:
+    """
+    Lightweight, immutable snapshot of an authenticated user.
+
+    Returned by the authentication dependencies instead of a session-bound
+    User so it can be cached across requests. It carries no relationships:
+    endpoints that need a user's recordings or full subscription (quota)
+    must query them explicitly.
+
+    Attributes:
+        id: User's UUID
+        email: User's email address
+        name: User's display name
+        avatar_url: URL to user's profile picture
+        is_admin: Whether the user has admin privileges
+        created_at: When the user was created
+        updated_at: When the user was last updated
+        subscription_status: Status of the user's subscription, if any
+        plan_id: Plan of the user's subscription, if any
+        trial_ends_at: End of the trial period, if any
+    """
+
+    id: UUID
+    email: str
+    name: str | None
+    avatar_url: str | None
+    is_admin: bool
+    created_at: datetime
+    updated_at: datetime
+    subscription_status: str | None = None
+    plan_id: UUID | None = None
+    trial_ends_at: datetime | None = None
+
+    @property
+    def has_subscription(self) -> bool:
+        """Check if the user has any subscription."""
+        return self.subscription_status is not None
+
+
+# Principal cache: user id -> AuthPrincipal
+principal_cache: TTLCache[UUID, AuthPrincipal] = TTLCache(
+    max_size=settings.principal_cache_max_size,
+    ttl_seconds=settings.principal_cache_ttl_seconds,
+)
+
+
+def invalidate_principal(user_id: UUID) -> None:
+    """
+    Drop a user's cached principal.
+
+    Must be called whenever a field of AuthPrincipal changes (profile,
+    admin flag, subscription status or plan) so the next request reloads it.
+
+    Args:
+        user_id: User's UUID
+    """
+    principal_cache.pop(user_id)
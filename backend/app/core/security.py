@@ -1,5 +1,7 @@
 """JWT token creation and verification utilities."""
 
+import hashlib
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Any
 from uuid import UUID
@@ -7,9 +9,20 @@ from uuid import UUID
 from jose import JWTError, jwt
 
 from app.config import get_settings
+from app.core.cache import TTLCache
 
 settings = get_settings()
 
+# Verified-token cache: sha256(token) -> validated payload, kept until the
+# token's exp. The same cookie is presented on every request of a session,
+# so this skips the base64/JSON/HMAC work of jwt.decode on repeat requests.
+# Only successfully verified tokens are stored, keyed by a hash of the
+# whole token (signature included), so a forged token can never hit.
+verified_token_cache: TTLCache[bytes, dict[str, Any]] = TTLCache(
+    max_size=settings.token_cache_max_size,
+    ttl_seconds=settings.jwt_expire_minutes * 60,
+)
+
 
 class TokenError(Exception):
     """Base exception for token-related errors."""
@@ -65,10 +78,18 @@ def create_access_token(
     )
 
 
+def _token_cache_key(token: str) -> bytes:
+    """Hash a token for use as a verification cache key."""
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
 def verify_token(token: str) -> dict[str, Any]:
     """
     Verify and decode a JWT token.
 
+    Successfully verified payloads are cached until the token expires,
+    so repeated verification of the same token skips jwt.decode.
+
     Args:
         token: The JWT token string to verify
 
@@ -79,18 +100,41 @@ def verify_token(token: str) -> dict[str, Any]:
         TokenExpiredError: If the token has expired
         InvalidTokenError: If the token is invalid or malformed
     """
+    key = _token_cache_key(token)
+    cached = verified_token_cache.get(key)
+    if cached is not None:
+        exp = cached.get("exp")
+        if exp is not None and exp <= time.time():
+            verified_token_cache.pop(key)
+            raise TokenExpiredError("Token has expired")
+        return dict(cached)
+
     try:
         payload = jwt.decode(
             token,
             settings.jwt_secret_key,
             algorithms=[settings.jwt_algorithm],
         )
-        return payload
     except jwt.ExpiredSignatureError as e:
         raise TokenExpiredError("Token has expired") from e
     except JWTError as e:
         raise InvalidTokenError("Invalid token") from e
 
+    exp = payload.get("exp")
+    ttl_seconds = exp - time.time() if isinstance(exp, (int, float)) else None
+    verified_token_cache.set(key, dict(payload), ttl_seconds=ttl_seconds)
+    return payload
+
+
+def forget_token(token: str) -> None:
+    """
+    Drop a token from the verification cache (e.g. on logout).
+
+    Args:
+        token: The JWT token string
+    """
+    verified_token_cache.pop(_token_cache_key(token))
+
 
 def get_token_payload(token: str) -> dict[str, Any]:
     """
@@ -0,0 +1,62 @@
+"""Server-Sent Events (SSE) helpers for streaming progress to the client."""
+
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+SSE_MEDIA_TYPE = "text/event-stream"
+
+
+def wants_event_stream(request: Request) -> bool:
+    """
+    Check whether the client asked for an SSE response.
+
+    Args:
+        request: FastAPI request object
+
+    Returns:
+        True if the Accept header includes text/event-stream
+    """
+    return SSE_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def format_sse(event: str, data: Any) -> str:
+    """
+    Serialize one SSE event with a JSON payload.
+
+    Args:
+        event: Event name
+        data: JSON-serializable payload, or a Pydantic model (serialized
+            with its field aliases, like API responses)
+
+    Returns:
+        The event in text/event-stream wire format
+    """
+    if isinstance(data, BaseModel):
+        data = data.model_dump(mode="json", by_alias=True)
+    payload = json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+def event_stream_response(events: AsyncIterator[str]) -> StreamingResponse:
+    """
+    Wrap formatted SSE events in a streaming response.
+
+    Disables caching and proxy buffering so events reach the client as
+    soon as they are yielded.
+
+    Args:
+        events: Async iterator of events formatted with format_sse
+
+    Returns:
+        StreamingResponse with the text/event-stream media type
+    """
+    return StreamingResponse(
+        events,
+        media_type=SSE_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,7 +1,7 @@
 """FastAPI application entry point."""
 
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 
 import sentry_sdk
 from fastapi import FastAPI
@@ -9,8 +9,18 @@ from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
 from app.config import get_settings
+from app.core.circuit_breaker import circuit_breaker_states
+from app.core.deadline import deadline_stats
 from app.core.exceptions import ApiException, api_exception_handler
+from app.core.principal import principal_cache
 from app.routers import auth, notes, plans, recordings, subscriptions
+from app.services import deepgram
+from app.services.llm.factory import close_llm_clients, get_llm_client
+from app.services.llm.prompts.templates import get_template_registry
+from app.services.llm.result_cache import llm_result_cache
+from app.services.plan_catalog import plan_catalog
+from app.services.subscription_jobs import get_period_rollover, get_trial_sweeper
+from app.services.transcription_jobs import get_stale_recording_sweeper, get_transcription_queue
 
 settings = get_settings()
 
@@ -30,8 +40,23 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             environment=settings.app_env,
             traces_sample_rate=0.1,
         )
+    transcription_queue = get_transcription_queue()
+    await transcription_queue.start()
+    await get_stale_recording_sweeper().start()
+    await get_trial_sweeper().start()
+    await get_period_rollover().start()
+    # Create the LLM client and its connection pool before the first note
+    get_llm_client()
+    get_template_registry().load()
+    await plan_catalog.warm_up()
     yield
     # Shutdown
+    await get_period_rollover().stop()
+    await get_trial_sweeper().stop()
+    await transcription_queue.stop()
+    await get_stale_recording_sweeper().stop()
+    await deepgram.close_client()
+    await close_llm_clients()
 
 
 app = FastAPI(
@@ -81,15 +106,23 @@ async def health_check() -> dict[str, str]:
 
 
 @app.get("/api/v1/health")
-async def api_health_check() -> dict[str, str]:
+async def api_health_check() -> dict[str, Any]:
     """
     API health check endpoint.
 
     Returns:
-        Status and version information
+        Status, version information, in-process cache counters, the
+        state of the circuit breakers around external providers and the
+        number of requests that ran out of time per stage
     """
     return {
         "status": "healthy",
         "version": "0.1.0",
         "environment": settings.app_env,
+        "caches": {
+            "principal": principal_cache.stats(),
+            "llmResults": llm_result_cache.stats(),
+        },
+        "circuitBreakers": circuit_breaker_states(),
+        "deadlinesExceeded": deadline_stats(),
     }
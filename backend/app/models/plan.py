@@ -70,10 +70,12 @@ class Plan(Base, TimestampMixin):
     )
 
     # Relationship to subscriptions (one-to-many)
+    # Never loaded implicitly: its size grows with the customer base, and
+    # eager loading it from Subscription.plan would pull in every subscriber.
     subscriptions: Mapped[list["Subscription"]] = relationship(
         "Subscription",
         back_populates="plan",
-        lazy="selectin",
+        lazy="raise",
     )
 
     __table_args__ = (
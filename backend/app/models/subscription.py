@@ -123,6 +123,11 @@ class Subscription(Base, TimestampMixin):
             "trial_ends_at",
             postgresql_where=text("status = 'trial'"),
         ),
+        Index(
+            "idx_subscriptions_current_period_end",
+            "current_period_end",
+            postgresql_where=text("status = 'active'"),
+        ),
     )
 
     def __repr__(self) -> str:
@@ -69,10 +69,13 @@ class User(Base, TimestampMixin):
     )
 
     # Relationship to recordings (one-to-many)
+    # Never loaded implicitly: it grows with the user's history and would
+    # otherwise be pulled in by every User load (auth, Subscription.user, ...).
+    # Load explicitly, e.g. refresh(user, ["recordings"]) or a query.
     recordings: Mapped[list["Recording"]] = relationship(
         "Recording",
         back_populates="user",
-        lazy="selectin",
+        lazy="raise",
     )
 
     # Explicit indexes for performance (also defined via unique=True above)
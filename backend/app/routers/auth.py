@@ -2,6 +2,7 @@
 
 from typing import Annotated
 from urllib.parse import quote
+from uuid import UUID
 
 from authlib.integrations.starlette_client import OAuthError
 from fastapi import APIRouter, Depends, Request, Response
@@ -12,8 +13,13 @@ from app.config import get_settings
 from app.core.database import get_db
 from app.core.dependencies import get_current_user as get_current_user_dep
 from app.core.oauth import GoogleUserInfo, oauth
-from app.core.security import create_access_token
-from app.models.user import User
+from app.core.principal import AuthPrincipal, invalidate_principal
+from app.core.security import (
+    TokenError,
+    create_access_token,
+    forget_token,
+    get_token_payload,
+)
 from app.schemas.user import UserResponse
 from app.services import auth as auth_service
 from app.services import subscription as subscription_service
@@ -157,18 +163,17 @@ async def google_callback(
 
 @router.get("/me", response_model=UserResponse)
 async def get_me(
-    current_user: Annotated[User, Depends(get_current_user_dep)],
-    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user_dep)],
 ) -> UserResponse:
     """
     Get the currently authenticated user.
 
     Uses the get_current_user dependency to extract and validate
-    the JWT from the httpOnly cookie. Also includes subscription status.
+    the JWT from the httpOnly cookie. Subscription status comes from the
+    cached principal, so a warm request needs no database query.
 
     Args:
         current_user: The authenticated user (injected by dependency)
-        db: Database session
 
     Returns:
         Current user's information including subscription status
@@ -176,26 +181,36 @@ async def get_me(
     Raises:
         UnauthorizedException: If not authenticated or token invalid
     """
-    subscription = await subscription_service.get_user_subscription(db, current_user.id)
-
     response = UserResponse.model_validate(current_user)
-    response.has_subscription = subscription is not None
+    response.has_subscription = current_user.has_subscription
 
     return response
 
 
 @router.post("/logout")
-async def logout(response: Response) -> dict[str, str]:
+async def logout(request: Request, response: Response) -> dict[str, str]:
     """
     Log out the current user.
 
-    Clears the authentication cookie.
+    Clears the authentication cookie and drops the token and the user's
+    principal from the in-process caches.
 
     Args:
+        request: FastAPI request object containing cookies
         response: FastAPI response object
 
     Returns:
         Success message
     """
+    token = request.cookies.get(COOKIE_NAME)
+    if token:
+        forget_token(token)
+        try:
+            user_id = UUID(get_token_payload(token)["sub"])
+        except (TokenError, KeyError, ValueError):
+            pass
+        else:
+            invalidate_principal(user_id)
+
     clear_auth_cookie(response)
     return {"message": "Successfully logged out"}
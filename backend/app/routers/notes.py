@@ -1,18 +1,25 @@
 """Notes router for SOAP note generation and management endpoints."""
 
+import asyncio
 import logging
+from collections.abc import AsyncIterator
 from typing import Annotated
+from uuid import UUID
 
 import sentry_sdk
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.core.database import get_db
+from app.config import get_settings
+from app.core.database import get_db, get_session_maker
+from app.core.deadline import Deadline
 from app.core.dependencies import get_current_user
-from app.core.exceptions import ApiException, NotFoundException
+from app.core.exceptions import ApiException, NotFoundException, error_body
+from app.core.principal import AuthPrincipal
+from app.core.sse import SSE_MEDIA_TYPE, event_stream_response, format_sse
 from app.models.recording import Recording
-from app.models.user import User
 from app.schemas.note import NoteCreate, NoteResponse
 from app.services.soap_extraction import (
     SOAPExtractionError,
@@ -21,57 +28,55 @@ from app.services.soap_extraction import (
 
 logger = logging.getLogger(__name__)
 
+settings = get_settings()
+
 router = APIRouter(prefix="/soap-notes", tags=["soap-notes"])
 
 
 class NoteGenerationFailedException(ApiException):
     """500 Note Generation Failed exception."""
 
-    def __init__(self, reason: str) -> None:
+    def __init__(self, reason: str, recording_id: UUID | None = None) -> None:
         """
         Initialize note generation failed exception.
 
         Args:
             reason: Description of why generation failed
+            recording_id: Optional recording the note can be retried from
         """
+        details: dict[str, str] = {"reason": reason}
+        if recording_id is not None:
+            details["recordingId"] = str(recording_id)
         super().__init__(
             500,
             "INTERNAL_ERROR",
             "La génération de la note SOAP a échoué",
-            {"reason": reason},
+            details,
         )
 
 
-
-@router.post("", response_model=NoteResponse, status_code=201)
-async def create_note(
-    data: NoteCreate,
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db)],
-) -> NoteResponse:
+async def _get_transcribed_recording(
+    db: AsyncSession, recording_id: UUID, user_id: UUID
+) -> tuple[Recording, str]:
     """
-    Generate a SOAP note from a recording's transcript.
-
-    Sends the transcript to the configured LLM provider for structured
-    extraction into 4 SOAP sections, then persists the result.
+    Load a user's recording that has a transcript.
 
     Args:
-        data: Note creation request with recording ID and preferences
-        current_user: The authenticated user
         db: Database session
+        recording_id: Requested recording
+        user_id: The authenticated user
 
     Returns:
-        The created SOAP note with all sections
+        The recording and its transcript
 
     Raises:
-        NotFoundException: If the recording doesn't exist or doesn't belong to user
-        NoteGenerationFailedException: If LLM extraction fails
+        NotFoundException: If the recording doesn't exist, doesn't belong to
+            the user or has no transcript
     """
-    # Find the recording and verify ownership
     result = await db.execute(
         select(Recording).where(
-            Recording.id == data.recording_id,
-            Recording.user_id == current_user.id,
+            Recording.id == recording_id,
+            Recording.user_id == user_id,
         )
     )
     recording = result.scalar_one_or_none()
@@ -79,26 +84,59 @@ async def create_note(
     if not recording:
         raise NotFoundException(
             message="Enregistrement non trouvé",
-            details={"recordingId": str(data.recording_id)},
+            details={"recordingId": str(recording_id)},
         )
 
     if not recording.transcript_text:
         raise NotFoundException(
             message="Aucune transcription disponible pour cet enregistrement",
             code="NOT_FOUND",
-            details={"recordingId": str(data.recording_id)},
+            details={"recordingId": str(recording_id)},
         )
 
+    return recording, recording.transcript_text
+
+
+@router.post("", response_model=NoteResponse, status_code=201)
+async def create_note(
+    data: NoteCreate,
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> NoteResponse:
+    """
+    Generate a SOAP note from a recording's transcript.
+
+    Sends the transcript to the configured LLM provider for structured
+    extraction into 4 SOAP sections, then persists the result.
+
+    Args:
+        data: Note creation request with recording ID and preferences
+        current_user: The authenticated user
+        db: Database session
+
+    Returns:
+        The created SOAP note with all sections
+
+    Raises:
+        NotFoundException: If the recording doesn't exist or doesn't belong to user
+        NoteGenerationFailedException: If LLM extraction fails
+    """
+    deadline = Deadline(settings.note_deadline_seconds)
+    recording, transcript = await _get_transcribed_recording(
+        db, data.recording_id, current_user.id
+    )
+
     # Generate SOAP note via LLM
     try:
         note = await create_note_from_transcript(
             db=db,
             user_id=current_user.id,
             recording_id=recording.id,
-            transcript=recording.transcript_text,
+            transcript=transcript,
             user_language=data.language,
             note_format=data.format,
             verbosity=data.verbosity,
+            deadline=deadline,
         )
     except SOAPExtractionError as e:
         logger.error(
@@ -117,3 +155,109 @@ async def create_note(
     )
 
     return NoteResponse.model_validate(note)
+
+
+@router.post(
+    "/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {SSE_MEDIA_TYPE: {}}}},
+)
+async def stream_note(
+    data: NoteCreate,
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    session_maker: Annotated[async_sessionmaker[AsyncSession], Depends(get_session_maker)],
+) -> StreamingResponse:
+    """
+    Generate a SOAP note, streaming each section as soon as it is generated.
+
+    Server-Sent Events: one event per SOAP section ("subjective",
+    "objective", "assessment", "plan") with {"content": ...} as soon as the
+    LLM has finished writing it, then "note" with the validated and
+    persisted NoteResponse. Failures after the stream started are sent as
+    an "error" event with the usual error body.
+
+    Args:
+        data: Note creation request with recording ID and preferences
+        current_user: The authenticated user
+        db: Database session
+        session_maker: Session factory for the stream, which runs after the
+            request's session is closed
+
+    Returns:
+        text/event-stream response
+
+    Raises:
+        NotFoundException: If the recording doesn't exist, doesn't belong to
+            the user or has no transcript
+    """
+    deadline = Deadline(settings.note_deadline_seconds)
+    recording, _ = await _get_transcribed_recording(db, data.recording_id, current_user.id)
+    recording_id = recording.id
+    sections: asyncio.Queue[str] = asyncio.Queue()
+
+    async def on_section(name: str, content: str) -> None:
+        await sections.put(format_sse(name, {"content": content}))
+
+    async def generate(stream_db: AsyncSession) -> NoteResponse:
+        # Reloaded: the recording may have changed since the request
+        _, transcript = await _get_transcribed_recording(
+            stream_db, recording_id, current_user.id
+        )
+        try:
+            note = await create_note_from_transcript(
+                db=stream_db,
+                user_id=current_user.id,
+                recording_id=recording_id,
+                transcript=transcript,
+                user_language=data.language,
+                note_format=data.format,
+                verbosity=data.verbosity,
+                on_section=on_section,
+                deadline=deadline,
+            )
+        except SOAPExtractionError as e:
+            logger.error(
+                "Streamed SOAP note generation failed for recording %s: %s",
+                recording_id,
+                e,
+            )
+            sentry_sdk.capture_exception(e)
+            raise NoteGenerationFailedException(reason=str(e), recording_id=recording_id)
+        return NoteResponse.model_validate(note)
+
+    async def events() -> AsyncIterator[str]:
+        # The body runs after get_db has committed and closed the request's
+        # session: the note is generated and saved on a session of its own
+        async with session_maker() as stream_db:
+            task = asyncio.create_task(generate(stream_db))
+            try:
+                while True:
+                    while not sections.empty():
+                        yield sections.get_nowait()
+                    if task.done():
+                        break
+                    next_section = asyncio.create_task(sections.get())
+                    await asyncio.wait(
+                        {task, next_section}, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    if next_section.done():
+                        yield next_section.result()
+                    else:
+                        next_section.cancel()
+                note = task.result()
+                logger.info(
+                    "SOAP note streamed: note_id=%s recording_id=%s user_id=%s",
+                    note.id,
+                    recording_id,
+                    current_user.id,
+                )
+                yield format_sse("note", note)
+            except ApiException as e:
+                yield format_sse("error", error_body(e))
+            finally:
+                task.cancel()
+                # Not running on the session once it is closed
+                await asyncio.gather(task, return_exceptions=True)
+
+    return event_stream_response(events())
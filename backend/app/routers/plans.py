@@ -1,22 +1,50 @@
-"""Plans router for subscription plan endpoints."""
+"""Plans router for subscription plan endpoints.
+
+Plans are served from the in-memory plan catalog, with strong ETags and
+Cache-Control so browsers and CDNs revalidate with a 304 instead of
+downloading them again.
+"""
 
-from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, HTTPException, Request, Response
 
-from app.core.database import get_db
+from app.config import get_settings
 from app.schemas.plan import PlanResponse
-from app.services import plan as plan_service
+from app.services.plan_catalog import CachedBody, plan_catalog
 
 router = APIRouter(prefix="/plans", tags=["plans"])
 
+settings = get_settings()
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison, RFC 9110)."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in (tag.removeprefix("W/") for tag in candidates)
+
+
+def _cached_response(request: Request, cached: CachedBody) -> Response:
+    """
+    Serve a cached JSON body, or 304 Not Modified if the client has it.
+
+    Args:
+        request: Incoming request (If-None-Match header)
+        cached: Body and ETag to serve
+    """
+    headers = {
+        "ETag": cached.etag,
+        "Cache-Control": f"public, max-age={settings.plan_cache_max_age_seconds}",
+    }
+    if _etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
 
 @router.get("", response_model=list[PlanResponse])
-async def get_plans(
-    db: Annotated[AsyncSession, Depends(get_db)],
-) -> list[PlanResponse]:
+async def get_plans(request: Request) -> Response:
     """
     Get all active subscription plans.
 
@@ -24,35 +52,33 @@ async def get_plans(
     Only returns active plans that are available for purchase.
 
     Args:
-        db: Database session
+        request: Incoming request, for conditional GET
 
     Returns:
-        List of active plans with their configuration
+        List of active plans with their configuration (304 if unchanged)
     """
-    plans = await plan_service.get_all_active_plans(db)
-    return [PlanResponse.model_validate(plan) for plan in plans]
+    snapshot = await plan_catalog.snapshot()
+    return _cached_response(request, snapshot.active_list)
 
 
 @router.get("/{plan_id}", response_model=PlanResponse)
-async def get_plan(
-    plan_id: UUID,
-    db: Annotated[AsyncSession, Depends(get_db)],
-) -> PlanResponse:
+async def get_plan(plan_id: UUID, request: Request) -> Response:
     """
     Get a specific plan by ID.
 
     Args:
         plan_id: UUID of the plan to retrieve
-        db: Database session
+        request: Incoming request, for conditional GET
 
     Returns:
-        Plan details
+        Plan details (304 if unchanged)
 
     Raises:
         HTTPException: 404 if plan not found or not active
     """
-    plan = await plan_service.get_active_plan_by_id(db, plan_id)
-    if not plan:
+    snapshot = await plan_catalog.snapshot()
+    cached = snapshot.active_bodies.get(plan_id)
+    if cached is None:
         raise HTTPException(
             status_code=404,
             detail={
@@ -62,4 +88,4 @@ async def get_plan(
                 }
             },
         )
-    return PlanResponse.model_validate(plan)
+    return _cached_response(request, cached)
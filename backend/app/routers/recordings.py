@@ -1,26 +1,70 @@
 """Recordings router for audio upload and processing endpoints."""
 
+import json
 import logging
 import time
-from typing import Annotated
-
-from fastapi import APIRouter, Depends, File, Form, UploadFile
-from sqlalchemy.ext.asyncio import AsyncSession
+from collections.abc import AsyncIterator
+from typing import Annotated, Any, Literal
+from uuid import UUID
+
+import sentry_sdk
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    Query,
+    Request,
+    UploadFile,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.core.database import get_db
+from app.config import get_settings
+from app.core.database import get_db, get_session_maker, release_connection
+from app.core.deadline import Deadline
 from app.core.dependencies import get_current_user
-from app.core.exceptions import ApiException, QuotaExceededException
+from app.core.exceptions import (
+    ApiException,
+    NotFoundException,
+    QuotaExceededException,
+    error_body,
+)
+from app.core.jobs import JobQueueFullError
+from app.core.principal import AuthPrincipal
+from app.core.sse import event_stream_response, format_sse, wants_event_stream
 from app.models.recording import Recording
-from app.models.user import User
-from app.schemas.recording import RecordingStatus, RecordingWithTranscript
+from app.models.subscription import Subscription
+from app.routers.notes import NoteGenerationFailedException
+from app.schemas.note import NoteResponse
+from app.schemas.recording import (
+    RecordingResponse,
+    RecordingStatus,
+    RecordingWithNote,
+    RecordingWithTranscript,
+)
+from app.services import recording as recording_service
 from app.services import subscription as subscription_service
 from app.services.deepgram import (
     DeepgramTranscriptionError,
+    TranscriptionResult,
     transcribe_audio,
+    transcribe_audio_chunked,
+    transcribe_audio_stream,
 )
+from app.services.deepgram_live import TranscriptSegment, transcribe_live
+from app.services.plan_catalog import plan_catalog
+from app.services.soap_extraction import SOAPExtractionError, create_note_from_transcript
+from app.services.transcription_jobs import TranscriptionJob, get_transcription_queue
 
 logger = logging.getLogger(__name__)
 
+settings = get_settings()
+
 # Valid MIME types for audio uploads
 ALLOWED_AUDIO_TYPES = {
     "audio/webm",
@@ -31,8 +75,7 @@ ALLOWED_AUDIO_TYPES = {
 
 router = APIRouter(prefix="/recordings", tags=["recordings"])
 
-# Maximum recording duration in seconds (10 minutes default)
-# TODO: Get from plan configuration
+# Maximum recording duration in seconds when the plan is unknown (10 minutes)
 MAX_RECORDING_SECONDS = 600
 
 
@@ -95,48 +138,79 @@ class TranscriptionFailedException(ApiException):
         )
 
 
-@router.post("", response_model=RecordingWithTranscript, status_code=201)
-async def create_recording(
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db)],
-    audio: Annotated[UploadFile, File(description="WebM/Opus audio file")],
-    duration: Annotated[int, Form(ge=1, le=3600, description="Duration in seconds")],
-    language_detected: Annotated[
-        str | None, Form(max_length=10, description="Detected language code")
-    ] = None,
-) -> RecordingWithTranscript:
+class TranscriptionQueueFullException(ApiException):
+    """503 Transcription Queue Full exception."""
+
+    def __init__(self) -> None:
+        """Initialize transcription queue full exception."""
+        super().__init__(
+            503,
+            "SERVICE_UNAVAILABLE",
+            "Trop de transcriptions en cours, veuillez réessayer",
+            {"retryAfter": 30},
+        )
+
+
+async def _max_recording_seconds(user: AuthPrincipal) -> int:
     """
-    Upload an audio recording for transcription.
+    Get the longest recording a user's plan allows.
 
-    Accepts a WebM/Opus audio file and:
-    1. Validates user quota and trial status
-    2. Validates audio format and duration
-    3. Sends audio to Deepgram pre-recorded API for transcription
-    4. Stores transcript in database (audio is NOT stored - RGPD)
-    5. Decrements quota only on successful transcription
-    6. Returns recording with transcript
+    The plan comes from the cached principal and the cached plan catalog,
+    so no query is made per upload.
 
     Args:
-        current_user: The authenticated user
-        db: Database session
-        audio: The audio file (WebM/Opus format)
-        duration: Duration of the recording in seconds
-        language_detected: Optional detected language code (overridden by Deepgram)
+        user: The authenticated user
 
     Returns:
-        Recording with transcript, status, and metadata
+        The plan's maximum duration in seconds, MAX_RECORDING_SECONDS if
+        the user has no known plan
+    """
+    plan = await plan_catalog.get_plan(user.plan_id) if user.plan_id else None
+    if plan is None:
+        return MAX_RECORDING_SECONDS
+    return plan.max_recording_minutes * 60
+
+
+async def _check_duration(user: AuthPrincipal, duration: int) -> None:
+    """
+    Validate a recording's declared duration against the user's plan.
+
+    Called before the audio is read, so an oversized upload is rejected
+    without reading its body (for raw-body uploads) and without touching
+    the database.
+
+    Args:
+        user: The authenticated user
+        duration: Duration of the recording in seconds
 
     Raises:
-        QuotaExceededException: If user has no remaining quota
         AudioTooLongException: If duration exceeds plan limits
-        TranscriptionFailedException: If Deepgram transcription fails
     """
-    start_time = time.time()
+    max_duration = await _max_recording_seconds(user)
+    if duration > max_duration:
+        raise AudioTooLongException(
+            duration=duration,
+            max_duration=max_duration,
+        )
+
+
+async def _check_can_record(db: AsyncSession, user_id: UUID) -> Subscription:
+    """
+    Validate that a user's subscription allows a new recording.
+
+    Args:
+        db: Database session
+        user_id: User's UUID
+
+    Returns:
+        The user's subscription
 
-    # Get user's subscription and check quota
+    Raises:
+        QuotaExceededException: If no subscription, trial expired or no quota left
+    """
     subscription = await subscription_service.get_user_subscription(
         db=db,
-        user_id=current_user.id,
+        user_id=user_id,
     )
 
     if not subscription:
@@ -146,10 +220,10 @@ async def create_recording(
             limit=0,
         )
 
-    # Check if trial expired
-    subscription = await subscription_service.expire_trial_if_needed(db, subscription)
-
-    if subscription.status == "expired":
+    # Trials past their end date are marked expired by the background sweeper
+    if subscription.status == "expired" or subscription_service.is_trial_expired(
+        subscription
+    ):
         raise QuotaExceededException(
             message="Votre période d'essai a expiré",
             used=subscription.quota_total - subscription.quota_remaining,
@@ -164,17 +238,56 @@ async def create_recording(
             limit=subscription.quota_total,
         )
 
-    # Check duration against plan limits
-    # TODO: Get max_recording_minutes from plan
-    max_duration = MAX_RECORDING_SECONDS
-    if duration > max_duration:
-        raise AudioTooLongException(
-            duration=duration,
-            max_duration=max_duration,
+    return subscription
+
+
+async def _start_recording(
+    db: AsyncSession,
+    subscription: Subscription,
+    duration: int,
+    language_detected: str | None,
+) -> Recording:
+    """
+    Create the recording in TRANSCRIBING status, reserving one quota unit.
+
+    Args:
+        db: Database session
+        subscription: The user's subscription, checked by _check_can_record
+        duration: Duration of the recording in seconds
+        language_detected: Optional client-side detected language
+
+    Returns:
+        The created Recording
+
+    Raises:
+        QuotaExceededException: If concurrent uploads used the remaining
+            quota since it was checked
+    """
+    try:
+        return await recording_service.start_recording(
+            db,
+            user_id=subscription.user_id,
+            duration_seconds=duration,
+            language_detected=language_detected,
+        )
+    except subscription_service.QuotaExhaustedError:
+        raise QuotaExceededException(
+            message="Vous avez atteint votre quota mensuel",
+            used=subscription.quota_total,
+            limit=subscription.quota_total,
         )
 
-    # Validate MIME type
-    content_type = audio.content_type
+
+def _validate_audio_type(content_type: str | None) -> None:
+    """
+    Validate the MIME type of uploaded audio.
+
+    Args:
+        content_type: Content type of the uploaded file or request body
+
+    Raises:
+        InvalidAudioTypeException: If the content type is missing or not allowed
+    """
     if content_type:
         # Extract base MIME type (without codecs parameter)
         base_type = content_type.split(";")[0].strip()
@@ -183,81 +296,663 @@ async def create_recording(
     else:
         raise InvalidAudioTypeException(None)
 
+
+def _is_trusted_origin(websocket: WebSocket) -> bool:
+    """
+    Check that a WebSocket handshake comes from the frontend.
+
+    Browsers send the session cookie with cross-site WebSocket handshakes
+    and CORS does not apply to them, so the Origin header is checked here.
+    """
+    origin = websocket.headers.get("origin")
+    return origin is not None and origin.rstrip("/") == settings.frontend_url.rstrip("/")
+
+
+def _is_stop_message(text: str) -> bool:
+    """Check whether a text message is {"type": "stop"}; anything else is ignored."""
+    try:
+        message = json.loads(text)
+    except ValueError:
+        return False
+    return isinstance(message, dict) and message.get("type") == "stop"
+
+
+async def _transcribe(
+    audio_data: bytes, duration_seconds: int, deadline: Deadline | None = None
+) -> TranscriptionResult:
+    """
+    Transcribe an uploaded recording, in parallel segments if it is long.
+
+    Args:
+        audio_data: Raw audio bytes
+        duration_seconds: Declared duration of the recording
+        deadline: Optional request deadline
+
+    Returns:
+        TranscriptionResult from Deepgram
+
+    Raises:
+        DeepgramTranscriptionError: If transcription fails
+    """
+    if duration_seconds >= settings.deepgram_chunk_min_seconds:
+        return await transcribe_audio_chunked(audio_data, deadline=deadline)
+    return await transcribe_audio(audio_data, deadline=deadline)
+
+
+def _to_response(recording: Recording) -> RecordingWithTranscript:
+    """Build the API representation of a recording."""
+    return RecordingWithTranscript(
+        id=str(recording.id),
+        status=RecordingStatus(recording.status),
+        duration_seconds=recording.duration_seconds,
+        language_detected=recording.language_detected,
+        transcript_text=recording.transcript_text,
+        created_at=recording.created_at,
+    )
+
+
+def _log_recording_processed(
+    recording: Recording,
+    result: TranscriptionResult,
+    start_time: float,
+) -> None:
+    """
+    Log a successful transcription, warning if the latency target is missed.
+
+    Args:
+        recording: The completed recording
+        result: Transcription result from Deepgram
+        start_time: Request start time (time.time())
+    """
+    total_latency_ms = (time.time() - start_time) * 1000
+    logger.info(
+        "Recording processed successfully",
+        extra={
+            "recording_id": str(recording.id),
+            "user_id": str(recording.user_id),
+            "duration_seconds": recording.duration_seconds,
+            "transcription_latency_ms": round(result.latency_ms, 2),
+            "total_latency_ms": round(total_latency_ms, 2),
+            "transcript_length": len(result.transcript),
+            "language_detected": result.language_detected,
+        },
+    )
+
+    # Warn if total latency exceeds target (5 seconds)
+    if total_latency_ms > 5000:
+        logger.warning(
+            "Recording processing latency exceeded target",
+            extra={
+                "recording_id": str(recording.id),
+                "total_latency_ms": round(total_latency_ms, 2),
+                "target_ms": 5000,
+            },
+        )
+
+
+@router.post("", response_model=RecordingWithTranscript, status_code=201)
+async def create_recording(
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    audio: Annotated[UploadFile, File(description="WebM/Opus audio file")],
+    duration: Annotated[int, Form(ge=1, le=3600, description="Duration in seconds")],
+    language_detected: Annotated[
+        str | None, Form(max_length=10, description="Detected language code")
+    ] = None,
+) -> RecordingWithTranscript:
+    """
+    Upload an audio recording for transcription.
+
+    Accepts a WebM/Opus audio file and:
+    1. Validates user quota and trial status
+    2. Validates audio format and duration
+    3. Sends audio to Deepgram pre-recorded API for transcription, without
+       holding a database connection
+    4. Stores transcript in database (audio is NOT stored - RGPD)
+    5. Consumes quota only on successful transcription (a unit reserved
+       with the recording is released on failure)
+    6. Returns recording with transcript
+
+    Args:
+        current_user: The authenticated user
+        db: Database session
+        audio: The audio file (WebM/Opus format)
+        duration: Duration of the recording in seconds
+        language_detected: Optional detected language code (overridden by Deepgram)
+
+    Returns:
+        Recording with transcript, status, and metadata
+
+    Raises:
+        QuotaExceededException: If user has no remaining quota
+        AudioTooLongException: If duration exceeds plan limits
+        TranscriptionFailedException: If Deepgram transcription fails
+    """
+    start_time = time.time()
+    deadline = Deadline(settings.transcription_deadline_seconds)
+
+    await _check_duration(current_user, duration)
+    subscription = await _check_can_record(db, current_user.id)
+    _validate_audio_type(audio.content_type)
+
     # Read audio data into memory (RGPD: never persisted to disk)
     audio_data = await audio.read()
 
-    # Create recording record with TRANSCRIBING status (before transcription)
-    recording = Recording(
-        user_id=current_user.id,
-        duration_seconds=duration,
-        language_detected=language_detected,
-        status=RecordingStatus.TRANSCRIBING.value,
-    )
-    db.add(recording)
-    await db.commit()
-    await db.refresh(recording)
+    # Create recording record with TRANSCRIBING status, reserving a quota unit
+    recording = await _start_recording(db, subscription, duration, language_detected)
+
+    # No pooled connection held while waiting on Deepgram
+    await release_connection(db)
 
     # Transcribe audio with Deepgram
     try:
-        result = await transcribe_audio(audio_data)
+        result = await _transcribe(audio_data, duration, deadline)
 
-        # Success: update recording with transcript AND decrement quota atomically
-        recording.transcript_text = result.transcript
-        recording.language_detected = result.language_detected or language_detected
-        recording.status = RecordingStatus.COMPLETED.value
-        subscription.quota_remaining -= 1
-        await db.commit()
-        await db.refresh(recording)
+        # Success: store the transcript, the reserved quota unit is kept
+        recording = await recording_service.complete_recording(db, recording, result)
 
         # Log latency for monitoring
-        total_latency_ms = (time.time() - start_time) * 1000
-        logger.info(
-            "Recording processed successfully",
+        _log_recording_processed(recording, result, start_time)
+
+    except DeepgramTranscriptionError as e:
+        # Failure: mark recording as failed and release its quota unit
+        await recording_service.fail_recording(db, recording)
+
+        logger.error(
+            "Transcription failed",
             extra={
                 "recording_id": str(recording.id),
                 "user_id": str(current_user.id),
-                "duration_seconds": duration,
-                "transcription_latency_ms": round(result.latency_ms, 2),
-                "total_latency_ms": round(total_latency_ms, 2),
-                "transcript_length": len(result.transcript),
-                "language_detected": result.language_detected,
+                "error": str(e),
             },
         )
 
-        # Warn if total latency exceeds target (5 seconds)
-        if total_latency_ms > 5000:
-            logger.warning(
-                "Recording processing latency exceeded target",
-                extra={
-                    "recording_id": str(recording.id),
-                    "total_latency_ms": round(total_latency_ms, 2),
-                    "target_ms": 5000,
-                },
-            )
+        raise TranscriptionFailedException(reason=str(e))
+
+    # Return response with transcript (POST /recordings/with-note also
+    # generates the SOAP note in the same request)
+    return _to_response(recording)
 
+
+@router.post("/stream", response_model=RecordingWithTranscript, status_code=201)
+async def create_recording_stream(
+    request: Request,
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    duration: Annotated[int, Query(ge=1, le=3600, description="Duration in seconds")],
+    language_detected: Annotated[
+        str | None, Query(max_length=10, description="Detected language code")
+    ] = None,
+) -> RecordingWithTranscript:
+    """
+    Upload an audio recording as a raw request body, streamed to Deepgram.
+
+    Same behavior as POST /recordings, but the audio is sent as the request
+    body (Content-Type: audio/webm, ...) with metadata in the query string.
+    The body is forwarded to Deepgram chunk-by-chunk as it arrives instead
+    of being read into memory or spooled to a temp file, so memory per
+    upload stays bounded for long recordings.
+
+    Args:
+        request: The incoming request, whose body is the audio
+        current_user: The authenticated user
+        db: Database session
+        duration: Duration of the recording in seconds
+        language_detected: Optional detected language code (overridden by Deepgram)
+
+    Returns:
+        Recording with transcript, status, and metadata
+
+    Raises:
+        QuotaExceededException: If user has no remaining quota
+        AudioTooLongException: If duration exceeds plan limits
+        InvalidAudioTypeException: If the body's content type is not allowed
+        TranscriptionFailedException: If Deepgram transcription fails
+    """
+    start_time = time.time()
+    deadline = Deadline(settings.transcription_deadline_seconds)
+
+    await _check_duration(current_user, duration)
+    subscription = await _check_can_record(db, current_user.id)
+    _validate_audio_type(request.headers.get("content-type"))
+
+    recording = await _start_recording(db, subscription, duration, language_detected)
+
+    # No pooled connection held while the body streams to Deepgram
+    await release_connection(db)
+
+    try:
+        result = await transcribe_audio_stream(request.stream(), deadline=deadline)
     except DeepgramTranscriptionError as e:
-        # Failure: mark recording as failed, do NOT decrement quota
-        recording.status = RecordingStatus.FAILED.value
-        await db.commit()
+        await recording_service.fail_recording(db, recording)
+        logger.error(
+            "Streamed transcription failed",
+            extra={
+                "recording_id": str(recording.id),
+                "user_id": str(current_user.id),
+                "error": str(e),
+            },
+        )
+        raise TranscriptionFailedException(reason=str(e))
+
+    recording = await recording_service.complete_recording(db, recording, result)
+    _log_recording_processed(recording, result, start_time)
+
+    return _to_response(recording)
+
+
+@router.websocket("/live")
+async def live_recording(
+    websocket: WebSocket,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    language_detected: Annotated[str | None, Query(max_length=10)] = None,
+) -> None:
+    """
+    Record with real-time transcription over a WebSocket.
+
+    Protocol:
+    - The client sends audio frames (MediaRecorder chunks) as binary messages
+      and {"type": "stop"} as a text message when recording stops.
+    - The server relays frames to a Deepgram live session and sends
+      {"type": "transcript", "text": ..., "isFinal": ...} as segments arrive.
+    - Once Deepgram has flushed, final segments are stored in the Recording
+      and the server sends {"type": "completed", "recording": {...}} (same
+      shape as POST /recordings) then closes.
+    - On error the server sends {"type": "error", "error": {...}} (standard
+      error body) and closes.
+
+    Handshakes from another origin than the frontend are rejected, and
+    text messages other than the stop message are ignored.
+
+    A quota unit is reserved when the connection opens and given back if
+    no transcript is stored. The recording is capped at the plan's maximum
+    duration; frames beyond it are not relayed.
+
+    Args:
+        websocket: The client WebSocket (authenticated by cookie)
+        db: Database session
+        language_detected: Optional client-side detected language code
+    """
+    if not _is_trusted_origin(websocket):
+        # Closing before accept rejects the handshake (HTTP 403)
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
 
+    try:
+        current_user = await get_current_user(websocket, db)
+        subscription = await _check_can_record(db, current_user.id)
+        max_duration = await _max_recording_seconds(current_user)
+        recording = await _start_recording(db, subscription, 1, language_detected)
+    except ApiException as e:
+        await websocket.send_json({"type": "error", **error_body(e)})
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    # No pooled connection held for the whole recording session
+    await release_connection(db)
+
+    started_at = time.monotonic()
+
+    async def frames() -> AsyncIterator[bytes]:
+        while time.monotonic() - started_at < max_duration:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            if message.get("bytes"):
+                yield message["bytes"]
+            elif message.get("text") and _is_stop_message(message["text"]):
+                return
+
+    async def send_segment(segment: TranscriptSegment) -> None:
+        await websocket.send_json(
+            {"type": "transcript", "text": segment.text, "isFinal": segment.is_final}
+        )
+
+    try:
+        result = await transcribe_live(frames(), on_segment=send_segment)
+    except WebSocketDisconnect:
+        await recording_service.fail_recording(db, recording)
+        logger.info(
+            "Live recording aborted by client",
+            extra={"recording_id": str(recording.id)},
+        )
+        return
+    except DeepgramTranscriptionError as e:
+        await recording_service.fail_recording(db, recording)
         logger.error(
-            "Transcription failed",
+            "Live transcription failed",
             extra={
                 "recording_id": str(recording.id),
                 "user_id": str(current_user.id),
                 "error": str(e),
             },
         )
+        await websocket.send_json(
+            {"type": "error", **error_body(TranscriptionFailedException(reason=str(e)))}
+        )
+        await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+        return
+
+    duration = result.duration_seconds or (time.monotonic() - started_at)
+    recording = await recording_service.complete_recording(
+        db, recording, result, duration_seconds=max(1, round(duration))
+    )
+    logger.info(
+        "Live recording processed successfully",
+        extra={
+            "recording_id": str(recording.id),
+            "user_id": str(current_user.id),
+            "duration_seconds": recording.duration_seconds,
+            "finalize_latency_ms": round(result.latency_ms, 2),
+            "transcript_length": len(result.transcript),
+        },
+    )
+
+    await websocket.send_json(
+        {
+            "type": "completed",
+            "recording": _to_response(recording).model_dump(mode="json", by_alias=True),
+        }
+    )
+    await websocket.close()
+
+
+async def _transcribe_and_extract(
+    db: AsyncSession,
+    recording: Recording,
+    audio_data: bytes,
+    note_language: str,
+    note_format: str,
+    verbosity: str,
+    deadline: Deadline | None = None,
+) -> AsyncIterator[tuple[str, BaseModel | dict[str, Any]]]:
+    """
+    Transcribe a recording then extract its SOAP note, yielding progress events.
+
+    The transcript is handed straight to the extraction step, without a
+    client round trip or reloading the recording from the database.
+
+    Args:
+        db: Database session
+        recording: Recording in TRANSCRIBING status
+        audio_data: Raw audio bytes
+        note_language: Target language for the note (fr/de/en)
+        note_format: Note format preference (paragraph/bullets)
+        verbosity: Note verbosity level (concise/medium)
+        deadline: Optional deadline of the whole request, shared by the
+            transcription and the extraction
+
+    Yields:
+        (event, payload) tuples: "status" stages, then "transcript" with the
+        RecordingWithTranscript, then "note" with the NoteResponse
+
+    Raises:
+        TranscriptionFailedException: If Deepgram transcription fails
+        NotFoundException: If the transcript is empty
+        NoteGenerationFailedException: If LLM extraction fails
+    """
+    yield "status", {"stage": "transcribing", "recordingId": str(recording.id)}
+
+    # No pooled connection held while waiting on Deepgram
+    await release_connection(db)
 
+    try:
+        result = await _transcribe(audio_data, recording.duration_seconds, deadline)
+    except DeepgramTranscriptionError as e:
+        await recording_service.fail_recording(db, recording)
+        logger.error(
+            "Transcription failed",
+            extra={
+                "recording_id": str(recording.id),
+                "user_id": str(recording.user_id),
+                "error": str(e),
+            },
+        )
         raise TranscriptionFailedException(reason=str(e))
 
-    # Return response with transcript
-    # TODO: Story 3.1 - Send transcript to Mistral for SOAP extraction
-    return RecordingWithTranscript(
+    recording = await recording_service.complete_recording(db, recording, result)
+    yield "transcript", _to_response(recording)
+
+    if not recording.transcript_text:
+        raise NotFoundException(
+            message="Aucune transcription disponible pour cet enregistrement",
+            details={"recordingId": str(recording.id)},
+        )
+
+    yield "status", {"stage": "extracting", "recordingId": str(recording.id)}
+
+    try:
+        note = await create_note_from_transcript(
+            db=db,
+            user_id=recording.user_id,
+            recording_id=recording.id,
+            transcript=recording.transcript_text,
+            user_language=note_language,
+            note_format=note_format,
+            verbosity=verbosity,
+            deadline=deadline,
+        )
+    except SOAPExtractionError as e:
+        logger.error(
+            "SOAP note generation failed for recording %s: %s", recording.id, e
+        )
+        sentry_sdk.capture_exception(e)
+        raise NoteGenerationFailedException(reason=str(e), recording_id=recording.id)
+
+    yield "note", NoteResponse.model_validate(note)
+
+
+@router.post("/with-note", response_model=RecordingWithNote, status_code=201)
+async def create_recording_with_note(
+    request: Request,
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    session_maker: Annotated[async_sessionmaker[AsyncSession], Depends(get_session_maker)],
+    audio: Annotated[UploadFile, File(description="WebM/Opus audio file")],
+    duration: Annotated[int, Form(ge=1, le=3600, description="Duration in seconds")],
+    language_detected: Annotated[
+        str | None, Form(max_length=10, description="Detected language code")
+    ] = None,
+    note_language: Annotated[
+        Literal["fr", "de", "en"], Form(description="Target language of the note")
+    ] = "fr",
+    note_format: Annotated[
+        Literal["paragraph", "bullets"], Form(description="Note format")
+    ] = "paragraph",
+    verbosity: Annotated[
+        Literal["concise", "medium"], Form(description="Note verbosity")
+    ] = "medium",
+) -> RecordingWithNote | StreamingResponse:
+    """
+    Upload a recording and get its SOAP note in a single request.
+
+    Chains the POST /recordings and POST /soap-notes flows server-side.
+    With "Accept: text/event-stream" the response is instead a 200 SSE
+    stream of progress events:
+    - status: {"stage": "transcribing" | "extracting", "recordingId": ...}
+    - transcript: the transcribed recording (RecordingWithTranscript)
+    - note: the generated note (NoteResponse)
+    - error: standard error body, ends the stream
+
+    Validation and quota errors are always returned as regular HTTP errors.
+    If extraction fails after a successful transcription, the recording is
+    kept (and its quota consumed): the error details carry its recordingId
+    so the note can be retried with POST /soap-notes.
+
+    Args:
+        request: The incoming request (Accept header)
+        current_user: The authenticated user
+        db: Database session
+        session_maker: Session factory for the SSE stream, which runs after
+            the request's session is closed
+        audio: The audio file (WebM/Opus format)
+        duration: Duration of the recording in seconds
+        language_detected: Optional detected language code (overridden by Deepgram)
+        note_language: Target language of the note (fr/de/en)
+        note_format: Note format (paragraph/bullets)
+        verbosity: Note verbosity (concise/medium)
+
+    Returns:
+        The recording with transcript and its SOAP note, or an SSE stream
+
+    Raises:
+        QuotaExceededException: If user has no remaining quota
+        AudioTooLongException: If duration exceeds plan limits
+        TranscriptionFailedException: If Deepgram transcription fails
+        NoteGenerationFailedException: If LLM extraction fails
+    """
+    deadline = Deadline(
+        settings.transcription_deadline_seconds + settings.note_deadline_seconds
+    )
+
+    await _check_duration(current_user, duration)
+    subscription = await _check_can_record(db, current_user.id)
+    _validate_audio_type(audio.content_type)
+
+    # Read audio data into memory (RGPD: never persisted to disk)
+    audio_data = await audio.read()
+
+    recording = await _start_recording(db, subscription, duration, language_detected)
+
+    if wants_event_stream(request):
+        recording_id = recording.id
+
+        async def events() -> AsyncIterator[str]:
+            # The body runs after get_db has committed and closed the request's
+            # session: the pipeline gets its own, with the recording reloaded
+            async with session_maker() as stream_db:
+                stream_recording = await stream_db.get(Recording, recording_id)
+                if stream_recording is None:
+                    not_found = NotFoundException(
+                        message="Enregistrement non trouvé",
+                        details={"recordingId": str(recording_id)},
+                    )
+                    yield format_sse("error", error_body(not_found))
+                    return
+                pipeline = _transcribe_and_extract(
+                    stream_db,
+                    stream_recording,
+                    audio_data,
+                    note_language,
+                    note_format,
+                    verbosity,
+                    deadline,
+                )
+                try:
+                    async for event, payload in pipeline:
+                        yield format_sse(event, payload)
+                except ApiException as e:
+                    yield format_sse("error", error_body(e))
+
+        return event_stream_response(events())
+
+    outputs: dict[str, Any] = {}
+    pipeline = _transcribe_and_extract(
+        db, recording, audio_data, note_language, note_format, verbosity, deadline
+    )
+    async for event, payload in pipeline:
+        outputs[event] = payload
+
+    return RecordingWithNote(recording=outputs["transcript"], note=outputs["note"])
+
+
+@router.post("/jobs", response_model=RecordingResponse, status_code=202)
+async def create_recording_job(
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    audio: Annotated[UploadFile, File(description="WebM/Opus audio file")],
+    duration: Annotated[int, Form(ge=1, le=3600, description="Duration in seconds")],
+    language_detected: Annotated[
+        str | None, Form(max_length=10, description="Detected language code")
+    ] = None,
+) -> RecordingResponse:
+    """
+    Upload an audio recording for asynchronous transcription.
+
+    Performs the same validation as POST /recordings, creates the recording
+    in TRANSCRIBING status and hands the audio to a background worker.
+    Returns immediately; poll GET /recordings/{id} until the status is
+    completed or failed. Quota is only consumed on successful transcription.
+
+    Args:
+        current_user: The authenticated user
+        db: Database session
+        audio: The audio file (WebM/Opus format)
+        duration: Duration of the recording in seconds
+        language_detected: Optional detected language code (overridden by Deepgram)
+
+    Returns:
+        Recording id, TRANSCRIBING status and creation timestamp
+
+    Raises:
+        QuotaExceededException: If user has no remaining quota
+        AudioTooLongException: If duration exceeds plan limits
+        TranscriptionQueueFullException: If too many transcriptions are queued
+    """
+    await _check_duration(current_user, duration)
+    subscription = await _check_can_record(db, current_user.id)
+    _validate_audio_type(audio.content_type)
+
+    # Read audio data into memory (RGPD: never persisted to disk)
+    audio_data = await audio.read()
+
+    recording = await _start_recording(db, subscription, duration, language_detected)
+
+    try:
+        await get_transcription_queue().enqueue(
+            TranscriptionJob(
+                recording_id=recording.id,
+                user_id=current_user.id,
+                audio_data=audio_data,
+                duration_seconds=duration,
+            )
+        )
+    except JobQueueFullError:
+        await recording_service.fail_recording(db, recording)
+        logger.warning(
+            "Transcription queue full, upload rejected",
+            extra={"recording_id": str(recording.id), "user_id": str(current_user.id)},
+        )
+        raise TranscriptionQueueFullException()
+
+    return RecordingResponse(
         id=str(recording.id),
         status=RecordingStatus(recording.status),
-        duration_seconds=recording.duration_seconds,
-        language_detected=recording.language_detected,
-        transcript_text=recording.transcript_text,
-        created_at=recording.created_at,
+        createdAt=recording.created_at,
+    )
+
+
+@router.get("/{recording_id}", response_model=RecordingWithTranscript)
+async def get_recording(
+    recording_id: UUID,
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> RecordingWithTranscript:
+    """
+    Get a recording and its transcription status.
+
+    Used to poll recordings submitted through POST /recordings/jobs.
+
+    Args:
+        recording_id: UUID of the recording
+        current_user: The authenticated user
+        db: Database session
+
+    Returns:
+        Recording with status and transcript (once completed)
+
+    Raises:
+        NotFoundException: If the recording doesn't exist or doesn't belong to user
+    """
+    recording = await recording_service.get_user_recording(
+        db, current_user.id, recording_id
     )
+    if not recording:
+        raise NotFoundException(
+            message="Enregistrement non trouvé",
+            details={"recordingId": str(recording_id)},
+        )
+
+    return _to_response(recording)
@@ -7,7 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
-from app.models.user import User
+from app.core.principal import AuthPrincipal
 from app.schemas.plan import PlanSummary
 from app.schemas.subscription import (
     SubscriptionCreate,
@@ -22,7 +22,7 @@ router = APIRouter(prefix="/subscriptions", tags=["subscriptions"])
 @router.post("/trial", response_model=SubscriptionResponse)
 async def create_trial(
     data: SubscriptionCreate,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> SubscriptionResponse:
     """
@@ -61,14 +61,14 @@ async def create_trial(
 
 @router.get("/me", response_model=SubscriptionResponse)
 async def get_my_subscription(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[AuthPrincipal, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> SubscriptionResponse:
     """
     Get the current user's subscription.
 
     Returns the user's subscription with plan details.
-    Also checks and updates trial expiration status.
+    A trial past its end date is reported as expired.
 
     Args:
         current_user: The authenticated user
@@ -96,13 +96,13 @@ async def get_my_subscription(
             },
         )
 
-    # Check and update trial expiration
-    subscription = await subscription_service.expire_trial_if_needed(db, subscription)
-
     # Load plan for response
     await db.refresh(subscription, ["plan"])
 
     response = SubscriptionResponse.model_validate(subscription)
+    # Trials past their end date are marked expired by the background sweeper
+    if subscription_service.is_trial_expired(subscription):
+        response.status = SubscriptionStatus.EXPIRED
     if subscription.plan:
         response.plan = PlanSummary.model_validate(subscription.plan)
 
@@ -6,6 +6,7 @@ from app.schemas.recording import (
     RecordingCreate,
     RecordingResponse,
     RecordingStatus,
+    RecordingWithNote,
 )
 from app.schemas.subscription import (
     SubscriptionCreate,
@@ -29,6 +30,7 @@ __all__ = [
     "RecordingCreate",
     "RecordingResponse",
     "RecordingStatus",
+    "RecordingWithNote",
     "SubscriptionCreate",
     "SubscriptionResponse",
     "SubscriptionStatus",
@@ -6,6 +6,8 @@ from typing import Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from app.schemas.note import NoteResponse
+
 
 class RecordingStatus(str, Enum):
     """Status of a recording in the processing pipeline."""
@@ -140,6 +142,19 @@ class RecordingWithTranscript(BaseModel):
     )
 
 
+class RecordingWithNote(BaseModel):
+    """
+    Response of the combined transcribe-then-extract pipeline.
+
+    Attributes:
+        recording: The transcribed recording
+        note: The SOAP note generated from its transcript
+    """
+
+    recording: RecordingWithTranscript
+    note: NoteResponse
+
+
 class AudioTooLongError(BaseModel):
     """
     Error response for audio that exceeds duration limit.
@@ -5,9 +5,23 @@ from uuid import UUID
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.principal import AuthPrincipal, invalidate_principal
+from app.models.subscription import Subscription
 from app.models.user import User
 from app.schemas.user import UserCreate
 
+# Columns needed to authorize a request and serialize the current user.
+# Everything else (google_id, recordings, quota) stays unloaded on the auth path.
+PRINCIPAL_COLUMNS = (
+    User.id,
+    User.email,
+    User.name,
+    User.avatar_url,
+    User.is_admin,
+    User.created_at,
+    User.updated_at,
+)
+
 
 async def get_user_by_id(db: AsyncSession, user_id: UUID) -> User | None:
     """
@@ -24,6 +38,49 @@ async def get_user_by_id(db: AsyncSession, user_id: UUID) -> User | None:
     return result.scalar_one_or_none()
 
 
+async def get_auth_principal(db: AsyncSession, user_id: UUID) -> AuthPrincipal | None:
+    """
+    Load the authenticated principal snapshot for a user ("auth principal" mode).
+
+    Fetches PRINCIPAL_COLUMNS plus the subscription status and plan in a
+    single statement. No ORM relationship is loaded: endpoints that need a
+    user's recordings or quota must query them explicitly.
+
+    Args:
+        db: Database session
+        user_id: User's UUID
+
+    Returns:
+        AuthPrincipal if the user exists, None otherwise
+    """
+    result = await db.execute(
+        select(
+            *PRINCIPAL_COLUMNS,
+            Subscription.status,
+            Subscription.plan_id,
+            Subscription.trial_ends_at,
+        )
+        .outerjoin(Subscription, Subscription.user_id == User.id)
+        .where(User.id == user_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+
+    return AuthPrincipal(
+        id=row.id,
+        email=row.email,
+        name=row.name,
+        avatar_url=row.avatar_url,
+        is_admin=row.is_admin,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+        subscription_status=row.status,
+        plan_id=row.plan_id,
+        trial_ends_at=row.trial_ends_at,
+    )
+
+
 async def get_user_by_google_id(db: AsyncSession, google_id: str) -> User | None:
     """
     Get a user by their Google OAuth ID.
@@ -102,6 +159,7 @@ async def update_user_profile(
 
     await db.commit()
     await db.refresh(user)
+    invalidate_principal(user.id)
     return user
 
 
@@ -144,6 +202,7 @@ async def get_or_create_user(
         if updated:
             await db.commit()
             await db.refresh(user)
+            invalidate_principal(user.id)
 
         return user, False
 
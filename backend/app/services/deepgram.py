@@ -1,16 +1,22 @@
 """Deepgram transcription service for audio-to-text conversion.
 
-Uses the pre-recorded API since the frontend sends the complete audio
-file after recording stops (not real-time streaming).
+Uses the pre-recorded API for audio sent after recording stops. Uploads
+can either be passed as bytes or forwarded chunk-by-chunk as they are
+received; long recordings can be split into segments transcribed in
+parallel. Real-time transcription while recording is handled by
+app.services.deepgram_live.
 """
 
 import asyncio
 import logging
 import time
+from collections.abc import AsyncIterator
+from contextlib import AbstractAsyncContextManager, nullcontext
 from typing import NamedTuple
 
+import httpx
 import sentry_sdk
-from deepgram import DeepgramClient
+from deepgram import AsyncDeepgramClient
 from deepgram.core.api_error import ApiError
 from tenacity import (
     retry,
@@ -20,37 +26,141 @@ from tenacity import (
 )
 
 from app.config import get_settings
+from app.core.circuit_breaker import CircuitOpenError, circuit_breaker
+from app.core.deadline import (
+    Deadline,
+    DeadlineExceededError,
+    record_deadline_exceeded,
+    stop_at_deadline,
+    wait_within_deadline,
+)
+from app.services.webm import WebMFormatError, split_webm
 
 logger = logging.getLogger(__name__)
 
-# Singleton Deepgram client - reused across requests
-_client: DeepgramClient | None = None
+# Singleton Deepgram client - reused across requests so HTTP connections
+# (TLS handshakes) are kept alive and shared
+_client: AsyncDeepgramClient | None = None
+_http_client: httpx.AsyncClient | None = None
+
+# Limits the number of in-flight Deepgram requests per process
+_semaphore: asyncio.Semaphore | None = None
 
 # Timeout for Deepgram API calls (seconds)
 DEEPGRAM_TIMEOUT_SECONDS = 30
 
+# Remaining time below which a retry is not attempted (seconds)
+MIN_ATTEMPT_SECONDS = 1.0
+
+
+class AudioSourceError(Exception):
+    """Raised when forwarded audio stops arriving (e.g. the client disconnected)."""
+
+
+def _caused_by_audio_source(exc: BaseException) -> bool:
+    """Tell whether an error comes from the forwarded audio, however wrapped."""
+    seen: set[int] = set()
+    current: BaseException | None = exc
+    while current is not None and id(current) not in seen:
+        if isinstance(current, AudioSourceError):
+            return True
+        seen.add(id(current))
+        current = current.__cause__ or current.__context__
+    return False
+
+
+def _is_provider_failure(exc: BaseException) -> bool:
+    """
+    Tell whether an error should count against the Deepgram circuit.
+
+    Client errors caused by the request itself (e.g. unreadable audio, or
+    an upload interrupted by the client) do not mean Deepgram is degraded;
+    rate limiting does.
 
-def _get_client() -> DeepgramClient:
+    Args:
+        exc: Exception raised by a Deepgram call
+
+    Returns:
+        False for errors of the audio source and 4xx API errors other
+        than 429 (also when wrapped in DeepgramTranscriptionError), True
+        otherwise
+    """
+    if _caused_by_audio_source(exc):
+        return False
+    if isinstance(exc, DeepgramTranscriptionError) and exc.__cause__ is not None:
+        # A segment of a chunked recording, judged by its underlying error
+        return _is_provider_failure(exc.__cause__)
+    if isinstance(exc, ApiError) and exc.status_code is not None:
+        return not (400 <= exc.status_code < 500) or exc.status_code == 429
+    return True
+
+
+# Fails fast while Deepgram is down or too slow
+_breaker = circuit_breaker(
+    "deepgram",
+    failure_threshold=get_settings().circuit_breaker_failure_threshold,
+    reset_timeout_seconds=get_settings().circuit_breaker_reset_seconds,
+    slow_call_seconds=get_settings().deepgram_slow_call_seconds,
+    is_failure=_is_provider_failure,
+)
+
+
+def _get_client() -> AsyncDeepgramClient:
     """
-    Get or create a singleton DeepgramClient instance.
+    Get or create a singleton AsyncDeepgramClient instance.
+
+    The client runs on a pooled httpx.AsyncClient, so transcriptions are
+    awaited on the event loop instead of pinning executor threads.
 
     Returns:
-        DeepgramClient instance configured with API key
+        AsyncDeepgramClient instance configured with API key
 
     Raises:
         DeepgramTranscriptionError: If API key is not configured
     """
-    global _client
+    global _client, _http_client
     if _client is None:
         settings = get_settings()
         if not settings.deepgram_api_key or not settings.deepgram_api_key.strip():
             raise DeepgramTranscriptionError(
                 "Deepgram API key not configured or empty"
             )
-        _client = DeepgramClient(api_key=settings.deepgram_api_key)
+        _http_client = httpx.AsyncClient(
+            timeout=DEEPGRAM_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=settings.deepgram_max_concurrency,
+                max_keepalive_connections=settings.deepgram_max_keepalive_connections,
+            ),
+        )
+        _client = AsyncDeepgramClient(
+            api_key=settings.deepgram_api_key,
+            httpx_client=_http_client,
+        )
     return _client
 
 
+def _get_semaphore() -> asyncio.Semaphore:
+    """
+    Get or create the semaphore bounding concurrent Deepgram requests.
+
+    Returns:
+        Semaphore sized by the deepgram_max_concurrency setting
+    """
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(get_settings().deepgram_max_concurrency)
+    return _semaphore
+
+
+async def close_client() -> None:
+    """Close the Deepgram client's HTTP connections (application shutdown)."""
+    global _client, _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+    _client = None
+    _http_client = None
+
+
 class DeepgramTranscriptionError(Exception):
     """Custom exception for Deepgram transcription failures."""
 
@@ -75,28 +185,32 @@ class TranscriptionResult(NamedTuple):
 
 
 @retry(
-    stop=stop_after_attempt(2),
-    wait=wait_fixed(1),
+    stop=stop_after_attempt(2) | stop_at_deadline(MIN_ATTEMPT_SECONDS),
+    wait=wait_within_deadline(wait_fixed(1), MIN_ATTEMPT_SECONDS),
     retry=retry_if_exception_type((ApiError, ConnectionError, TimeoutError)),
     reraise=True,
 )
-def _transcribe_with_retry(
-    client: DeepgramClient,
+async def _transcribe_with_retry(
+    client: AsyncDeepgramClient,
     audio_data: bytes,
     model: str,
     language: str,
+    deadline: Deadline | None = None,
 ) -> object:
     """
     Internal function to transcribe audio with retry logic.
 
     Limited to 1 retry with 1s wait to stay within the 5s latency target.
     Only retries on transient errors (API errors, connection issues, timeouts).
+    With a deadline, the request timeout is bounded by the remaining time
+    and the retry is skipped when it could not finish in time.
 
     Args:
         client: Deepgram client instance
         audio_data: Raw audio bytes
         model: Deepgram model to use (e.g., 'nova-3')
         language: Language code or 'multi' for auto-detection
+        deadline: Optional request deadline (keyword argument)
 
     Returns:
         Deepgram API response object
@@ -106,21 +220,102 @@ def _transcribe_with_retry(
         ConnectionError: If connection to Deepgram fails after retries
         TimeoutError: If request times out after retries
     """
-    response = client.listen.v1.media.transcribe_file(
+    response = await client.listen.v1.media.transcribe_file(
         request=audio_data,
         model=model,
         language=language if language != "multi" else None,
         detect_language=language == "multi",
         smart_format=True,
         punctuate=True,
-        request_options={"timeout_in_seconds": DEEPGRAM_TIMEOUT_SECONDS},
+        request_options={"timeout_in_seconds": _request_timeout(deadline)},
     )
     return response
 
 
+def _request_timeout(deadline: Deadline | None) -> float:
+    """
+    Get the timeout of a Deepgram request.
+
+    Args:
+        deadline: Optional request deadline
+
+    Returns:
+        DEEPGRAM_TIMEOUT_SECONDS, bounded by the time left before the deadline
+    """
+    if deadline is None:
+        return DEEPGRAM_TIMEOUT_SECONDS
+    return deadline.timeout(DEEPGRAM_TIMEOUT_SECONDS)
+
+
+def _build_result(
+    response: object, latency_ms: float, audio_size_bytes: int
+) -> TranscriptionResult:
+    """
+    Extract the transcript from a Deepgram response and log metrics.
+
+    Args:
+        response: Deepgram pre-recorded API response
+        latency_ms: Time taken for transcription in milliseconds
+        audio_size_bytes: Size of the transcribed audio
+
+    Returns:
+        TranscriptionResult with transcript, detected language, and latency
+
+    Raises:
+        DeepgramTranscriptionError: If the response has no transcript
+    """
+    # Extract transcript from response
+    channels = response.results.channels
+    if not channels:
+        raise DeepgramTranscriptionError("No channels in Deepgram response")
+
+    alternatives = channels[0].alternatives
+    if not alternatives:
+        raise DeepgramTranscriptionError("No alternatives in Deepgram response")
+
+    transcript = alternatives[0].transcript or ""
+
+    # Extract detected language
+    language_detected = getattr(channels[0], "detected_language", None)
+
+    # Extract duration from metadata
+    duration_seconds = getattr(response.metadata, "duration", None)
+
+    # Log transcription metrics
+    logger.info(
+        "Transcription completed",
+        extra={
+            "latency_ms": round(latency_ms, 2),
+            "transcript_length": len(transcript),
+            "language_detected": language_detected,
+            "duration_seconds": duration_seconds,
+            "audio_size_bytes": audio_size_bytes,
+        },
+    )
+
+    # Warn if latency exceeds target (5 seconds)
+    if latency_ms > 5000:
+        logger.warning(
+            "Transcription latency exceeded target",
+            extra={
+                "latency_ms": round(latency_ms, 2),
+                "target_ms": 5000,
+            },
+        )
+
+    return TranscriptionResult(
+        transcript=transcript,
+        language_detected=language_detected,
+        duration_seconds=duration_seconds,
+        latency_ms=latency_ms,
+    )
+
+
 async def transcribe_audio(
     audio_data: bytes,
     language: str = "multi",
+    deadline: Deadline | None = None,
+    count_in_circuit: bool = True,
 ) -> TranscriptionResult:
     """
     Transcribe audio using Deepgram Nova-3 pre-recorded API.
@@ -129,18 +324,25 @@ async def transcribe_audio(
     Uses the pre-recorded API since the frontend sends complete audio
     after recording stops (not real-time streaming).
 
-    The synchronous Deepgram SDK call is offloaded to a thread pool
-    via asyncio.to_thread() to avoid blocking the FastAPI event loop.
+    The request is awaited on the event loop through the async SDK client,
+    and waits for a free slot when deepgram_max_concurrency requests are
+    already in flight. Only the call itself, not the wait for a slot, is
+    timed by the circuit breaker.
 
     Args:
         audio_data: Raw audio bytes (WebM/Opus format)
         language: Language code or "multi" for auto-detection (default: "multi")
+        deadline: Optional request deadline bounding timeouts and retries
+        count_in_circuit: Record the outcome in the Deepgram circuit breaker;
+            False for the segments of transcribe_audio_chunked, which
+            records one outcome for the whole recording
 
     Returns:
         TranscriptionResult with transcript, detected language, and latency
 
     Raises:
-        DeepgramTranscriptionError: If transcription fails after retries
+        DeepgramTranscriptionError: If transcription fails after retries or
+            the deadline is exceeded
 
     Example:
         >>> audio_bytes = await audio_file.read()
@@ -157,68 +359,34 @@ async def transcribe_audio(
     start_time = time.time()
 
     try:
+        if deadline is not None:
+            deadline.check("transcription")
         client = _get_client()
         model = settings.deepgram_model
 
-        # Offload synchronous SDK call to thread pool to avoid blocking event loop
-        response = await asyncio.to_thread(
-            _transcribe_with_retry, client, audio_data, model, language
+        guard: AbstractAsyncContextManager[None] = (
+            _breaker.guard() if count_in_circuit else nullcontext()
         )
+        async with _get_semaphore(), guard:
+            response = await _transcribe_with_retry(
+                client, audio_data, model, language, deadline=deadline
+            )
 
         # Calculate latency
         latency_ms = (time.time() - start_time) * 1000
 
-        # Extract transcript from response
-        channels = response.results.channels
-        if not channels:
-            raise DeepgramTranscriptionError("No channels in Deepgram response")
-
-        alternatives = channels[0].alternatives
-        if not alternatives:
-            raise DeepgramTranscriptionError("No alternatives in Deepgram response")
-
-        transcript = alternatives[0].transcript or ""
-
-        # Extract detected language
-        language_detected = getattr(channels[0], "detected_language", None)
-
-        # Extract duration from metadata
-        duration_seconds = getattr(response.metadata, "duration", None)
-
-        # Log transcription metrics
-        logger.info(
-            "Transcription completed",
-            extra={
-                "latency_ms": round(latency_ms, 2),
-                "transcript_length": len(transcript),
-                "language_detected": language_detected,
-                "duration_seconds": duration_seconds,
-                "audio_size_bytes": len(audio_data),
-            },
-        )
-
-        # Warn if latency exceeds target (5 seconds)
-        if latency_ms > 5000:
-            logger.warning(
-                "Transcription latency exceeded target",
-                extra={
-                    "latency_ms": round(latency_ms, 2),
-                    "target_ms": 5000,
-                },
-            )
-
-        return TranscriptionResult(
-            transcript=transcript,
-            language_detected=language_detected,
-            duration_seconds=duration_seconds,
-            latency_ms=latency_ms,
-        )
+        return _build_result(response, latency_ms, len(audio_data))
 
     except DeepgramTranscriptionError:
         # Re-raise our custom errors
         raise
+    except (CircuitOpenError, DeadlineExceededError) as e:
+        logger.warning("Deepgram call rejected: %s", e)
+        raise DeepgramTranscriptionError(str(e)) from e
     except (ApiError, ConnectionError, TimeoutError) as e:
         latency_ms = (time.time() - start_time) * 1000
+        if deadline is not None and deadline.expired:
+            record_deadline_exceeded("transcription")
 
         logger.error(
             "Deepgram transcription failed",
@@ -249,3 +417,195 @@ async def transcribe_audio(
 
         sentry_sdk.capture_exception(e)
         raise DeepgramTranscriptionError(f"Transcription failed: {str(e)}") from e
+
+
+async def transcribe_audio_stream(
+    chunks: AsyncIterator[bytes],
+    language: str = "multi",
+    deadline: Deadline | None = None,
+) -> TranscriptionResult:
+    """
+    Transcribe audio forwarded chunk-by-chunk to the Deepgram pre-recorded API.
+
+    The chunks are streamed as the HTTP request body as they are received,
+    so peak memory per upload stays at a few chunks regardless of the
+    recording length, and the audio is never buffered or written to disk
+    (RGPD). A consumed stream cannot be replayed, so unlike transcribe_audio
+    there is no automatic retry: the client has to upload again.
+
+    Args:
+        chunks: Async iterator of raw audio chunks (WebM/Opus format)
+        language: Language code or "multi" for auto-detection (default: "multi")
+        deadline: Optional request deadline bounding the request timeout
+
+    Returns:
+        TranscriptionResult with transcript, detected language, and latency
+
+    Raises:
+        DeepgramTranscriptionError: If transcription fails or the deadline
+            is exceeded
+    """
+    settings = get_settings()
+
+    if not settings.deepgram_api_key or not settings.deepgram_api_key.strip():
+        logger.error("DEEPGRAM_API_KEY not configured")
+        raise DeepgramTranscriptionError("Deepgram API key not configured or empty")
+
+    start_time = time.time()
+    audio_size_bytes = 0
+
+    async def counted() -> AsyncIterator[bytes]:
+        nonlocal audio_size_bytes
+        try:
+            async for chunk in chunks:
+                audio_size_bytes += len(chunk)
+                yield chunk
+        except Exception as e:
+            raise AudioSourceError(f"Audio upload interrupted: {e}") from e
+
+    try:
+        if deadline is not None:
+            deadline.check("transcription")
+        client = _get_client()
+        async with _get_semaphore(), _breaker.guard():
+            response = await client.listen.v1.media.transcribe_file(
+                request=counted(),
+                model=settings.deepgram_model,
+                language=language if language != "multi" else None,
+                detect_language=language == "multi",
+                smart_format=True,
+                punctuate=True,
+                request_options={"timeout_in_seconds": _request_timeout(deadline)},
+            )
+
+        latency_ms = (time.time() - start_time) * 1000
+
+        return _build_result(response, latency_ms, audio_size_bytes)
+
+    except DeepgramTranscriptionError:
+        raise
+    except (CircuitOpenError, DeadlineExceededError) as e:
+        logger.warning("Deepgram call rejected: %s", e)
+        raise DeepgramTranscriptionError(str(e)) from e
+    except Exception as e:
+        if _caused_by_audio_source(e):
+            logger.warning(
+                "Streamed upload interrupted",
+                extra={"error": str(e), "audio_size_bytes": audio_size_bytes},
+            )
+            raise DeepgramTranscriptionError("Audio upload interrupted") from e
+
+        latency_ms = (time.time() - start_time) * 1000
+        if deadline is not None and deadline.expired:
+            record_deadline_exceeded("transcription")
+
+        logger.error(
+            "Deepgram streamed transcription failed",
+            extra={
+                "error": str(e),
+                "error_type": type(e).__name__,
+                "latency_ms": round(latency_ms, 2),
+                "audio_size_bytes": audio_size_bytes,
+            },
+            exc_info=True,
+        )
+
+        sentry_sdk.capture_exception(e)
+        raise DeepgramTranscriptionError(f"Transcription failed: {str(e)}") from e
+
+
+async def transcribe_audio_chunked(
+    audio_data: bytes,
+    language: str = "multi",
+    deadline: Deadline | None = None,
+) -> TranscriptionResult:
+    """
+    Transcribe a long recording as segments transcribed in parallel.
+
+    The WebM audio is split at quiet Cluster boundaries into segments of
+    about deepgram_chunk_seconds (see app.services.webm), at most
+    deepgram_chunk_parallelism of which are transcribed at the same time
+    by transcribe_audio, so latency depends on the segment length rather
+    than on the recording length. The recording counts as one call for
+    the circuit breaker. Transcripts are joined in recording order; the
+    detected language is the one spoken for the longest time.
+    Audio that cannot be split is transcribed as a single request.
+
+    Args:
+        audio_data: Raw audio bytes (WebM/Opus format)
+        language: Language code or "multi" for auto-detection (default: "multi")
+        deadline: Optional request deadline shared by all segments
+
+    Returns:
+        TranscriptionResult for the whole recording
+
+    Raises:
+        DeepgramTranscriptionError: If any segment fails to transcribe
+    """
+    settings = get_settings()
+
+    try:
+        segments = await asyncio.to_thread(
+            split_webm, audio_data, settings.deepgram_chunk_seconds
+        )
+    except WebMFormatError as e:
+        logger.warning("Audio not split for transcription: %s", e)
+        segments = []
+    if len(segments) <= 1:
+        return await transcribe_audio(audio_data, language, deadline=deadline)
+
+    start_time = time.time()
+    limiter = asyncio.Semaphore(settings.deepgram_chunk_parallelism)
+
+    async def transcribe_segment(data: bytes) -> TranscriptionResult:
+        async with limiter:
+            return await transcribe_audio(
+                data, language, deadline=deadline, count_in_circuit=False
+            )
+
+    try:
+        # One outcome per recording, so a long recording does not use up
+        # the failure budget on its own
+        async with _breaker.guard(timed=False):
+            tasks = [
+                asyncio.create_task(transcribe_segment(segment.data))
+                for segment in segments
+            ]
+            try:
+                results = await asyncio.gather(*tasks)
+            except BaseException:
+                # One failed segment fails the recording
+                for task in tasks:
+                    task.cancel()
+                raise
+    except CircuitOpenError as e:
+        logger.warning("Deepgram call rejected: %s", e)
+        raise DeepgramTranscriptionError(str(e)) from e
+
+    # Seconds spoken per detected language
+    spoken: dict[str, float] = {}
+    for segment, result in zip(segments, results):
+        if result.language_detected and result.transcript.strip():
+            spoken[result.language_detected] = (
+                spoken.get(result.language_detected, 0.0) + segment.duration_seconds
+            )
+    durations = [r.duration_seconds for r in results if r.duration_seconds is not None]
+    latency_ms = (time.time() - start_time) * 1000
+
+    logger.info(
+        "Chunked transcription completed",
+        extra={
+            "segments": len(segments),
+            "latency_ms": round(latency_ms, 2),
+            "audio_size_bytes": len(audio_data),
+        },
+    )
+
+    return TranscriptionResult(
+        transcript=" ".join(
+            result.transcript.strip() for result in results if result.transcript.strip()
+        ),
+        language_detected=max(spoken, key=spoken.__getitem__) if spoken else None,
+        duration_seconds=sum(durations) if durations else None,
+        latency_ms=latency_ms,
+    )
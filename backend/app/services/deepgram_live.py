@@ -0,0 +1,176 @@
+"""Deepgram live (streaming) transcription over WebSocket.
+
+Relays audio frames to a Deepgram live session while the physiotherapist
+is still recording, so the transcript is ready a few seconds after the
+stop button instead of after a full pre-recorded transcription.
+
+IMPORTANT: audio frames are forwarded as they arrive and never stored
+(RGPD).
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import NamedTuple
+from urllib.parse import urlencode
+
+import sentry_sdk
+from websockets.asyncio.client import ClientConnection, connect
+from websockets.exceptions import WebSocketException
+
+from app.config import get_settings
+from app.services.deepgram import DeepgramTranscriptionError, TranscriptionResult
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for Deepgram to flush final results after the stream ends
+FINALIZE_TIMEOUT_SECONDS = 10
+
+
+class TranscriptSegment(NamedTuple):
+    """
+    A transcript segment received from a live session.
+
+    Attributes:
+        text: Transcribed text of the segment
+        is_final: Whether Deepgram will no longer revise this segment
+    """
+
+    text: str
+    is_final: bool
+
+
+def _live_url(language: str) -> str:
+    """
+    Build the live session URL with transcription options.
+
+    Args:
+        language: Language code or "multi" for auto-detection
+
+    Returns:
+        WebSocket URL including query parameters
+    """
+    settings = get_settings()
+    params = {
+        "model": settings.deepgram_model,
+        "language": language,
+        "smart_format": "true",
+        "punctuate": "true",
+        "interim_results": "true",
+    }
+    return f"{settings.deepgram_live_url}?{urlencode(params)}"
+
+
+async def transcribe_live(
+    frames: AsyncIterator[bytes],
+    on_segment: Callable[[TranscriptSegment], Awaitable[None]] | None = None,
+    language: str = "multi",
+) -> TranscriptionResult:
+    """
+    Stream audio frames to a Deepgram live session and collect the transcript.
+
+    Final segments are accumulated into the returned transcript; interim
+    and final segments are also passed to on_segment as they arrive.
+
+    Args:
+        frames: Async iterator of audio frames (e.g. WebM/Opus MediaRecorder chunks),
+            ending when the recording stops
+        on_segment: Optional coroutine called for each non-empty segment
+        language: Language code or "multi" for auto-detection (default: "multi")
+
+    Returns:
+        TranscriptionResult whose latency_ms is the time between the end of
+        the audio and the final transcript
+
+    Raises:
+        DeepgramTranscriptionError: If the live session fails
+    """
+    settings = get_settings()
+
+    if not settings.deepgram_api_key or not settings.deepgram_api_key.strip():
+        logger.error("DEEPGRAM_API_KEY not configured")
+        raise DeepgramTranscriptionError("Deepgram API key not configured or empty")
+
+    final_segments: list[str] = []
+    duration_seconds: float | None = None
+    stopped_at: float | None = None
+
+    async def send_audio(ws: ClientConnection) -> None:
+        nonlocal stopped_at
+        async for frame in frames:
+            await ws.send(frame)
+        stopped_at = time.time()
+        # Ask Deepgram to flush pending results and close the session
+        await ws.send(json.dumps({"type": "CloseStream"}))
+
+    async def receive_results(ws: ClientConnection) -> None:
+        nonlocal duration_seconds
+        async for message in ws:
+            data = json.loads(message)
+            if data.get("type") == "Metadata":
+                duration_seconds = data.get("duration", duration_seconds)
+                continue
+            if data.get("type") != "Results":
+                continue
+
+            alternatives = data.get("channel", {}).get("alternatives") or [{}]
+            text = alternatives[0].get("transcript") or ""
+            if not text:
+                continue
+            segment = TranscriptSegment(text=text, is_final=bool(data.get("is_final")))
+            if segment.is_final:
+                final_segments.append(text)
+            if on_segment is not None:
+                await on_segment(segment)
+
+    try:
+        async with connect(
+            _live_url(language),
+            additional_headers={"Authorization": f"Token {settings.deepgram_api_key}"},
+        ) as ws:
+            sender = asyncio.create_task(send_audio(ws))
+            receiver = asyncio.create_task(receive_results(ws))
+            try:
+                await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+                if sender.done():
+                    # Re-raise audio source errors, then wait for the final results
+                    sender.result()
+                    await asyncio.wait_for(receiver, timeout=FINALIZE_TIMEOUT_SECONDS)
+                else:
+                    # Deepgram ended the session before the audio did
+                    receiver.result()
+            finally:
+                sender.cancel()
+                receiver.cancel()
+    except DeepgramTranscriptionError:
+        raise
+    except (WebSocketException, OSError, TimeoutError, ValueError) as e:
+        logger.error(
+            "Deepgram live transcription failed",
+            extra={"error": str(e), "error_type": type(e).__name__},
+            exc_info=True,
+        )
+        sentry_sdk.capture_exception(e)
+        raise DeepgramTranscriptionError(f"Live transcription failed: {e}") from e
+
+    latency_ms = (time.time() - stopped_at) * 1000 if stopped_at else 0.0
+    transcript = " ".join(final_segments)
+
+    logger.info(
+        "Live transcription completed",
+        extra={
+            "finalize_latency_ms": round(latency_ms, 2),
+            "transcript_length": len(transcript),
+            "segments": len(final_segments),
+            "duration_seconds": duration_seconds,
+        },
+    )
+
+    return TranscriptionResult(
+        transcript=transcript,
+        language_detected=None,
+        duration_seconds=duration_seconds,
+        latency_ms=latency_ms,
+    )
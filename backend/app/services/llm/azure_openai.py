@@ -21,6 +21,8 @@ class AzureOpenAILLMClient(BaseLLMClient):
         transcript: str,
         template: str,
         language: str,
+        note_format: str = "paragraph",
+        verbosity: str = "medium",
     ) -> SOAPNoteOutput:
         """Extract a structured SOAP note via Azure OpenAI.
 
@@ -28,6 +30,8 @@ class AzureOpenAILLMClient(BaseLLMClient):
             transcript: Transcribed text from the consultation
             template: SOAP template defining expected structure
             language: Output language for the note (fr/de/en)
+            note_format: Note format preference (paragraph/bullets)
+            verbosity: Note verbosity level (concise/medium)
 
         Returns:
             SOAPNoteOutput with the 4 SOAP sections
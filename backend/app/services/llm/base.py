@@ -1,6 +1,7 @@
 """Abstract base class for LLM providers."""
 
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 
 from pydantic import BaseModel
 
@@ -27,14 +28,21 @@ class BaseLLMClient(ABC):
     Implementations must provide SOAP note extraction from transcripts.
     This abstraction allows switching between providers (Mistral, Azure OpenAI)
     via configuration only.
+
+    Attributes:
+        model: Identifier of the model producing the notes
     """
 
+    model: str = ""
+
     @abstractmethod
     async def extract_soap_note(
         self,
         transcript: str,
         template: str,
         language: str,
+        note_format: str = "paragraph",
+        verbosity: str = "medium",
     ) -> SOAPNoteOutput:
         """Extract a structured SOAP note from a consultation transcript.
 
@@ -42,8 +50,40 @@ class BaseLLMClient(ABC):
             transcript: Transcribed text from the consultation
             template: SOAP template defining expected structure
             language: Output language for the note (fr/de/en)
+            note_format: Note format preference (paragraph/bullets)
+            verbosity: Note verbosity level (concise/medium)
 
         Returns:
             SOAPNoteOutput with the 4 SOAP sections
         """
         ...
+
+    async def stream_soap_note(
+        self,
+        transcript: str,
+        template: str,
+        language: str,
+        note_format: str = "paragraph",
+        verbosity: str = "medium",
+    ) -> AsyncIterator[str]:
+        """Stream the SOAP note JSON object as text deltas.
+
+        Providers with a streaming API should override this so sections can
+        be shown while the rest of the note is generated. The default
+        implementation waits for extract_soap_note and yields the complete
+        JSON object at once.
+
+        Args:
+            transcript: Transcribed text from the consultation
+            template: SOAP template defining expected structure
+            language: Output language for the note (fr/de/en)
+            note_format: Note format preference (paragraph/bullets)
+            verbosity: Note verbosity level (concise/medium)
+
+        Yields:
+            Successive pieces of the JSON object text
+        """
+        note = await self.extract_soap_note(
+            transcript, template, language, note_format, verbosity
+        )
+        yield note.model_dump_json()
@@ -1,31 +1,116 @@
-"""Factory for creating LLM client instances based on configuration."""
+"""Factory for creating LLM client instances based on configuration.
+
+Clients are created once per provider and reused for every note, so
+HTTP connections (TLS handshakes) to the provider are kept alive and
+shared. The registry is warmed and closed by the application lifespan.
+"""
+
+import httpx
 
 from app.config import get_settings
 from app.services.llm.base import BaseLLMClient
 
+# Client registry, one instance per provider
+_clients: dict[str, BaseLLMClient] = {}
 
-def get_llm_client() -> BaseLLMClient:
-    """Create and return the configured LLM client instance.
+# Keep-alive connection pool shared by the provider clients
+_http_client: httpx.AsyncClient | None = None
 
-    Uses the LLM_PROVIDER environment variable to determine which
-    implementation to instantiate.
+
+def _get_http_client() -> httpx.AsyncClient:
+    """
+    Get or create the pooled HTTP client used for LLM API calls.
 
     Returns:
-        BaseLLMClient implementation (MistralLLMClient or AzureOpenAILLMClient)
+        httpx.AsyncClient with connection limits from settings
+    """
+    global _http_client
+    if _http_client is None:
+        settings = get_settings()
+        _http_client = httpx.AsyncClient(
+            timeout=settings.llm_timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=settings.llm_max_connections,
+                max_keepalive_connections=settings.llm_max_keepalive_connections,
+            ),
+        )
+    return _http_client
 
-    Raises:
-        ValueError: If the configured LLM_PROVIDER is not supported
+
+def _create_client(provider: str, model: str | None = None) -> BaseLLMClient:
     """
-    settings = get_settings()
-    provider = settings.llm_provider
+    Instantiate the client of a provider.
 
+    Args:
+        provider: Provider name (mistral/azure_openai)
+        model: Optional model overriding the provider default
+
+    Returns:
+        BaseLLMClient implementation
+
+    Raises:
+        ValueError: If the provider is not supported
+    """
     if provider == "mistral":
         from app.services.llm.mistral import MistralLLMClient
 
-        return MistralLLMClient()
+        if model:
+            return MistralLLMClient(http_client=_get_http_client(), model=model)
+        return MistralLLMClient(http_client=_get_http_client())
     elif provider == "azure_openai":
         from app.services.llm.azure_openai import AzureOpenAILLMClient
 
         return AzureOpenAILLMClient()
     else:
         raise ValueError(f"Unsupported LLM provider: {provider}")
+
+
+def get_llm_client() -> BaseLLMClient:
+    """Return the configured LLM client instance.
+
+    Uses the LLM_PROVIDER environment variable to determine which
+    implementation to use. When LLM_FALLBACK_PROVIDER is set, the client
+    is an LLMRouter hedging and failing over to the fallback. The instance
+    is created on first use and reused afterwards.
+
+    Returns:
+        BaseLLMClient implementation (MistralLLMClient, AzureOpenAILLMClient
+        or LLMRouter)
+
+    Raises:
+        ValueError: If the configured LLM_PROVIDER is not supported
+    """
+    settings = get_settings()
+    provider = settings.llm_provider
+    fallback = settings.llm_fallback_provider
+    key = f"{provider}+{fallback}" if fallback else provider
+
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    client = _create_client(provider)
+    if fallback:
+        from app.services.llm.router import LLMRouter
+
+        fallback_model = settings.llm_fallback_model
+        client = LLMRouter(
+            [
+                (f"{provider}:{client.model}", client),
+                (f"{fallback}:{fallback_model}", _create_client(fallback, fallback_model)),
+            ],
+            hedge_percentile=settings.llm_hedge_percentile,
+            min_hedge_delay_seconds=settings.llm_hedge_min_delay_seconds,
+        )
+
+    _clients[key] = client
+    return client
+
+
+async def close_llm_clients() -> None:
+    """Drop the registered clients and close their connections (application shutdown)."""
+    global _http_client
+    _clients.clear()
+    if _http_client is not None:
+        await _http_client.aclose()
+    _http_client = None
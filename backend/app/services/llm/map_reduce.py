@@ -0,0 +1,145 @@
+"""Splitting of long transcripts and merging of partial SOAP notes.
+
+Very long consultations are extracted in map-reduce mode: the transcript
+is split into overlapping chunks of whole sentences, a partial SOAP note
+is extracted from each chunk concurrently (map), and the partial notes
+are merged section by section (reduce). The merge is deterministic: it
+keeps every documented statement once, in consultation order, and only
+falls back to a "not documented" placeholder when no chunk documents a
+section, so no statement is rewritten by a second LLM pass.
+"""
+
+import re
+import unicodedata
+
+from app.services.llm.base import SOAPNoteOutput
+
+# Average characters per token of the supported languages (no tokenizer
+# is bundled with the provider SDKs, this is close enough for thresholds)
+CHARS_PER_TOKEN = 4
+
+# Section texts meaning "nothing documented" (prompt rule 5 and its
+# translations the model may use for de/en notes)
+PLACEHOLDERS = frozenset(
+    {
+        "non documente",
+        "a completer",
+        "nicht dokumentiert",
+        "zu erganzen",
+        "not documented",
+        "to be completed",
+    }
+)
+
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens of a text.
+
+    Args:
+        text: Any text
+
+    Returns:
+        Approximate token count
+    """
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def split_transcript(
+    transcript: str, chunk_tokens: int, overlap_tokens: int
+) -> list[str]:
+    """
+    Split a transcript into chunks of whole sentences that overlap.
+
+    Each chunk repeats the last sentences of the previous one (about
+    overlap_tokens), so a statement cut by a chunk boundary is still seen
+    whole by one of the two chunks.
+
+    Args:
+        transcript: Consultation transcript text
+        chunk_tokens: Target size of a chunk
+        overlap_tokens: Size of the repeated context between chunks
+
+    Returns:
+        Chunks in transcript order (a single chunk for short transcripts)
+    """
+    sentences = [s for s in _SENTENCE_END.split(transcript.strip()) if s]
+    chunks: list[str] = []
+    current: list[str] = []
+    size = 0
+    for sentence in sentences:
+        tokens = estimate_tokens(sentence)
+        if current and size + tokens > chunk_tokens:
+            chunks.append(" ".join(current))
+            # Carry the tail of the chunk over as overlap
+            overlap: list[str] = []
+            overlap_size = 0
+            for previous in reversed(current):
+                overlap_size += estimate_tokens(previous)
+                if overlap_size > overlap_tokens:
+                    break
+                overlap.insert(0, previous)
+            current = overlap
+            size = sum(estimate_tokens(s) for s in current)
+        current.append(sentence)
+        size += tokens
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def _normalize(text: str) -> str:
+    """Lowercase a statement without accents, punctuation or bullet marks."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+def _statements(text: str, note_format: str) -> list[str]:
+    """Split a section into statements: lines for bullets, sentences otherwise."""
+    if note_format == "bullets":
+        return [line.strip() for line in text.splitlines() if line.strip()]
+    return [s.strip() for s in _SENTENCE_END.split(text.strip()) if s.strip()]
+
+
+def merge_soap_notes(
+    notes: list[SOAPNoteOutput], note_format: str = "paragraph"
+) -> SOAPNoteOutput:
+    """
+    Merge partial SOAP notes of consecutive transcript chunks.
+
+    Statements repeated across notes (e.g. from the overlap between
+    chunks) are kept once, and placeholders are dropped when another note
+    documents the section.
+
+    Args:
+        notes: Partial notes in transcript order
+        note_format: Note format preference (paragraph/bullets)
+
+    Returns:
+        The merged SOAP note
+    """
+    merged: dict[str, str] = {}
+    for section in ("subjective", "objective", "assessment", "plan"):
+        seen: set[str] = set()
+        parts: list[str] = []
+        for note in notes:
+            text = getattr(note, section)
+            if _normalize(text) in PLACEHOLDERS:
+                continue
+            statements = []
+            for statement in _statements(text, note_format):
+                key = _normalize(statement)
+                if key and key not in seen:
+                    seen.add(key)
+                    statements.append(statement)
+            if statements:
+                separator = "\n" if note_format == "bullets" else " "
+                parts.append(separator.join(statements))
+        if parts:
+            merged[section] = ("\n" if note_format == "bullets" else "\n\n").join(parts)
+        else:
+            merged[section] = getattr(notes[0], section)
+    return SOAPNoteOutput(**merged)
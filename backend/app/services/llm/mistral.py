@@ -1,16 +1,17 @@
 """Mistral AI implementation of the LLM client."""
 
-import json
 import logging
+from collections.abc import AsyncIterator
+from typing import Any
 
+import httpx
 from mistralai import Mistral
 
 from app.config import get_settings
 from app.services.llm.base import BaseLLMClient, SOAPNoteOutput
 from app.services.llm.prompts.soap_extraction import (
-    build_soap_system_prompt,
-    build_soap_user_prompt,
-    validate_soap_json_structure,
+    build_soap_messages,
+    parse_soap_note_json,
 )
 
 logger = logging.getLogger(__name__)
@@ -19,21 +20,39 @@ logger = logging.getLogger(__name__)
 class MistralLLMClient(BaseLLMClient):
     """Mistral AI client for SOAP note extraction.
 
-    Uses the mistral-large-2 model with JSON output mode for structured
-    extraction of SOAP notes from physiotherapy consultation transcripts.
+    Uses the mistral-large-2 model by default, with JSON output mode for
+    structured extraction of SOAP notes from physiotherapy consultation
+    transcripts.
     """
 
-    def __init__(self) -> None:
-        """Initialize Mistral client with API key from settings."""
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient | None = None,
+        model: str = "mistral-large-2",
+    ) -> None:
+        """Initialize Mistral client with API key from settings.
+
+        Args:
+            http_client: Optional shared connection pool; the SDK creates
+                its own when omitted
+            model: Mistral model used for extraction
+        """
         settings = get_settings()
-        self.client = Mistral(api_key=settings.mistral_api_key)
-        self.model = "mistral-large-2"
+        if http_client is None:
+            self.client = Mistral(api_key=settings.mistral_api_key)
+        else:
+            self.client = Mistral(
+                api_key=settings.mistral_api_key, async_client=http_client
+            )
+        self.model = model
 
     async def extract_soap_note(
         self,
         transcript: str,
         template: str,
         language: str,
+        note_format: str = "paragraph",
+        verbosity: str = "medium",
     ) -> SOAPNoteOutput:
         """Extract a structured SOAP note via Mistral AI.
 
@@ -41,6 +60,8 @@ class MistralLLMClient(BaseLLMClient):
             transcript: Transcribed text from the consultation
             template: SOAP template defining expected structure
             language: Output language for the note (fr/de/en)
+            note_format: Note format preference (paragraph/bullets)
+            verbosity: Note verbosity level (concise/medium)
 
         Returns:
             SOAPNoteOutput with the 4 SOAP sections
@@ -49,25 +70,87 @@ class MistralLLMClient(BaseLLMClient):
             ValueError: If the response cannot be parsed as valid SOAP JSON
             Exception: If the Mistral API call fails
         """
-        system_prompt = build_soap_system_prompt(language)
-        user_prompt = build_soap_user_prompt(transcript, template, language)
-
         logger.info("Calling Mistral AI model=%s language=%s", self.model, language)
 
         response = await self.client.chat.complete_async(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=0.3,
-            max_tokens=2000,
-            response_format={"type": "json_object"},
+            **self._completion_request(
+                transcript, template, language, note_format, verbosity
+            )
         )
 
         content = response.choices[0].message.content
         return self._parse_soap_response(content)
 
+    async def stream_soap_note(
+        self,
+        transcript: str,
+        template: str,
+        language: str,
+        note_format: str = "paragraph",
+        verbosity: str = "medium",
+    ) -> AsyncIterator[str]:
+        """Stream the SOAP note JSON via Mistral's streaming chat API.
+
+        Args:
+            transcript: Transcribed text from the consultation
+            template: SOAP template defining expected structure
+            language: Output language for the note (fr/de/en)
+            note_format: Note format preference (paragraph/bullets)
+            verbosity: Note verbosity level (concise/medium)
+
+        Yields:
+            Successive pieces of the JSON object text
+
+        Raises:
+            Exception: If the Mistral API call fails
+        """
+        logger.info(
+            "Streaming from Mistral AI model=%s language=%s", self.model, language
+        )
+
+        stream = await self.client.chat.stream_async(
+            **self._completion_request(
+                transcript, template, language, note_format, verbosity
+            )
+        )
+        async with stream:
+            async for event in stream:
+                if not event.data.choices:
+                    continue
+                content = event.data.choices[0].delta.content
+                if isinstance(content, str) and content:
+                    yield content
+
+    def _completion_request(
+        self,
+        transcript: str,
+        template: str,
+        language: str,
+        note_format: str,
+        verbosity: str,
+    ) -> dict[str, Any]:
+        """Build the chat completion parameters shared by both call modes.
+
+        Args:
+            transcript: Transcribed text from the consultation
+            template: SOAP template defining expected structure
+            language: Output language for the note (fr/de/en)
+            note_format: Note format preference (paragraph/bullets)
+            verbosity: Note verbosity level (concise/medium)
+
+        Returns:
+            Keyword arguments for chat.complete_async / chat.stream_async
+        """
+        return {
+            "model": self.model,
+            "messages": build_soap_messages(
+                transcript, template, language, note_format, verbosity
+            ),
+            "temperature": 0.3,
+            "max_tokens": 2000,
+            "response_format": {"type": "json_object"},
+        }
+
     def _parse_soap_response(self, content: str) -> SOAPNoteOutput:
         """Parse the Mistral JSON response into SOAPNoteOutput.
 
@@ -80,20 +163,4 @@ class MistralLLMClient(BaseLLMClient):
         Raises:
             ValueError: If JSON parsing fails or required fields are missing
         """
-        try:
-            data = json.loads(content)
-        except json.JSONDecodeError as e:
-            logger.error("Failed to parse Mistral response as JSON: %s", e)
-            raise ValueError(f"Invalid JSON response from LLM: {e}") from e
-
-        errors = validate_soap_json_structure(data)
-        if errors:
-            logger.error("SOAP validation errors: %s", errors)
-            raise ValueError(f"Invalid SOAP response: {'; '.join(errors)}")
-
-        return SOAPNoteOutput(
-            subjective=data["subjective"],
-            objective=data["objective"],
-            assessment=data["assessment"],
-            plan=data["plan"],
-        )
+        return parse_soap_note_json(content)
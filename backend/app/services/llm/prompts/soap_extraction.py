@@ -2,11 +2,20 @@
 
 Contains system and user prompt builders for extracting structured
 SOAP notes from physiotherapy consultation transcripts.
+
+Everything except the transcript is compiled once per (language, format,
+verbosity, template) into the system message, which comes first so that
+consecutive requests share the longest possible prefix for provider-side
+prompt caching.
 """
 
+import json
 import logging
+from functools import lru_cache
 from pathlib import Path
 
+from app.services.llm.base import SOAPNoteOutput
+
 logger = logging.getLogger(__name__)
 
 # Language code to display name mapping
@@ -17,11 +26,37 @@ LANGUAGE_NAMES: dict[str, str] = {
     "es": "español",
 }
 
+# Writing style instructions per note format preference
+FORMAT_INSTRUCTIONS: dict[str, str] = {
+    "paragraph": "Rédige chaque section en paragraphes de phrases complètes",
+    "bullets": (
+        "Rédige chaque section sous forme de liste à puces "
+        '(un élément par ligne, commençant par "- ")'
+    ),
+}
+
+# Level of detail instructions per verbosity preference
+VERBOSITY_INSTRUCTIONS: dict[str, str] = {
+    "concise": (
+        "Sois concis: garde uniquement les éléments cliniquement pertinents, "
+        "sans répétition"
+    ),
+    "medium": (
+        "Niveau de détail standard: documente tous les éléments cliniques "
+        "mentionnés"
+    ),
+}
+
+# Distinct compiled prompts kept in memory
+COMPILED_PROMPT_CACHE_SIZE = 64
+
 # Path to the SOAP template file (relative to project root)
 TEMPLATE_RELATIVE_PATH = "docs/templates/physiotherapy-note-template.md"
 
 
-def build_soap_system_prompt(language: str) -> str:
+def build_soap_system_prompt(
+    language: str, note_format: str = "paragraph", verbosity: str = "medium"
+) -> str:
     """Build the system prompt for SOAP note extraction.
 
     The system prompt instructs the LLM to act as a medical documentation
@@ -29,11 +64,17 @@ def build_soap_system_prompt(language: str) -> str:
 
     Args:
         language: Output language code (fr/de/en)
+        note_format: Note format preference (paragraph/bullets)
+        verbosity: Note verbosity level (concise/medium)
 
     Returns:
         System prompt string with language-specific instructions
     """
     lang_name = LANGUAGE_NAMES.get(language, language)
+    format_rule = FORMAT_INSTRUCTIONS.get(note_format, FORMAT_INSTRUCTIONS["paragraph"])
+    verbosity_rule = VERBOSITY_INSTRUCTIONS.get(
+        verbosity, VERBOSITY_INSTRUCTIONS["medium"]
+    )
 
     return (
         "Tu es un assistant médical expert en documentation clinique "
@@ -45,7 +86,9 @@ def build_soap_system_prompt(language: str) -> str:
         f"4. Génère la note en {lang_name}\n"
         "5. Si une section manque d'informations, écris "
         '"Non documenté" ou "À compléter"\n'
-        "6. Utilise la terminologie médicale appropriée pour la langue de sortie\n\n"
+        "6. Utilise la terminologie médicale appropriée pour la langue de sortie\n"
+        f"7. {format_rule}\n"
+        f"8. {verbosity_rule}\n\n"
         "FORMAT DE SORTIE OBLIGATOIRE (JSON):\n"
         "{\n"
         '    "subjective": "...",\n'
@@ -56,28 +99,76 @@ def build_soap_system_prompt(language: str) -> str:
     )
 
 
-def build_soap_user_prompt(transcript: str, template: str, language: str) -> str:
-    """Build the user prompt with transcript and template.
+@lru_cache(maxsize=COMPILED_PROMPT_CACHE_SIZE)
+def compile_soap_prompt(
+    language: str, note_format: str, verbosity: str, template: str
+) -> str:
+    """Compile the static part of the prompt: instructions and template.
+
+    Cached, so the prompt is only built once per combination.
 
     Args:
-        transcript: Consultation transcript text
-        template: SOAP template structure content
         language: Output language code (fr/de/en)
+        note_format: Note format preference (paragraph/bullets)
+        verbosity: Note verbosity level (concise/medium)
+        template: SOAP template structure content
 
     Returns:
-        User prompt string combining template and transcript
+        System message content, identical for every transcript
     """
     lang_name = LANGUAGE_NAMES.get(language, language)
 
     return (
+        f"{build_soap_system_prompt(language, note_format, verbosity)}\n\n"
         f"Template SOAP:\n{template}\n\n"
-        f"Transcription de la consultation:\n{transcript}\n\n"
         f"Génère la note SOAP complète en {lang_name} en respectant "
-        "strictement le template. "
+        "strictement le template, à partir de la transcription fournie. "
         "Réponds UNIQUEMENT avec le JSON structuré."
     )
 
 
+def build_soap_user_prompt(transcript: str) -> str:
+    """Build the user prompt, which only carries the transcript.
+
+    Args:
+        transcript: Consultation transcript text
+
+    Returns:
+        User prompt string
+    """
+    return f"Transcription de la consultation:\n{transcript}"
+
+
+def build_soap_messages(
+    transcript: str,
+    template: str,
+    language: str,
+    note_format: str = "paragraph",
+    verbosity: str = "medium",
+) -> list[dict[str, str]]:
+    """Build the chat messages for SOAP note extraction.
+
+    The compiled static prompt comes first and the transcript last.
+
+    Args:
+        transcript: Consultation transcript text
+        template: SOAP template structure content
+        language: Output language code (fr/de/en)
+        note_format: Note format preference (paragraph/bullets)
+        verbosity: Note verbosity level (concise/medium)
+
+    Returns:
+        System and user messages
+    """
+    return [
+        {
+            "role": "system",
+            "content": compile_soap_prompt(language, note_format, verbosity, template),
+        },
+        {"role": "user", "content": build_soap_user_prompt(transcript)},
+    ]
+
+
 def load_soap_template(project_root: str | Path) -> str:
     """Load the SOAP template from the project's template file.
 
@@ -124,3 +215,37 @@ def validate_soap_json_structure(data: dict) -> list[str]:
             errors.append(f"Field '{field}' is empty")
 
     return errors
+
+
+def parse_soap_note_json(content: str) -> SOAPNoteOutput:
+    """Parse and validate an LLM JSON response into SOAPNoteOutput.
+
+    Args:
+        content: Raw JSON string from the LLM response
+
+    Returns:
+        SOAPNoteOutput with parsed sections
+
+    Raises:
+        ValueError: If JSON parsing fails or required fields are missing
+    """
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError as e:
+        logger.error("Failed to parse LLM response as JSON: %s", e)
+        raise ValueError(f"Invalid JSON response from LLM: {e}") from e
+
+    if not isinstance(data, dict):
+        raise ValueError("Invalid SOAP response: expected a JSON object")
+
+    errors = validate_soap_json_structure(data)
+    if errors:
+        logger.error("SOAP validation errors: %s", errors)
+        raise ValueError(f"Invalid SOAP response: {'; '.join(errors)}")
+
+    return SOAPNoteOutput(
+        subjective=data["subjective"],
+        objective=data["objective"],
+        assessment=data["assessment"],
+        plan=data["plan"],
+    )
@@ -0,0 +1,193 @@
+"""In-memory registry of SOAP note templates.
+
+Templates are read from disk once and served from memory. Their
+modification times are re-checked at most every few seconds, so edits
+are picked up without a restart while notes are generated without disk
+I/O in between.
+"""
+
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+# Project root (the directory containing docs/)
+PROJECT_ROOT = Path(__file__).parents[5]
+
+# Directory holding the templates, relative to the project root
+TEMPLATES_RELATIVE_DIR = "docs/templates"
+
+# Template files are named "<name>-note-template.md"
+TEMPLATE_SUFFIX = "-note-template.md"
+
+# Template used when no name is given
+DEFAULT_TEMPLATE = "physiotherapy"
+
+# Minimum delay between two modification time checks
+RELOAD_CHECK_INTERVAL_SECONDS = 5.0
+
+
+class _Template(NamedTuple):
+    """A template loaded in memory."""
+
+    path: Path
+    content: str
+    mtime_ns: int
+
+
+class TemplateRegistry:
+    """
+    Named SOAP templates kept in memory with file-change invalidation.
+
+    Templates found in the templates directory are registered under the
+    file name without its "-note-template.md" suffix (e.g. "physiotherapy");
+    other files (per specialty or per user) can be added with register().
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        check_interval_seconds: float = RELOAD_CHECK_INTERVAL_SECONDS,
+    ) -> None:
+        """
+        Initialize the registry.
+
+        Args:
+            directory: Directory scanned for "*-note-template.md" files
+            check_interval_seconds: Minimum delay between modification time checks
+        """
+        self._directory = directory
+        self._check_interval = check_interval_seconds
+        self._templates: dict[str, _Template] = {}
+        self._loaded = False
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        """Load every template found in the templates directory (application startup)."""
+        with self._lock:
+            self._loaded = True
+            self._last_check = time.monotonic()
+            if not self._directory.is_dir():
+                logger.error("SOAP templates directory not found: %s", self._directory)
+                return
+            for path in sorted(self._directory.glob(f"*{TEMPLATE_SUFFIX}")):
+                self._templates[path.name.removesuffix(TEMPLATE_SUFFIX)] = _read(path)
+        logger.info("Loaded SOAP templates: %s", ", ".join(self.names()) or "none")
+
+    def register(self, name: str, path: str | Path) -> None:
+        """
+        Load a template file under the given name.
+
+        Args:
+            name: Template name, e.g. a specialty or a user-specific key
+            path: Path of the Markdown template file
+
+        Raises:
+            FileNotFoundError: If the template file does not exist
+        """
+        template = _read(Path(path))
+        with self._lock:
+            self._templates[name] = template
+
+    def names(self) -> list[str]:
+        """
+        List the registered template names.
+
+        Returns:
+            Sorted template names
+        """
+        return sorted(self._templates)
+
+    def get(self, name: str = DEFAULT_TEMPLATE) -> str:
+        """
+        Get a template's content.
+
+        Args:
+            name: Template name (default: the physiotherapy template)
+
+        Returns:
+            Template content, reloaded first if the file changed since the
+            last check
+
+        Raises:
+            FileNotFoundError: If no template is registered under this name
+        """
+        if not self._loaded:
+            self.load()
+        if time.monotonic() - self._last_check >= self._check_interval:
+            self._refresh()
+
+        template = self._templates.get(name)
+        if template is None:
+            raise FileNotFoundError(f"SOAP template not found: {name}")
+        return template.content
+
+    def _refresh(self) -> None:
+        """Reload the templates whose file modification time changed."""
+        with self._lock:
+            self._last_check = time.monotonic()
+            for name, template in list(self._templates.items()):
+                try:
+                    mtime_ns = template.path.stat().st_mtime_ns
+                    if mtime_ns != template.mtime_ns:
+                        self._templates[name] = _read(template.path)
+                except OSError as e:
+                    # Keep serving the last good version
+                    logger.warning("Cannot reload SOAP template %s: %s", name, e)
+
+
+def _read(path: Path) -> _Template:
+    """
+    Read a template file.
+
+    Args:
+        path: Template file path
+
+    Returns:
+        The loaded template
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    if not path.is_file():
+        raise FileNotFoundError(f"SOAP template not found at: {path}")
+    mtime_ns = path.stat().st_mtime_ns
+    content = path.read_text(encoding="utf-8")
+    logger.info("Loaded SOAP template from %s (%d chars)", path, len(content))
+    return _Template(path=path, content=content, mtime_ns=mtime_ns)
+
+
+_registry: TemplateRegistry | None = None
+
+
+def get_template_registry() -> TemplateRegistry:
+    """
+    Get or create the process-wide template registry.
+
+    Returns:
+        TemplateRegistry over the project's templates directory
+    """
+    global _registry
+    if _registry is None:
+        _registry = TemplateRegistry(PROJECT_ROOT / TEMPLATES_RELATIVE_DIR)
+    return _registry
+
+
+def get_soap_template(name: str = DEFAULT_TEMPLATE) -> str:
+    """
+    Get a SOAP template from the process-wide registry.
+
+    Args:
+        name: Template name (default: the physiotherapy template)
+
+    Returns:
+        Template content
+
+    Raises:
+        FileNotFoundError: If no template is registered under this name
+    """
+    return get_template_registry().get(name)
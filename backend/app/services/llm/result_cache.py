@@ -0,0 +1,127 @@
+"""Content-addressed cache of LLM SOAP extraction results.
+
+A regenerated note (e.g. a client retry after a network error) has the
+same transcript, template, language, preferences and model as the first
+generation, so its result is served from memory instead of calling the
+LLM again.
+
+Entries are health data: keys are SHA-256 digests (no transcript in
+memory) and values are Fernet-encrypted.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any
+
+from cryptography.fernet import Fernet, InvalidToken
+
+from app.config import get_settings
+from app.core.cache import TTLCache
+from app.services.llm.base import SOAPNoteOutput
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+class LLMResultCache:
+    """
+    Encrypted in-process cache of SOAP notes keyed by extraction inputs.
+
+    Args:
+        max_size: Maximum number of cached notes
+        ttl_seconds: Time-to-live of a cached note in seconds
+        encryption_key: Fernet key; a random per-process key is generated
+            when empty, which is enough since entries never leave the process
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, encryption_key: str = "") -> None:
+        self._entries: TTLCache[str, bytes] = TTLCache(
+            max_size=max_size, ttl_seconds=ttl_seconds
+        )
+        self._fernet = Fernet(encryption_key or Fernet.generate_key())
+
+    @staticmethod
+    def make_key(
+        transcript: str,
+        template: str,
+        language: str,
+        note_format: str,
+        verbosity: str,
+        model: str,
+    ) -> str:
+        """
+        Build the content address of an extraction.
+
+        Args:
+            transcript: Consultation transcript text
+            template: SOAP template content (its digest acts as the version)
+            language: Output language code (fr/de/en)
+            note_format: Note format preference (paragraph/bullets)
+            verbosity: Note verbosity level (concise/medium)
+            model: Provider and model producing the note
+
+        Returns:
+            Hex SHA-256 digest of the inputs
+        """
+        inputs = [
+            hashlib.sha256(transcript.encode()).hexdigest(),
+            hashlib.sha256(template.encode()).hexdigest(),
+            language,
+            note_format,
+            verbosity,
+            model,
+        ]
+        return hashlib.sha256(json.dumps(inputs).encode()).hexdigest()
+
+    def get(self, key: str) -> SOAPNoteOutput | None:
+        """
+        Get a cached note.
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            The cached SOAP note, or None if absent, expired or unreadable
+        """
+        token = self._entries.get(key)
+        if token is None:
+            return None
+        try:
+            return SOAPNoteOutput.model_validate_json(self._fernet.decrypt(token))
+        except InvalidToken:
+            logger.warning("Dropping undecryptable LLM result cache entry")
+            self._entries.pop(key)
+            return None
+
+    def set(self, key: str, note: SOAPNoteOutput) -> None:
+        """
+        Cache a note.
+
+        Args:
+            key: Key from make_key
+            note: SOAP note produced by the LLM
+        """
+        self._entries.set(key, self._fernet.encrypt(note.model_dump_json().encode()))
+
+    def clear(self) -> None:
+        """Remove all entries and reset counters."""
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get counters for monitoring.
+
+        Returns:
+            Dictionary with size, max size, hits, misses, evictions and hit ratio
+        """
+        return self._entries.stats()
+
+
+# Process-wide result cache
+llm_result_cache = LLMResultCache(
+    max_size=settings.llm_result_cache_max_size,
+    ttl_seconds=settings.llm_result_cache_ttl_seconds,
+    encryption_key=settings.llm_result_cache_encryption_key,
+)
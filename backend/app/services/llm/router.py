@@ -0,0 +1,303 @@
+"""Hedged and failover SOAP extraction across several LLM clients.
+
+The router is itself a BaseLLMClient wrapping an ordered list of clients
+(e.g. mistral-large-2, then a faster fallback model). A request goes to
+the preferred client; if it has not answered after the p95 latency
+observed for that client, the same request is also sent to the next one
+(hedging) and the first valid answer wins, the other being cancelled.
+Failures fail over to the next client immediately.
+"""
+
+import asyncio
+import logging
+import statistics
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from typing import NamedTuple
+
+from app.services.llm.base import BaseLLMClient, SOAPNoteOutput
+
+logger = logging.getLogger(__name__)
+
+# Number of recent calls kept per client
+STATS_WINDOW = 100
+
+# Latency samples needed before the observed percentile is trusted
+MIN_LATENCY_SAMPLES = 10
+
+# Recent error ratio above which a client is tried after the healthy ones
+UNHEALTHY_ERROR_RATIO = 0.5
+
+# Median latency above which a client is tried after the fast ones (NFR11)
+SLOW_MEDIAN_SECONDS = 25.0
+
+
+class LatencyStats:
+    """Rolling latency and error statistics of one client."""
+
+    def __init__(self, window: int = STATS_WINDOW) -> None:
+        """
+        Initialize empty statistics.
+
+        Args:
+            window: Number of recent calls kept
+        """
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._outcomes: deque[bool] = deque(maxlen=window)
+
+    def record_success(self, latency_seconds: float) -> None:
+        """Record a successful call and its latency."""
+        self._latencies.append(latency_seconds)
+        self._outcomes.append(True)
+
+    def record_error(self) -> None:
+        """Record a failed call."""
+        self._outcomes.append(False)
+
+    @property
+    def error_ratio(self) -> float:
+        """Share of failed calls in the window."""
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def percentile(self, p: float) -> float | None:
+        """
+        Get a latency percentile.
+
+        Args:
+            p: Percentile between 0 and 1
+
+        Returns:
+            Latency in seconds, or None without enough samples
+        """
+        if len(self._latencies) < MIN_LATENCY_SAMPLES:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    def snapshot(self) -> dict[str, float | int | None]:
+        """
+        Get the statistics for monitoring.
+
+        Returns:
+            Dictionary with call count, error ratio and median latency
+        """
+        return {
+            "calls": len(self._outcomes),
+            "errorRatio": round(self.error_ratio, 4),
+            "medianSeconds": (
+                round(statistics.median(self._latencies), 3) if self._latencies else None
+            ),
+        }
+
+
+class RoutedClient(NamedTuple):
+    """A client registered in the router."""
+
+    name: str
+    client: BaseLLMClient
+    stats: LatencyStats
+
+
+class LLMRouter(BaseLLMClient):
+    """
+    BaseLLMClient sending each extraction to the best of several clients.
+
+    Clients are tried in configured order, except that unhealthy (mostly
+    failing) or slow ones are moved after the others.
+
+    Args:
+        clients: (name, client) pairs in order of preference
+        hedge_percentile: Latency percentile of the current client after
+            which the request is also sent to the next one
+        min_hedge_delay_seconds: Hedge delay used until enough latencies are
+            known, and lower bound of the observed percentile
+    """
+
+    def __init__(
+        self,
+        clients: list[tuple[str, BaseLLMClient]],
+        hedge_percentile: float = 0.95,
+        min_hedge_delay_seconds: float = 10.0,
+    ) -> None:
+        if not clients:
+            raise ValueError("LLMRouter needs at least one client")
+        self._clients = [RoutedClient(name, client, LatencyStats()) for name, client in clients]
+        self._hedge_percentile = hedge_percentile
+        self._min_hedge_delay = min_hedge_delay_seconds
+        self.model = "+".join(name for name, _ in clients)
+
+    def ranked(self) -> list[RoutedClient]:
+        """
+        Order the clients for the next request.
+
+        Returns:
+            Healthy clients first, in configured order
+        """
+
+        def demoted(routed: RoutedClient) -> bool:
+            median = routed.stats.percentile(0.5)
+            return routed.stats.error_ratio >= UNHEALTHY_ERROR_RATIO or (
+                median is not None and median > SLOW_MEDIAN_SECONDS
+            )
+
+        return sorted(self._clients, key=demoted)
+
+    def stats(self) -> dict[str, dict[str, float | int | None]]:
+        """
+        Get per-client statistics for monitoring.
+
+        Returns:
+            Statistics keyed by client name
+        """
+        return {routed.name: routed.stats.snapshot() for routed in self._clients}
+
+    def _hedge_delay(self, routed: RoutedClient) -> float:
+        """Seconds to wait on a client before hedging to the next one."""
+        observed = routed.stats.percentile(self._hedge_percentile)
+        return max(observed or 0.0, self._min_hedge_delay)
+
+    async def _call(
+        self,
+        routed: RoutedClient,
+        transcript: str,
+        template: str,
+        language: str,
+        note_format: str,
+        verbosity: str,
+    ) -> SOAPNoteOutput:
+        """Call one client, recording its latency or failure."""
+        start = time.perf_counter()
+        try:
+            result = await routed.client.extract_soap_note(
+                transcript, template, language, note_format, verbosity
+            )
+        except Exception:
+            routed.stats.record_error()
+            raise
+        routed.stats.record_success(time.perf_counter() - start)
+        return result
+
+    async def extract_soap_note(
+        self,
+        transcript: str,
+        template: str,
+        language: str,
+        note_format: str = "paragraph",
+        verbosity: str = "medium",
+    ) -> SOAPNoteOutput:
+        """Extract a SOAP note with hedging and failover.
+
+        Args:
+            transcript: Transcribed text from the consultation
+            template: SOAP template defining expected structure
+            language: Output language for the note (fr/de/en)
+            note_format: Note format preference (paragraph/bullets)
+            verbosity: Note verbosity level (concise/medium)
+
+        Returns:
+            SOAPNoteOutput from the first client to answer successfully
+
+        Raises:
+            Exception: The last client error if every client failed
+        """
+        waiting = deque(self.ranked())
+        running: dict[asyncio.Task[SOAPNoteOutput], RoutedClient] = {}
+        last_error: Exception | None = None
+
+        def launch() -> None:
+            routed = waiting.popleft()
+            task = asyncio.create_task(
+                self._call(routed, transcript, template, language, note_format, verbosity)
+            )
+            running[task] = routed
+
+        launch()
+        try:
+            while running:
+                newest = list(running.values())[-1]
+                timeout = self._hedge_delay(newest) if waiting else None
+                done, _ = await asyncio.wait(
+                    running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    logger.info(
+                        "LLM %s slower than %.1fs, hedging to %s",
+                        newest.name,
+                        timeout,
+                        waiting[0].name,
+                    )
+                    launch()
+                    continue
+                for task in done:
+                    routed = running.pop(task)
+                    if task.cancelled():
+                        logger.warning("LLM %s call was cancelled", routed.name)
+                        continue
+                    error = task.exception()
+                    if error is None:
+                        if routed is not self._clients[0]:
+                            logger.info("SOAP note served by fallback LLM %s", routed.name)
+                        return task.result()
+                    if not isinstance(error, Exception):
+                        raise error
+                    last_error = error
+                    logger.warning("LLM %s failed: %s", routed.name, last_error)
+                if not running and waiting:
+                    launch()
+        finally:
+            # Cancel the losers
+            for task in running:
+                task.cancel()
+
+        raise last_error or RuntimeError("No LLM client available")
+
+    async def stream_soap_note(
+        self,
+        transcript: str,
+        template: str,
+        language: str,
+        note_format: str = "paragraph",
+        verbosity: str = "medium",
+    ) -> AsyncIterator[str]:
+        """Stream the SOAP note JSON, failing over until output has started.
+
+        Streams are not hedged: once a client has produced text it is kept,
+        since the caller may already have forwarded it.
+
+        Args:
+            transcript: Transcribed text from the consultation
+            template: SOAP template defining expected structure
+            language: Output language for the note (fr/de/en)
+            note_format: Note format preference (paragraph/bullets)
+            verbosity: Note verbosity level (concise/medium)
+
+        Yields:
+            Successive pieces of the JSON object text
+
+        Raises:
+            Exception: The last client error if every client failed
+        """
+        last_error: Exception | None = None
+        for routed in self.ranked():
+            start = time.perf_counter()
+            started = False
+            try:
+                async for delta in routed.client.stream_soap_note(
+                    transcript, template, language, note_format, verbosity
+                ):
+                    started = True
+                    yield delta
+            except Exception as e:
+                routed.stats.record_error()
+                if started:
+                    raise
+                last_error = e
+                logger.warning("LLM %s stream failed: %s", routed.name, e)
+                continue
+            routed.stats.record_success(time.perf_counter() - start)
+            return
+
+        raise last_error or RuntimeError("No LLM client available")
@@ -0,0 +1,107 @@
+"""Incremental parsing of SOAP notes streamed as JSON by an LLM."""
+
+import json
+
+
+class SOAPStreamParser:
+    """Incremental parser emitting top-level string fields of a streamed JSON object.
+
+    The LLM streams a single JSON object such as
+    {"subjective": "...", "objective": "...", ...}. Text deltas are fed as
+    they arrive and each top-level string field is returned as soon as its
+    closing quote is received, so a section can be shown before the rest of
+    the note is generated. Non-string values are skipped; the full text is
+    kept so the complete object can still be parsed and validated at the end.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[str] = []
+        self._state = "start"
+        self._key = ""
+        self._raw: list[str] = []
+        self._escape = False
+        # Nesting depth and string flag while skipping non-string values
+        self._depth = 0
+        self._in_string = False
+
+    @property
+    def text(self) -> str:
+        """All text fed so far."""
+        return "".join(self._chunks)
+
+    def feed(self, delta: str) -> list[tuple[str, str]]:
+        """Consume a text delta.
+
+        Args:
+            delta: Next piece of the streamed JSON text
+
+        Returns:
+            (field name, decoded value) for each string field completed by this delta
+        """
+        self._chunks.append(delta)
+        completed: list[tuple[str, str]] = []
+
+        for ch in delta:
+            state = self._state
+            if state == "start":
+                if ch == "{":
+                    self._state = "key"
+            elif state == "key":
+                if ch == '"':
+                    self._raw = []
+                    self._state = "key_string"
+                elif ch == "}":
+                    self._state = "done"
+            elif state in ("key_string", "value_string"):
+                if self._escape:
+                    self._escape = False
+                    self._raw.append(ch)
+                elif ch == "\\":
+                    self._escape = True
+                    self._raw.append(ch)
+                elif ch == '"':
+                    decoded = json.loads('"' + "".join(self._raw) + '"')
+                    if state == "key_string":
+                        self._key = decoded
+                        self._state = "colon"
+                    else:
+                        completed.append((self._key, decoded))
+                        self._state = "key"
+                else:
+                    self._raw.append(ch)
+            elif state == "colon":
+                if ch == ":":
+                    self._state = "value"
+            elif state == "value":
+                if ch == '"':
+                    self._raw = []
+                    self._state = "value_string"
+                elif not ch.isspace():
+                    self._depth = 1 if ch in "{[" else 0
+                    self._in_string = False
+                    self._state = "skip"
+            elif state == "skip":
+                self._skip(ch)
+
+        return completed
+
+    def _skip(self, ch: str) -> None:
+        """Advance through a non-string value until the next top-level key."""
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif ch == "\\":
+                self._escape = True
+            elif ch == '"':
+                self._in_string = False
+        elif ch == '"':
+            self._in_string = True
+        elif ch in "{[":
+            self._depth += 1
+        elif ch in "}]":
+            if self._depth == 0:
+                self._state = "done"
+            else:
+                self._depth -= 1
+        elif ch == "," and self._depth == 0:
+            self._state = "key"
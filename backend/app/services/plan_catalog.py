@@ -0,0 +1,226 @@
+"""In-memory catalog of subscription plans.
+
+Plans change a few times a year but are read by every visit of the
+public pricing page, so they are loaded once into an immutable snapshot
+(with the JSON bodies and strong ETags of the API responses) and served
+from memory. The snapshot is reloaded when its TTL has elapsed or after
+a Plan row is written through the ORM in this process; with several
+workers, the TTL bounds how stale another worker can be.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import TypeGuard
+from uuid import UUID
+
+from pydantic import TypeAdapter
+from sqlalchemy import Connection, event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Mapper, Session, object_session
+
+from app.config import get_settings
+from app.core.database import async_session_maker
+from app.models.plan import Plan
+from app.schemas.plan import PlanResponse
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+_plan_list = TypeAdapter(list[PlanResponse])
+
+
+def compute_etag(body: bytes) -> str:
+    """
+    Compute a strong ETag for a response body.
+
+    Args:
+        body: Serialized response
+
+    Returns:
+        Quoted entity tag
+    """
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    """
+    A serialized API response and its ETag.
+
+    Attributes:
+        body: JSON body
+        etag: Strong entity tag of the body
+    """
+
+    body: bytes
+    etag: str
+
+    @classmethod
+    def of(cls, body: bytes) -> "CachedBody":
+        """Wrap a body with its ETag."""
+        return cls(body=body, etag=compute_etag(body))
+
+
+@dataclass(frozen=True)
+class PlanCatalogSnapshot:
+    """
+    Immutable view of every plan at load time.
+
+    Attributes:
+        plans: All plans (active or not) by id, e.g. for subscribers of a
+            plan no longer sold
+        active: Active plans, cheapest first
+        active_list: Response of GET /plans
+        active_bodies: Responses of GET /plans/{id}, active plans only
+        loaded_at: time.monotonic() of the load
+    """
+
+    plans: dict[UUID, PlanResponse]
+    active: tuple[PlanResponse, ...]
+    active_list: CachedBody
+    active_bodies: dict[UUID, CachedBody] = field(default_factory=dict)
+    loaded_at: float = 0.0
+
+    @classmethod
+    def build(cls, plans: list[PlanResponse]) -> "PlanCatalogSnapshot":
+        """
+        Build a snapshot and serialize its responses.
+
+        Args:
+            plans: Every plan, ordered by price ascending
+        """
+        active = tuple(plan for plan in plans if plan.is_active)
+        return cls(
+            plans={plan.id: plan for plan in plans},
+            active=active,
+            active_list=CachedBody.of(_plan_list.dump_json(list(active), by_alias=True)),
+            active_bodies={
+                plan.id: CachedBody.of(plan.model_dump_json(by_alias=True).encode())
+                for plan in active
+            },
+            loaded_at=time.monotonic(),
+        )
+
+
+class PlanCatalog:
+    """
+    Plans served from memory, reloaded on TTL or on change.
+
+    Args:
+        ttl_seconds: Time after which the snapshot is reloaded
+        session_factory: Factory for the sessions loading the plans
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        session_factory: async_sessionmaker[AsyncSession] = async_session_maker,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.session_factory = session_factory
+        self._snapshot: PlanCatalogSnapshot | None = None
+        self._lock = asyncio.Lock()
+        self.loads = 0
+
+    def _is_fresh(
+        self, snapshot: PlanCatalogSnapshot | None
+    ) -> TypeGuard[PlanCatalogSnapshot]:
+        """Check whether a snapshot can be served."""
+        return (
+            snapshot is not None
+            and time.monotonic() - snapshot.loaded_at < self.ttl_seconds
+        )
+
+    async def load(self) -> PlanCatalogSnapshot:
+        """
+        Load every plan from the database, replacing the snapshot.
+
+        Returns:
+            The new snapshot
+        """
+        async with self.session_factory() as db:
+            result = await db.execute(select(Plan).order_by(Plan.price_monthly.asc()))
+            plans = [PlanResponse.model_validate(plan) for plan in result.scalars()]
+        snapshot = PlanCatalogSnapshot.build(plans)
+        self._snapshot = snapshot
+        self.loads += 1
+        logger.info(
+            "Loaded plan catalog: %d plans (%d active)", len(plans), len(snapshot.active)
+        )
+        return snapshot
+
+    async def warm_up(self) -> None:
+        """
+        Load the snapshot ahead of the first request, best-effort.
+
+        A failure (e.g. database unreachable at startup) is logged, never
+        raised: snapshot() loads the catalog on demand instead.
+        """
+        try:
+            await self.load()
+        except Exception as e:
+            logger.warning("Could not warm up the plan catalog: %s", e)
+
+    async def snapshot(self) -> PlanCatalogSnapshot:
+        """
+        Get the current snapshot, loading it first if missing or expired.
+
+        Concurrent callers wait for a single load.
+
+        Returns:
+            The plan catalog snapshot
+        """
+        snapshot = self._snapshot
+        if self._is_fresh(snapshot):
+            return snapshot
+        async with self._lock:
+            snapshot = self._snapshot
+            if self._is_fresh(snapshot):
+                return snapshot
+            return await self.load()
+
+    async def get_plan(self, plan_id: UUID) -> PlanResponse | None:
+        """
+        Get a plan, active or not.
+
+        Args:
+            plan_id: Plan's UUID
+
+        Returns:
+            The plan, or None if it does not exist
+        """
+        return (await self.snapshot()).plans.get(plan_id)
+
+    def invalidate(self) -> None:
+        """Drop the snapshot so the next read reloads it."""
+        self._snapshot = None
+
+    def clear(self) -> None:
+        """Drop the snapshot and reset the load counter (tests)."""
+        self._snapshot = None
+        self.loads = 0
+
+
+# Process-wide catalog - warmed up by the application lifespan
+plan_catalog = PlanCatalog(ttl_seconds=settings.plan_catalog_ttl_seconds)
+
+
+@event.listens_for(Plan, "after_insert")
+@event.listens_for(Plan, "after_update")
+@event.listens_for(Plan, "after_delete")
+def _plan_written(mapper: Mapper[Plan], connection: Connection, target: Plan) -> None:
+    """Note a plan write, the catalog is reloaded once it is committed."""
+    session = object_session(target)
+    if session is not None:
+        session.info["plans_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    """Reload the catalog after a transaction writing plans in this process."""
+    if session.info.pop("plans_changed", False):
+        plan_catalog.invalidate()
@@ -0,0 +1,197 @@
+"""Recording service for transcription lifecycle persistence.
+
+Quota follows a reserve/commit/release cycle: start_recording reserves
+one unit together with the recording, complete_recording keeps it and
+fail_recording gives it back, each in a single transaction. Recordings
+left in TRANSCRIBING by a path that never reached either (crashed or
+killed worker) are failed by fail_stale_recordings.
+"""
+
+from collections import Counter
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Update, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.recording import Recording
+from app.schemas.recording import RecordingStatus
+from app.services import subscription as subscription_service
+from app.services.deepgram import TranscriptionResult
+
+
+async def get_user_recording(
+    db: AsyncSession, user_id: UUID, recording_id: UUID
+) -> Recording | None:
+    """
+    Get a recording owned by a user.
+
+    Args:
+        db: Database session
+        user_id: Owner's UUID
+        recording_id: Recording's UUID
+
+    Returns:
+        Recording if found and owned by the user, None otherwise
+    """
+    result = await db.execute(
+        select(Recording).where(
+            Recording.id == recording_id,
+            Recording.user_id == user_id,
+        )
+    )
+    return result.scalar_one_or_none()
+
+
+async def start_recording(
+    db: AsyncSession,
+    user_id: UUID,
+    duration_seconds: int,
+    language_detected: str | None = None,
+) -> Recording:
+    """
+    Create a recording in TRANSCRIBING status, before transcription starts.
+
+    One unit of the owner's quota is reserved in the same transaction.
+
+    Args:
+        db: Database session
+        user_id: Owner's UUID
+        duration_seconds: Duration of the recording in seconds
+        language_detected: Optional client-side detected language
+
+    Returns:
+        The created Recording
+
+    Raises:
+        QuotaExhaustedError: If no quota unit could be reserved (e.g.
+            taken by a concurrent upload since it was checked)
+    """
+    reservation = await subscription_service.reserve_quota(db, user_id)
+    if reservation is None:
+        await db.rollback()
+        raise subscription_service.QuotaExhaustedError(
+            f"No quota left for user {user_id}"
+        )
+
+    recording = Recording(
+        user_id=user_id,
+        duration_seconds=duration_seconds,
+        language_detected=language_detected,
+        status=RecordingStatus.TRANSCRIBING.value,
+    )
+    db.add(recording)
+    await db.commit()
+    await db.refresh(recording)
+    return recording
+
+
+async def complete_recording(
+    db: AsyncSession,
+    recording: Recording,
+    result: TranscriptionResult,
+    duration_seconds: int | None = None,
+) -> Recording:
+    """
+    Store a successful transcription, keeping its reserved quota unit.
+
+    The transition is a conditional UPDATE: a recording that is no longer
+    transcribing (e.g. failed by the stale recording sweep, which gave
+    its unit back) is left as it is, and the returned Recording shows
+    its actual state.
+
+    Args:
+        db: Database session
+        recording: Recording being transcribed
+        result: Transcription result from Deepgram
+        duration_seconds: Final duration, when only known after recording
+            (live transcription)
+
+    Returns:
+        The updated Recording
+    """
+    values: dict[str, Any] = {
+        "transcript_text": result.transcript,
+        "language_detected": result.language_detected or recording.language_detected,
+        "status": RecordingStatus.COMPLETED.value,
+    }
+    if duration_seconds is not None:
+        values["duration_seconds"] = duration_seconds
+    await db.execute(
+        _while_transcribing(recording.id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    await db.refresh(recording)
+    return recording
+
+
+async def fail_recording(db: AsyncSession, recording: Recording) -> Recording:
+    """
+    Mark a recording as failed and release its reserved quota unit.
+
+    The transition is a conditional UPDATE and the unit is only released
+    when it changed the row, so the request path, an interrupted job and
+    the stale recording sweep can all call it, even concurrently or with
+    a stale instance, without releasing a unit twice or failing a
+    completed recording.
+
+    Args:
+        db: Database session
+        recording: Recording whose transcription failed
+
+    Returns:
+        The updated Recording
+    """
+    result = await db.execute(
+        _while_transcribing(recording.id)
+        .values(status=RecordingStatus.FAILED.value)
+        .returning(Recording.id)
+        .execution_options(synchronize_session=False)
+    )
+    if result.scalar_one_or_none() is not None:
+        await subscription_service.release_quota(db, recording.user_id)
+    await db.commit()
+    await db.refresh(recording)
+    return recording
+
+
+def _while_transcribing(recording_id: UUID) -> Update:
+    """UPDATE of a recording that only matches while it is transcribing."""
+    return update(Recording).where(
+        Recording.id == recording_id,
+        Recording.status == RecordingStatus.TRANSCRIBING.value,
+    )
+
+
+async def fail_stale_recordings(db: AsyncSession, older_than: datetime) -> int:
+    """
+    Fail every recording still transcribing since before a cutoff.
+
+    Marks them FAILED in one UPDATE and releases their quota units with
+    one UPDATE per owner, in a single transaction.
+
+    Args:
+        db: Database session
+        older_than: Recordings created before this time are failed
+
+    Returns:
+        Number of recordings failed
+    """
+    result = await db.execute(
+        update(Recording)
+        .where(
+            Recording.status == RecordingStatus.TRANSCRIBING.value,
+            Recording.created_at < older_than,
+        )
+        .values(status=RecordingStatus.FAILED.value)
+        .returning(Recording.user_id)
+        .execution_options(synchronize_session=False)
+    )
+    units_by_user = Counter(result.scalars().all())
+    for user_id, units in units_by_user.items():
+        await subscription_service.release_quota(db, user_id, units=units)
+    await db.commit()
+    return sum(units_by_user.values())
@@ -4,24 +4,53 @@ Orchestrates the process of extracting a structured SOAP note from a
 consultation transcript, including LLM interaction, timing, and persistence.
 """
 
+import asyncio
 import logging
 import time
 import uuid
-from pathlib import Path
+from collections.abc import Awaitable, Callable
 
 import sentry_sdk
 from sqlalchemy.ext.asyncio import AsyncSession
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import (
+    retry,
+    retry_if_not_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+)
 
+from app.config import get_settings
+from app.core.circuit_breaker import CircuitOpenError, circuit_breaker
+from app.core.database import release_connection
+from app.core.deadline import (
+    Deadline,
+    DeadlineExceededError,
+    record_deadline_exceeded,
+    stop_at_deadline,
+    wait_within_deadline,
+)
 from app.models.note import Note
 from app.services.llm.base import BaseLLMClient, SOAPNoteOutput
 from app.services.llm.factory import get_llm_client
-from app.services.llm.prompts.soap_extraction import load_soap_template
+from app.services.llm.map_reduce import (
+    estimate_tokens,
+    merge_soap_notes,
+    split_transcript,
+)
+from app.services.llm.prompts.soap_extraction import parse_soap_note_json
+from app.services.llm.prompts.templates import DEFAULT_TEMPLATE, get_soap_template
+from app.services.llm.result_cache import llm_result_cache
+from app.services.llm.streaming import SOAPStreamParser
 
 logger = logging.getLogger(__name__)
 
-# Project root for template loading
-PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+# Top-level fields of the LLM JSON output, in the order they are generated
+SOAP_SECTIONS = ("subjective", "objective", "assessment", "plan")
+
+SectionCallback = Callable[[str, str], Awaitable[None]]
+
+# Remaining time below which an LLM attempt is not started (seconds)
+MIN_ATTEMPT_SECONDS = 5.0
 
 
 class SOAPExtractionError(Exception):
@@ -30,66 +59,228 @@ class SOAPExtractionError(Exception):
     pass
 
 
+# Fails fast while the LLM provider is down or too slow. Unparseable
+# notes (ValueError) are a model output problem, not an outage.
+_breaker = circuit_breaker(
+    "llm",
+    failure_threshold=get_settings().circuit_breaker_failure_threshold,
+    reset_timeout_seconds=get_settings().circuit_breaker_reset_seconds,
+    slow_call_seconds=get_settings().llm_slow_call_seconds,
+    is_failure=lambda exc: not isinstance(exc, ValueError),
+)
+
+
+def _result_cache_key(
+    client: BaseLLMClient,
+    transcript: str,
+    template: str,
+    language: str,
+    note_format: str,
+    verbosity: str,
+) -> str:
+    """Build the LLM result cache key of an extraction.
+
+    Args:
+        client: LLM client that would produce the note
+        transcript: Consultation transcript text
+        template: SOAP template content
+        language: Output language code (fr/de/en)
+        note_format: Note format preference (paragraph/bullets)
+        verbosity: Note verbosity level (concise/medium)
+
+    Returns:
+        Content-addressed cache key
+    """
+    model = f"{type(client).__name__}:{client.model}"
+    return llm_result_cache.make_key(
+        transcript, template, language, note_format, verbosity, model
+    )
+
+
 @retry(
-    stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=1, min=2, max=10),
+    stop=stop_after_attempt(3) | stop_at_deadline(MIN_ATTEMPT_SECONDS),
+    wait=wait_within_deadline(
+        wait_exponential(multiplier=1, min=2, max=10), MIN_ATTEMPT_SECONDS
+    ),
+    retry=retry_if_not_exception_type((CircuitOpenError, DeadlineExceededError)),
     reraise=True,
 )
 async def _extract_with_retry(
-    client: "BaseLLMClient", transcript: str, template: str, language: str
+    client: "BaseLLMClient",
+    transcript: str,
+    template: str,
+    language: str,
+    note_format: str = "paragraph",
+    verbosity: str = "medium",
+    deadline: Deadline | None = None,
 ) -> SOAPNoteOutput:
     """Extract SOAP note with automatic retry on failure.
 
+    With a deadline, each attempt is cut off when the deadline passes and
+    no retry is made that could not finish before it.
+
     Args:
         client: LLM client instance (reused across retries)
         transcript: Consultation transcript text
         template: SOAP template content
         language: Output language code (fr/de/en)
+        note_format: Note format preference (paragraph/bullets)
+        verbosity: Note verbosity level (concise/medium)
+        deadline: Optional request deadline (keyword argument)
 
     Returns:
         SOAPNoteOutput with the 4 SOAP sections
 
     Raises:
-        Exception: Re-raised after 3 failed attempts
+        CircuitOpenError: Without retrying, if the LLM circuit is open
+        DeadlineExceededError: Without retrying, if the deadline has passed
+        Exception: Re-raised after the last attempt
     """
-    return await client.extract_soap_note(transcript, template, language)
+    if deadline is not None:
+        deadline.check("soap_extraction")
+    timeout = deadline.remaining() if deadline is not None else None
+    async with _breaker.guard(), asyncio.timeout(timeout):
+        return await client.extract_soap_note(
+            transcript, template, language, note_format=note_format, verbosity=verbosity
+        )
+
+
+async def _extract_map_reduce(
+    client: BaseLLMClient,
+    transcript: str,
+    template: str,
+    language: str,
+    note_format: str = "paragraph",
+    verbosity: str = "medium",
+    deadline: Deadline | None = None,
+) -> SOAPNoteOutput:
+    """Extract a SOAP note from a long transcript chunk by chunk.
+
+    Partial notes are extracted concurrently from overlapping chunks, at
+    most llm_map_reduce_parallelism at a time, each with the usual retry
+    and circuit breaker, then merged into one note.
+
+    Args:
+        client: LLM client instance
+        transcript: Consultation transcript text
+        template: SOAP template content
+        language: Output language code (fr/de/en)
+        note_format: Note format preference (paragraph/bullets)
+        verbosity: Note verbosity level (concise/medium)
+        deadline: Optional request deadline
+
+    Returns:
+        SOAPNoteOutput merged from the partial notes
+
+    Raises:
+        Exception: The first chunk error; the other chunks are cancelled
+    """
+    settings = get_settings()
+    chunks = split_transcript(
+        transcript,
+        settings.llm_map_reduce_chunk_tokens,
+        settings.llm_map_reduce_overlap_tokens,
+    )
+    limiter = asyncio.Semaphore(settings.llm_map_reduce_parallelism)
+
+    async def extract_chunk(chunk: str) -> SOAPNoteOutput:
+        async with limiter:
+            return await _extract_with_retry(
+                client,
+                chunk,
+                template,
+                language,
+                note_format,
+                verbosity,
+                deadline=deadline,
+            )
+
+    tasks = [asyncio.create_task(extract_chunk(chunk)) for chunk in chunks]
+    try:
+        partials = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    logger.info("SOAP note merged from %d transcript chunks", len(chunks))
+    return merge_soap_notes(partials, note_format)
 
 
 async def extract_soap_note(
     transcript: str,
     user_language: str,
     template: str | None = None,
+    template_name: str = DEFAULT_TEMPLATE,
+    note_format: str = "paragraph",
+    verbosity: str = "medium",
+    deadline: Deadline | None = None,
 ) -> SOAPNoteOutput:
     """Extract a structured SOAP note from a consultation transcript.
 
     Handles template loading, LLM invocation with retry logic,
     performance timing, and error handling with Sentry logging.
+    Transcripts longer than llm_map_reduce_threshold_tokens are extracted
+    in map-reduce mode (see app.services.llm.map_reduce).
 
     Args:
         transcript: Transcribed text from the consultation
         user_language: User's app language setting (fr/de/en)
         template: Optional pre-loaded template content
+        template_name: Registered template used when no content is given
+        note_format: Note format preference (paragraph/bullets)
+        verbosity: Note verbosity level (concise/medium)
+        deadline: Optional request deadline bounding attempts and retries
 
     Returns:
         SOAPNoteOutput with the 4 SOAP sections
 
     Raises:
-        SOAPExtractionError: If extraction fails after all retries
+        SOAPExtractionError: If extraction fails after all retries, or
+            immediately while the LLM circuit is open or once the
+            deadline has passed
     """
-    # Load template if not provided
+    # Template served from memory if not provided
     if template is None:
-        template = load_soap_template(PROJECT_ROOT)
+        template = get_soap_template(template_name)
 
     # Create client once, reused across retries
     client = get_llm_client()
 
+    # Regenerating an identical note is served without calling the LLM
+    cache_key = _result_cache_key(
+        client, transcript, template, user_language, note_format, verbosity
+    )
+    cached = llm_result_cache.get(cache_key)
+    if cached is not None:
+        logger.info("SOAP extraction served from the result cache")
+        return cached
+
     # Measure latency for NFR11 monitoring
     start_time = time.perf_counter()
 
+    if estimate_tokens(transcript) > get_settings().llm_map_reduce_threshold_tokens:
+        extract = _extract_map_reduce
+    else:
+        extract = _extract_with_retry
+
     try:
-        result = await _extract_with_retry(client, transcript, template, user_language)
+        result = await extract(
+            client,
+            transcript,
+            template,
+            user_language,
+            note_format,
+            verbosity,
+            deadline=deadline,
+        )
+    except (CircuitOpenError, DeadlineExceededError) as e:
+        logger.warning("SOAP extraction rejected: %s", e)
+        raise SOAPExtractionError(f"Failed to extract SOAP note: {e}") from e
     except Exception as e:
         elapsed_ms = (time.perf_counter() - start_time) * 1000
+        if deadline is not None and deadline.expired:
+            record_deadline_exceeded("soap_extraction")
         logger.error(
             "SOAP extraction failed after retries: %s (%.0fms)", e, elapsed_ms
         )
@@ -98,6 +289,8 @@ async def extract_soap_note(
             f"Failed to extract SOAP note: {e}"
         ) from e
 
+    llm_result_cache.set(cache_key, result)
+
     elapsed_ms = (time.perf_counter() - start_time) * 1000
     logger.info("SOAP extraction completed in %.0fms", elapsed_ms)
 
@@ -110,6 +303,124 @@ async def extract_soap_note(
     return result
 
 
+async def extract_soap_note_streaming(
+    transcript: str,
+    user_language: str,
+    on_section: SectionCallback,
+    template: str | None = None,
+    template_name: str = DEFAULT_TEMPLATE,
+    note_format: str = "paragraph",
+    verbosity: str = "medium",
+    deadline: Deadline | None = None,
+) -> SOAPNoteOutput:
+    """Extract a SOAP note, reporting each section as soon as it is generated.
+
+    Uses the provider's streaming API and parses the JSON object
+    incrementally; on_section is awaited with (section, content) for each
+    SOAP section whose value is complete. The full response is then parsed
+    and validated like a non-streamed one. Sections may already have been
+    reported when a stream fails, so there is no automatic retry.
+    Transcripts long enough for map-reduce extraction are not streamed:
+    their sections are reported once the partial notes are merged.
+
+    Args:
+        transcript: Transcribed text from the consultation
+        user_language: User's app language setting (fr/de/en)
+        on_section: Coroutine called with each completed section
+        template: Optional pre-loaded template content
+        template_name: Registered template used when no content is given
+        note_format: Note format preference (paragraph/bullets)
+        verbosity: Note verbosity level (concise/medium)
+        deadline: Optional request deadline after which the stream is cut off
+
+    Returns:
+        SOAPNoteOutput with the 4 SOAP sections
+
+    Raises:
+        SOAPExtractionError: If the stream fails, the note is invalid or
+            the deadline has passed
+    """
+    if template is None:
+        template = get_soap_template(template_name)
+
+    if estimate_tokens(transcript) > get_settings().llm_map_reduce_threshold_tokens:
+        result = await extract_soap_note(
+            transcript,
+            user_language,
+            template=template,
+            note_format=note_format,
+            verbosity=verbosity,
+            deadline=deadline,
+        )
+        for name in SOAP_SECTIONS:
+            await on_section(name, getattr(result, name))
+        return result
+
+    client = get_llm_client()
+
+    cache_key = _result_cache_key(
+        client, transcript, template, user_language, note_format, verbosity
+    )
+    cached = llm_result_cache.get(cache_key)
+    if cached is not None:
+        logger.info("Streamed SOAP extraction served from the result cache")
+        for name in SOAP_SECTIONS:
+            await on_section(name, getattr(cached, name))
+        return cached
+
+    parser = SOAPStreamParser()
+
+    start_time = time.perf_counter()
+    first_section_ms: float | None = None
+
+    try:
+        if deadline is not None:
+            deadline.check("soap_extraction")
+        timeout = deadline.remaining() if deadline is not None else None
+        async with _breaker.guard(), asyncio.timeout(timeout):
+            async for delta in client.stream_soap_note(
+                transcript,
+                template,
+                user_language,
+                note_format=note_format,
+                verbosity=verbosity,
+            ):
+                for name, content in parser.feed(delta):
+                    if name not in SOAP_SECTIONS:
+                        continue
+                    if first_section_ms is None:
+                        first_section_ms = (time.perf_counter() - start_time) * 1000
+                    await on_section(name, content)
+        result = parse_soap_note_json(parser.text)
+    except (CircuitOpenError, DeadlineExceededError) as e:
+        logger.warning("Streamed SOAP extraction rejected: %s", e)
+        raise SOAPExtractionError(f"Failed to extract SOAP note: {e}") from e
+    except Exception as e:
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        if deadline is not None and deadline.expired:
+            record_deadline_exceeded("soap_extraction")
+        logger.error("Streamed SOAP extraction failed: %s (%.0fms)", e, elapsed_ms)
+        sentry_sdk.capture_exception(e)
+        raise SOAPExtractionError(f"Failed to extract SOAP note: {e}") from e
+
+    llm_result_cache.set(cache_key, result)
+
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+    logger.info(
+        "Streamed SOAP extraction completed in %.0fms (first section after %.0fms)",
+        elapsed_ms,
+        first_section_ms or elapsed_ms,
+    )
+
+    if elapsed_ms > 25000:
+        logger.warning(
+            "SOAP extraction latency %.0fms exceeds 25s threshold (NFR11)",
+            elapsed_ms,
+        )
+
+    return result
+
+
 async def create_note_from_transcript(
     db: AsyncSession,
     user_id: uuid.UUID,
@@ -118,11 +429,14 @@ async def create_note_from_transcript(
     user_language: str = "fr",
     note_format: str = "paragraph",
     verbosity: str = "medium",
+    on_section: SectionCallback | None = None,
+    deadline: Deadline | None = None,
 ) -> Note:
     """Extract SOAP note and persist to database.
 
     Full orchestration: extract SOAP sections via LLM, create Note
-    model instance, and save to database.
+    model instance, and save to database. The session's connection is
+    released during the LLM call and only checked out again to persist.
 
     Args:
         db: Async database session
@@ -132,6 +446,9 @@ async def create_note_from_transcript(
         user_language: Target output language (fr/de/en)
         note_format: Note format preference (paragraph/bullets)
         verbosity: Note verbosity level (concise/medium)
+        on_section: Optional coroutine called with each SOAP section as it
+            is generated (uses the streaming extraction)
+        deadline: Optional request deadline for the LLM extraction
 
     Returns:
         Created Note model instance with database-generated timestamps
@@ -139,7 +456,26 @@ async def create_note_from_transcript(
     Raises:
         SOAPExtractionError: If LLM extraction fails
     """
-    soap_output = await extract_soap_note(transcript, user_language)
+    # No pooled connection held while waiting on the LLM
+    await release_connection(db)
+
+    if on_section is not None:
+        soap_output = await extract_soap_note_streaming(
+            transcript,
+            user_language,
+            on_section,
+            note_format=note_format,
+            verbosity=verbosity,
+            deadline=deadline,
+        )
+    else:
+        soap_output = await extract_soap_note(
+            transcript,
+            user_language,
+            note_format=note_format,
+            verbosity=verbosity,
+            deadline=deadline,
+        )
 
     note = Note(
         user_id=user_id,
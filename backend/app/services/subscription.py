@@ -1,12 +1,16 @@
 """Subscription service for managing user subscriptions."""
 
-from datetime import datetime, timedelta, timezone
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import NamedTuple
 from uuid import UUID
 
 from fastapi import HTTPException
-from sqlalchemy import select
+from sqlalchemy import case, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.principal import invalidate_principal
 from app.models.plan import Plan
 from app.models.subscription import Subscription, SubscriptionStatus
 
@@ -15,6 +19,50 @@ from app.models.subscription import Subscription, SubscriptionStatus
 TRIAL_DURATION_DAYS = 7
 TRIAL_QUOTA = 5
 
+# Billing period of paid subscriptions
+BILLING_PERIOD_DAYS = 30
+
+
+class QuotaReservation(NamedTuple):
+    """
+    Quota left after a successful reservation.
+
+    Attributes:
+        quota_remaining: Units left once the reserved one is taken
+        quota_total: Units allocated for the current period
+    """
+
+    quota_remaining: int
+    quota_total: int
+
+
+class QuotaExhaustedError(Exception):
+    """Raised when no quota unit could be reserved for a recording."""
+
+
+@dataclass
+class RolloverReport:
+    """
+    Outcome of a period rollover run.
+
+    Attributes:
+        renewed: Periods renewed (a subscription overdue by several
+            periods counts once per period)
+        batches: UPDATE statements run
+        elapsed_seconds: Duration of the run
+    """
+
+    renewed: int = 0
+    batches: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def per_second(self) -> float:
+        """Subscriptions renewed per second."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.renewed / self.elapsed_seconds
+
 
 async def get_user_subscription(
     db: AsyncSession, user_id: UUID
@@ -79,7 +127,7 @@ async def create_trial_subscription(
             },
         )
 
-    now = datetime.now(timezone.utc)
+    now = datetime.now(UTC)
     trial_ends_at = now + timedelta(days=TRIAL_DURATION_DAYS)
 
     subscription = Subscription(
@@ -96,6 +144,7 @@ async def create_trial_subscription(
     db.add(subscription)
     await db.commit()
     await db.refresh(subscription)
+    invalidate_principal(user_id)
 
     return subscription
 
@@ -114,7 +163,7 @@ def is_trial_expired(subscription: Subscription) -> bool:
         return False
     if subscription.trial_ends_at is None:
         return False
-    return datetime.now(timezone.utc) > subscription.trial_ends_at
+    return datetime.now(UTC) > subscription.trial_ends_at
 
 
 async def check_subscription_valid(db: AsyncSession, user_id: UUID) -> bool:
@@ -149,10 +198,78 @@ async def check_subscription_valid(db: AsyncSession, user_id: UUID) -> bool:
     return True
 
 
+async def reserve_quota(db: AsyncSession, user_id: UUID) -> QuotaReservation | None:
+    """
+    Take one unit of a user's quota in a single conditional UPDATE.
+
+    The check and the decrement are one statement on the subscription row,
+    so concurrent uploads of the same account are serialized by the
+    database and can never spend more than quota_remaining. The caller
+    commits, together with the recording holding the reservation; the
+    unit is given back with release_quota if the recording fails.
+
+    Args:
+        db: Database session
+        user_id: User's UUID
+
+    Returns:
+        The quota left, or None if there is no subscription allowing
+        recording or no quota left
+    """
+    result = await db.execute(
+        update(Subscription)
+        .where(
+            Subscription.user_id == user_id,
+            Subscription.quota_remaining > 0,
+            Subscription.status != SubscriptionStatus.EXPIRED.value,
+            or_(
+                Subscription.status != SubscriptionStatus.TRIAL.value,
+                Subscription.trial_ends_at.is_(None),
+                Subscription.trial_ends_at >= datetime.now(UTC),
+            ),
+        )
+        .values(quota_remaining=Subscription.quota_remaining - 1)
+        .returning(Subscription.quota_remaining, Subscription.quota_total)
+    )
+    row = result.one_or_none()
+    return QuotaReservation(*row) if row is not None else None
+
+
+async def release_quota(db: AsyncSession, user_id: UUID, units: int = 1) -> None:
+    """
+    Give back units reserved with reserve_quota, in a single UPDATE.
+
+    Never raises quota_remaining above quota_total (e.g. if the period was
+    renewed meanwhile). The caller commits.
+
+    Args:
+        db: Database session
+        user_id: User's UUID
+        units: Number of units to give back
+    """
+    released = Subscription.quota_remaining + units
+    await db.execute(
+        update(Subscription)
+        .where(
+            Subscription.user_id == user_id,
+            Subscription.quota_remaining < Subscription.quota_total,
+        )
+        .values(
+            quota_remaining=case(
+                (released > Subscription.quota_total, Subscription.quota_total),
+                else_=released,
+            )
+        )
+    )
+
+
 async def decrement_quota(db: AsyncSession, user_id: UUID) -> Subscription:
     """
     Decrement a user's remaining quota by 1.
 
+    Uses reserve_quota, so concurrent calls never spend more than the
+    remaining quota.
+
     Args:
         db: Database session
         user_id: User's UUID
@@ -164,6 +281,8 @@ async def decrement_quota(db: AsyncSession, user_id: UUID) -> Subscription:
         HTTPException: 403 if no quota remaining
         HTTPException: 404 if no subscription
     """
+    reservation = await reserve_quota(db, user_id)
+    await db.commit()
     subscription = await get_user_subscription(db, user_id)
 
     if not subscription:
@@ -177,7 +296,7 @@ async def decrement_quota(db: AsyncSession, user_id: UUID) -> Subscription:
             },
         )
 
-    if subscription.quota_remaining <= 0:
+    if reservation is None:
         raise HTTPException(
             status_code=403,
             detail={
@@ -192,10 +311,6 @@ async def decrement_quota(db: AsyncSession, user_id: UUID) -> Subscription:
             },
         )
 
-    subscription.quota_remaining -= 1
-    await db.commit()
-    await db.refresh(subscription)
-
     return subscription
 
 
@@ -205,6 +320,9 @@ async def expire_trial_if_needed(
     """
     Mark a trial as expired if the trial period has ended.
 
+    Request handlers only check expiry with is_trial_expired: due trials
+    are written in bulk by expire_due_trials.
+
     Args:
         db: Database session
         subscription: Subscription to check
@@ -221,5 +339,109 @@ async def expire_trial_if_needed(
     subscription.status = SubscriptionStatus.EXPIRED.value
     await db.commit()
     await db.refresh(subscription)
+    invalidate_principal(subscription.user_id)
 
     return subscription
+
+
+async def expire_due_trials(db: AsyncSession, now: datetime | None = None) -> int:
+    """
+    Mark every trial past its end date as expired, in one UPDATE.
+
+    The WHERE clause matches the partial index idx_subscriptions_trial_ends_at
+    (trial_ends_at of rows in trial status), so only due trials are read.
+    Run periodically in the background instead of on the request path.
+
+    Args:
+        db: Database session
+        now: Reference time (default: current time)
+
+    Returns:
+        Number of trials expired
+    """
+    result = await db.execute(
+        update(Subscription)
+        .where(
+            Subscription.status == SubscriptionStatus.TRIAL.value,
+            Subscription.trial_ends_at < (now or datetime.now(UTC)),
+        )
+        .values(status=SubscriptionStatus.EXPIRED.value)
+        .returning(Subscription.user_id)
+        .execution_options(synchronize_session=False)
+    )
+    user_ids = result.scalars().all()
+    await db.commit()
+    for user_id in user_ids:
+        invalidate_principal(user_id)
+    return len(user_ids)
+
+
+async def rollover_due_periods(
+    db: AsyncSession,
+    now: datetime | None = None,
+    batch_size: int = 1000,
+    max_batches: int | None = None,
+) -> RolloverReport:
+    """
+    Start a new billing period for active subscriptions whose period has ended.
+
+    Each batch locks the next due subscriptions with their plan's quota
+    (SELECT ... FOR UPDATE SKIP LOCKED, so concurrent runs split the work),
+    then refills quota_remaining and quota_total with one bulk UPDATE by
+    primary key, committed on its own. The new period starts where the
+    previous one ended, so renewal dates do not drift to the time the job
+    runs; a subscription overdue by several periods stays due and is
+    renewed again by later batches or runs until its period ends after
+    now. The run is idempotent (renewed periods end after now) and
+    resumable (an interrupted run leaves the remaining due subscriptions
+    for the next one).
+
+    Args:
+        db: Database session
+        now: Reference time (default: current time)
+        batch_size: Subscriptions renewed per UPDATE
+        max_batches: Stop after this many batches (default: until none is due)
+
+    Returns:
+        Number of renewed subscriptions, batches and throughput
+    """
+    now = now or datetime.now(UTC)
+    period = timedelta(days=BILLING_PERIOD_DAYS)
+    due = (
+        select(Subscription.id, Subscription.current_period_end, Plan.quota_monthly)
+        .join(Plan, Subscription.plan_id == Plan.id)
+        .where(
+            Subscription.status == SubscriptionStatus.ACTIVE.value,
+            Subscription.current_period_end <= now,
+        )
+        .order_by(Subscription.current_period_end)
+        .limit(batch_size)
+        .with_for_update(of=Subscription, skip_locked=True)
+    )
+    report = RolloverReport()
+    start = time.perf_counter()
+    while max_batches is None or report.batches < max_batches:
+        rows = (await db.execute(due)).all()
+        if rows:
+            # ORM bulk UPDATE by primary key (executemany)
+            await db.execute(
+                update(Subscription),
+                [
+                    {
+                        "id": row.id,
+                        "quota_remaining": row.quota_monthly,
+                        "quota_total": row.quota_monthly,
+                        "current_period_start": row.current_period_end,
+                        "current_period_end": row.current_period_end + period,
+                    }
+                    for row in rows
+                ],
+            )
+        await db.commit()
+        renewed = len(rows)
+        report.batches += 1
+        report.renewed += renewed
+        if renewed < batch_size:
+            break
+    report.elapsed_seconds = time.perf_counter() - start
+    return report
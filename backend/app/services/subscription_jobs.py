@@ -0,0 +1,104 @@
+"""Background maintenance of subscriptions.
+
+Trials are expired in bulk by a periodic sweeper instead of on the
+request path: handlers only check expiry in memory (is_trial_expired),
+while the sweeper writes the EXPIRED status of every due trial in one
+set-based UPDATE. Billing periods of active subscriptions are rolled
+over the same way, in batches.
+"""
+
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_settings
+from app.core.database import async_session_maker
+from app.core.jobs import PeriodicTask
+from app.services import subscription as subscription_service
+
+logger = logging.getLogger(__name__)
+
+
+async def sweep_expired_trials(
+    session_factory: async_sessionmaker[AsyncSession] = async_session_maker,
+) -> int:
+    """
+    Expire every trial past its end date.
+
+    Args:
+        session_factory: Factory for the sweeper's database session
+
+    Returns:
+        Number of trials expired
+    """
+    async with session_factory() as db:
+        expired = await subscription_service.expire_due_trials(db)
+    if expired:
+        logger.info("Expired %d trial subscriptions", expired)
+    return expired
+
+
+async def rollover_periods(
+    session_factory: async_sessionmaker[AsyncSession] = async_session_maker,
+) -> subscription_service.RolloverReport:
+    """
+    Start a new billing period for every active subscription whose period ended.
+
+    Args:
+        session_factory: Factory for the job's database session
+
+    Returns:
+        Renewed subscriptions, batches and throughput
+    """
+    async with session_factory() as db:
+        report = await subscription_service.rollover_due_periods(
+            db, batch_size=get_settings().period_rollover_batch_size
+        )
+    if report.renewed:
+        logger.info(
+            "Renewed %d subscriptions in %d batches (%.2fs, %.0f/s)",
+            report.renewed,
+            report.batches,
+            report.elapsed_seconds,
+            report.per_second,
+        )
+    return report
+
+
+# Singletons - started and stopped by the application lifespan
+_trial_sweeper: PeriodicTask | None = None
+_period_rollover: PeriodicTask | None = None
+
+
+def get_trial_sweeper() -> PeriodicTask:
+    """
+    Get or create the trial expiry sweeper.
+
+    Returns:
+        The process-wide sweeper task
+    """
+    global _trial_sweeper
+    if _trial_sweeper is None:
+        _trial_sweeper = PeriodicTask(
+            sweep_expired_trials,
+            interval_seconds=get_settings().trial_sweep_interval_seconds,
+            name="trial-expiry-sweeper",
+        )
+    return _trial_sweeper
+
+
+def get_period_rollover() -> PeriodicTask:
+    """
+    Get or create the billing period rollover job.
+
+    Returns:
+        The process-wide rollover task
+    """
+    global _period_rollover
+    if _period_rollover is None:
+        _period_rollover = PeriodicTask(
+            rollover_periods,
+            interval_seconds=get_settings().period_rollover_interval_seconds,
+            name="period-rollover",
+        )
+    return _period_rollover
@@ -0,0 +1,194 @@
+"""Background transcription jobs for the asynchronous recording pipeline.
+
+POST /recordings/jobs validates the upload, creates the recording in
+TRANSCRIBING status and enqueues a TranscriptionJob; a worker then calls
+Deepgram and finalizes the recording with its own short-lived session,
+so neither the HTTP request nor a pooled DB connection waits on Deepgram.
+A job that fails for any reason, or is interrupted at shutdown, fails
+its recording; recordings a dead process left in TRANSCRIBING are failed
+by a periodic sweep.
+
+IMPORTANT: audio bytes only live in process memory while the job is
+queued (RGPD: audio is NEVER persisted).
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
+
+import sentry_sdk
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_settings
+from app.core.database import async_session_maker
+from app.core.jobs import BaseJobQueue, InProcessJobQueue, PeriodicTask
+from app.models.recording import Recording
+from app.services import recording as recording_service
+from app.services.deepgram import (
+    DeepgramTranscriptionError,
+    transcribe_audio,
+    transcribe_audio_chunked,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TranscriptionJob:
+    """
+    A queued transcription request.
+
+    Attributes:
+        recording_id: Recording created for this upload
+        user_id: Owner of the recording
+        audio_data: Raw audio bytes (kept in memory only)
+        duration_seconds: Declared duration, long recordings are
+            transcribed in parallel segments
+    """
+
+    recording_id: UUID
+    user_id: UUID
+    audio_data: bytes = field(repr=False)
+    duration_seconds: int = 0
+
+
+async def run_transcription_job(
+    job: TranscriptionJob,
+    session_factory: async_sessionmaker[AsyncSession] = async_session_maker,
+) -> None:
+    """
+    Transcribe a queued recording and persist the outcome.
+
+    Args:
+        job: The transcription job
+        session_factory: Factory for the worker's database sessions
+    """
+    try:
+        await _transcribe_and_complete(job, session_factory)
+    except DeepgramTranscriptionError as e:
+        logger.error(
+            "Background transcription failed",
+            extra={"recording_id": str(job.recording_id), "error": str(e)},
+        )
+        await mark_transcription_job_failed(job, session_factory)
+    except Exception as e:
+        logger.error(
+            "Unhandled error in background transcription",
+            extra={"recording_id": str(job.recording_id), "error": str(e)},
+            exc_info=True,
+        )
+        sentry_sdk.capture_exception(e)
+        await mark_transcription_job_failed(job, session_factory)
+
+
+async def _transcribe_and_complete(
+    job: TranscriptionJob, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    """Transcribe a job's audio and complete its recording."""
+    if job.duration_seconds >= get_settings().deepgram_chunk_min_seconds:
+        result = await transcribe_audio_chunked(job.audio_data)
+    else:
+        result = await transcribe_audio(job.audio_data)
+
+    async with session_factory() as db:
+        recording = await db.get(Recording, job.recording_id)
+        if recording is None:
+            logger.warning(
+                "Recording deleted before transcription completed",
+                extra={"recording_id": str(job.recording_id)},
+            )
+            return
+        await recording_service.complete_recording(db, recording, result)
+
+    logger.info(
+        "Background transcription completed",
+        extra={
+            "recording_id": str(job.recording_id),
+            "transcription_latency_ms": round(result.latency_ms, 2),
+        },
+    )
+
+
+async def mark_transcription_job_failed(
+    job: TranscriptionJob,
+    session_factory: async_sessionmaker[AsyncSession] = async_session_maker,
+) -> None:
+    """
+    Mark a job's recording as failed (transcription error or abandoned job).
+
+    Args:
+        job: The transcription job
+        session_factory: Factory for the worker's database sessions
+    """
+    async with session_factory() as db:
+        recording = await db.get(Recording, job.recording_id)
+        if recording is not None:
+            await recording_service.fail_recording(db, recording)
+
+
+async def sweep_stale_recordings(
+    session_factory: async_sessionmaker[AsyncSession] = async_session_maker,
+) -> int:
+    """
+    Fail recordings stuck in TRANSCRIBING and release their quota.
+
+    Catches every path that never reached complete_recording or
+    fail_recording, e.g. a process killed mid-transcription.
+
+    Args:
+        session_factory: Factory for the sweeper's database session
+
+    Returns:
+        Number of recordings failed
+    """
+    cutoff = datetime.now(UTC) - timedelta(
+        seconds=get_settings().stale_recording_after_seconds
+    )
+    async with session_factory() as db:
+        failed = await recording_service.fail_stale_recordings(db, older_than=cutoff)
+    if failed:
+        logger.warning("Failed %d recordings stuck in transcription", failed)
+    return failed
+
+
+# Singletons - started and stopped by the application lifespan
+_queue: BaseJobQueue[TranscriptionJob] | None = None
+_stale_recording_sweeper: PeriodicTask | None = None
+
+
+def get_transcription_queue() -> BaseJobQueue[TranscriptionJob]:
+    """
+    Get or create the transcription job queue.
+
+    Returns:
+        The process-wide transcription queue
+    """
+    global _queue
+    if _queue is None:
+        settings = get_settings()
+        _queue = InProcessJobQueue(
+            handler=run_transcription_job,
+            workers=settings.transcription_workers,
+            max_size=settings.transcription_queue_size,
+            on_abandon=mark_transcription_job_failed,
+            name="transcription",
+        )
+    return _queue
+
+
+def get_stale_recording_sweeper() -> PeriodicTask:
+    """
+    Get or create the sweeper of recordings stuck in transcription.
+
+    Returns:
+        The process-wide sweeper task
+    """
+    global _stale_recording_sweeper
+    if _stale_recording_sweeper is None:
+        _stale_recording_sweeper = PeriodicTask(
+            sweep_stale_recordings,
+            interval_seconds=get_settings().stale_recording_sweep_interval_seconds,
+            name="stale-recording-sweeper",
+        )
+    return _stale_recording_sweeper
@@ -0,0 +1,350 @@
+"""Splitting of WebM/Opus recordings into independently decodable segments.
+
+Long recordings are transcribed as several shorter files in parallel.
+A segment is a standalone WebM file made of the recording's header
+(EBML header, segment Info and Tracks) followed by a run of its Clusters,
+so no audio is decoded or re-encoded. Split points are taken at Cluster
+boundaries, preferring the quietest boundary near each target position:
+Opus is variable bitrate, so silent frames are much smaller than speech
+frames and packet sizes locate pauses without decoding.
+
+IMPORTANT: segments only live in memory (RGPD: audio is NEVER persisted).
+"""
+
+from collections import deque
+from collections.abc import Sequence
+from typing import NamedTuple
+
+# EBML element IDs (with their length marker, as written in the file)
+EBML_HEADER_ID = 0x1A45DFA3
+SEGMENT_ID = 0x18538067
+INFO_ID = 0x1549A966
+TRACKS_ID = 0x1654AE6B
+CLUSTER_ID = 0x1F43B675
+TIMECODE_SCALE_ID = 0x2AD7B1
+DURATION_ID = 0x4489
+CLUSTER_TIMECODE_ID = 0xE7
+SIMPLE_BLOCK_ID = 0xA3
+BLOCK_GROUP_ID = 0xA0
+
+# Children of Segment; one of them ends a Cluster of unknown size
+SEGMENT_CHILD_IDS = frozenset(
+    {
+        0x114D9B74,  # SeekHead
+        INFO_ID,
+        TRACKS_ID,
+        CLUSTER_ID,
+        0x1C53BB6B,  # Cues
+        0x1941A469,  # Attachments
+        0x1043A770,  # Chapters
+        0x1254C367,  # Tags
+    }
+)
+
+# Size field meaning "unknown size" (live recordings, e.g. MediaRecorder)
+UNKNOWN_SIZE = b"\x01\xff\xff\xff\xff\xff\xff\xff"
+
+# Frames on each side of a Cluster boundary used to measure its loudness
+# (about 0.5s of 20ms Opus frames)
+EDGE_FRAMES = 25
+
+
+class AudioSegment(NamedTuple):
+    """
+    A standalone part of a recording.
+
+    Attributes:
+        data: WebM file of the segment
+        start_seconds: Offset of the segment in the recording
+        duration_seconds: Approximate duration of the segment
+    """
+
+    data: bytes
+    start_seconds: float
+    duration_seconds: float
+
+
+class _Cluster(NamedTuple):
+    """Position, start time and edge loudness of a Cluster."""
+
+    start: int
+    end: int
+    time_seconds: float
+    end_seconds: float
+    head_bytes: float
+    tail_bytes: float
+
+
+class WebMFormatError(ValueError):
+    """Raised when audio is not a WebM file that can be split."""
+
+
+def _read_id(data: bytes, pos: int) -> tuple[int, int]:
+    """Read an element ID, returning it and the position after it."""
+    if pos >= len(data):
+        raise WebMFormatError("Truncated element ID")
+    first = data[pos]
+    length = 1
+    while length <= 4 and not first & (0x80 >> (length - 1)):
+        length += 1
+    if length > 4 or pos + length > len(data):
+        raise WebMFormatError("Invalid element ID")
+    return int.from_bytes(data[pos : pos + length], "big"), pos + length
+
+
+def _read_size(data: bytes, pos: int) -> tuple[int | None, int]:
+    """Read an element size, returning it (None if unknown) and the position after it."""
+    if pos >= len(data):
+        raise WebMFormatError("Truncated element size")
+    first = data[pos]
+    length = 1
+    while length <= 8 and not first & (0x80 >> (length - 1)):
+        length += 1
+    if length > 8 or pos + length > len(data):
+        raise WebMFormatError("Invalid element size")
+    value = first & (0xFF >> length)
+    for byte in data[pos + 1 : pos + length]:
+        value = (value << 8) | byte
+    if value == (1 << (7 * length)) - 1:
+        return None, pos + length
+    return value, pos + length
+
+
+def _encode_element(element_id: int, payload: bytes) -> bytes:
+    """Encode an element with an 8-byte size field."""
+    id_bytes = element_id.to_bytes((element_id.bit_length() + 7) // 8, "big")
+    return id_bytes + b"\x01" + len(payload).to_bytes(7, "big") + payload
+
+
+def _strip_duration(data: bytes, start: int, end: int) -> tuple[bytes, int]:
+    """
+    Rebuild an Info element without its Duration, which only fits the whole file.
+
+    Returns:
+        The Info element and the TimecodeScale in nanoseconds
+    """
+    children = []
+    timecode_scale = 1_000_000
+    pos = start
+    while pos < end:
+        element_start = pos
+        element_id, pos = _read_id(data, pos)
+        size, pos = _read_size(data, pos)
+        if size is None:
+            raise WebMFormatError("Unknown size inside Info")
+        if element_id == TIMECODE_SCALE_ID:
+            timecode_scale = int.from_bytes(data[pos : pos + size], "big")
+        if element_id != DURATION_ID:
+            children.append(data[element_start : pos + size])
+        pos += size
+    return _encode_element(INFO_ID, b"".join(children)), timecode_scale
+
+
+def _parse_cluster(
+    data: bytes, pos: int, end: int, seconds_per_tick: float
+) -> tuple[_Cluster, int]:
+    """
+    Read a Cluster's timing and frame sizes.
+
+    Args:
+        data: The whole file
+        pos: Position of the Cluster element
+        end: Position after the Cluster (end of the Segment if unknown size)
+        seconds_per_tick: Duration of a timecode unit
+
+    Returns:
+        The Cluster and the position after it
+    """
+    start = pos
+    _, pos = _read_id(data, pos)
+    size, pos = _read_size(data, pos)
+    if size is not None:
+        end = min(end, pos + size)
+    timecode = 0
+    last_block = 0
+    head: list[int] = []
+    tail: deque[int] = deque(maxlen=EDGE_FRAMES)
+    while pos < end:
+        child_start = pos
+        child_id, pos = _read_id(data, pos)
+        if size is None and child_id in SEGMENT_CHILD_IDS:
+            end = child_start
+            break
+        child_size, pos = _read_size(data, pos)
+        if child_size is None:
+            raise WebMFormatError("Unknown size inside Cluster")
+        if child_id == CLUSTER_TIMECODE_ID:
+            timecode = int.from_bytes(data[pos : pos + child_size], "big")
+        elif child_id in (SIMPLE_BLOCK_ID, BLOCK_GROUP_ID):
+            block = pos
+            if child_id == BLOCK_GROUP_ID:
+                # The Block is the first child of a BlockGroup
+                _, block = _read_id(data, block)
+                _, block = _read_size(data, block)
+            _, frame = _read_size(data, block)  # track number
+            relative = int.from_bytes(data[frame : frame + 2], "big", signed=True)
+            last_block = max(last_block, relative)
+            frame_bytes = pos + child_size - (frame + 3)
+            if len(head) < EDGE_FRAMES:
+                head.append(frame_bytes)
+            tail.append(frame_bytes)
+        pos += child_size
+
+    def mean(sizes: Sequence[int]) -> float:
+        return sum(sizes) / len(sizes) if sizes else 0.0
+
+    cluster = _Cluster(
+        start=start,
+        end=end,
+        time_seconds=timecode * seconds_per_tick,
+        end_seconds=(timecode + last_block) * seconds_per_tick,
+        head_bytes=mean(head),
+        tail_bytes=mean(tail),
+    )
+    return cluster, end
+
+
+def _parse(data: bytes) -> tuple[bytes, list[_Cluster]]:
+    """
+    Parse a WebM file into a segment header and its Clusters.
+
+    Returns:
+        The header shared by all segments, and the Clusters in file order
+
+    Raises:
+        WebMFormatError: If the data is not a WebM file with Info and Tracks
+    """
+    element_id, pos = _read_id(data, 0)
+    if element_id != EBML_HEADER_ID:
+        raise WebMFormatError("Not a WebM file")
+    size, pos = _read_size(data, pos)
+    if size is None:
+        raise WebMFormatError("Unknown EBML header size")
+    ebml_header = data[: pos + size]
+    pos += size
+
+    element_id, pos = _read_id(data, pos)
+    if element_id != SEGMENT_ID:
+        raise WebMFormatError("Missing Segment")
+    size, pos = _read_size(data, pos)
+    segment_end = len(data) if size is None else min(len(data), pos + size)
+
+    info: bytes | None = None
+    tracks: bytes | None = None
+    seconds_per_tick = 0.001
+    clusters: list[_Cluster] = []
+    while pos < segment_end:
+        element_id, child = _read_id(data, pos)
+        if element_id == CLUSTER_ID:
+            cluster, pos = _parse_cluster(data, pos, segment_end, seconds_per_tick)
+            clusters.append(cluster)
+            continue
+        size, child = _read_size(data, child)
+        if size is None:
+            raise WebMFormatError("Unknown size outside Clusters")
+        if element_id == INFO_ID:
+            info, timecode_scale = _strip_duration(data, child, child + size)
+            seconds_per_tick = timecode_scale / 1e9
+        elif element_id == TRACKS_ID:
+            tracks = data[pos : child + size]
+        pos = child + size
+
+    if info is None or tracks is None:
+        raise WebMFormatError("Missing Info or Tracks")
+    header = ebml_header + SEGMENT_ID.to_bytes(4, "big") + UNKNOWN_SIZE + info + tracks
+    return header, clusters
+
+
+def _split_points(
+    clusters: list[_Cluster], segment_seconds: float, search_seconds: float
+) -> list[int]:
+    """
+    Choose the Clusters starting a new segment.
+
+    Around each target position, the boundary with the smallest frames on
+    both sides (the quietest) is chosen, the closest to the target on ties.
+
+    Returns:
+        Indexes of the Clusters starting the 2nd, 3rd, ... segment
+    """
+    start = clusters[0].time_seconds
+    end = clusters[-1].end_seconds
+    points: list[int] = []
+    target = start + segment_seconds
+    while True:
+        first = points[-1] + 1 if points else 1
+        candidates = [
+            index
+            for index in range(first, len(clusters))
+            if abs(clusters[index].time_seconds - target) <= search_seconds
+            # No segment much shorter than requested at the end
+            and end - clusters[index].time_seconds >= segment_seconds / 4
+        ]
+        if not candidates:
+            later = [
+                index
+                for index in range(first, len(clusters))
+                if target <= clusters[index].time_seconds
+                and end - clusters[index].time_seconds >= segment_seconds / 4
+            ]
+            if not later:
+                return points
+            candidates = later[:1]
+        best = min(
+            candidates,
+            key=lambda index: (
+                clusters[index - 1].tail_bytes + clusters[index].head_bytes,
+                abs(clusters[index].time_seconds - target),
+            ),
+        )
+        points.append(best)
+        target = clusters[best].time_seconds + segment_seconds
+
+
+def split_webm(
+    data: bytes, segment_seconds: float, search_seconds: float | None = None
+) -> list[AudioSegment]:
+    """
+    Split a WebM recording into segments of about segment_seconds.
+
+    Args:
+        data: WebM/Opus file
+        segment_seconds: Target duration of a segment
+        search_seconds: How far from each target position a quieter split
+            point is looked for (default: a quarter of segment_seconds)
+
+    Returns:
+        Segments in order; a single segment holding the original data when
+        the recording is shorter than two segments or has a single Cluster
+
+    Raises:
+        WebMFormatError: If the data is not a splittable WebM file
+    """
+    header, clusters = _parse(data)
+    if not clusters:
+        raise WebMFormatError("No audio Clusters")
+
+    start = clusters[0].time_seconds
+    end = clusters[-1].end_seconds
+    if search_seconds is None:
+        search_seconds = segment_seconds / 4
+    points = _split_points(clusters, segment_seconds, search_seconds)
+    if not points:
+        return [AudioSegment(data, 0.0, end - start)]
+
+    bounds = [0, *points, len(clusters)]
+    segments = []
+    for first, last in zip(bounds, bounds[1:]):
+        body = data[clusters[first].start : clusters[last - 1].end]
+        segment_start = clusters[first].time_seconds
+        segment_end = (
+            clusters[last].time_seconds if last < len(clusters) else end
+        )
+        segments.append(
+            AudioSegment(
+                data=header + body,
+                start_seconds=segment_start - start,
+                duration_seconds=segment_end - segment_start,
+            )
+        )
+    return segments
@@ -1,13 +1,19 @@
 """Pytest configuration and fixtures."""
 
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Generator
 
 import pytest
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from app.core.circuit_breaker import reset_circuit_breakers
+from app.core.deadline import reset_deadline_stats
+from app.core.principal import principal_cache
+from app.core.security import verified_token_cache
 from app.main import app
+from app.services.llm.result_cache import llm_result_cache
+from app.services.plan_catalog import plan_catalog
 from app.models.base import Base
 
 
@@ -22,6 +28,25 @@ def _enable_sqlite_fks(dbapi_conn, connection_record):
     cursor.close()
 
 
+@pytest.fixture(autouse=True)
+def _reset_caches() -> Generator[None, None, None]:
+    """Start every test with empty in-process caches (principals, tokens,
+    LLM results, plan catalog), closed circuits and zeroed deadline counters."""
+    principal_cache.clear()
+    verified_token_cache.clear()
+    llm_result_cache.clear()
+    reset_circuit_breakers()
+    reset_deadline_stats()
+    plan_catalog.clear()
+    yield
+    principal_cache.clear()
+    verified_token_cache.clear()
+    llm_result_cache.clear()
+    reset_circuit_breakers()
+    reset_deadline_stats()
+    plan_catalog.clear()
+
+
 @pytest.fixture
 async def client() -> AsyncGenerator[AsyncClient, None]:
     """
@@ -69,12 +94,40 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
         autoflush=False,
     )
 
+    # Load the plan catalog from the test database
+    catalog_session_factory = plan_catalog.session_factory
+    plan_catalog.session_factory = async_session_maker
+
     # Provide session
     async with async_session_maker() as session:
         yield session
 
+    plan_catalog.session_factory = catalog_session_factory
+
     # Cleanup
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
 
     await engine.dispose()
+
+
+@pytest.fixture
+def sql_statements(db_session: AsyncSession) -> Generator[list[str], None, None]:
+    """
+    Record every SQL statement executed through the test database session.
+
+    Used by query-count regression tests: clear the list right before the
+    code under test, then assert on its length and content.
+
+    Yields:
+        list[str]: Executed SQL statements, in order
+    """
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    sync_engine = db_session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _record)
+    yield statements
+    event.remove(sync_engine, "before_cursor_execute", _record)
@@ -0,0 +1,162 @@
+"""Tests for the circuit breaker around external provider calls."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
+from app.services.soap_extraction import SOAPExtractionError, extract_soap_note
+
+
+async def _fail(breaker: CircuitBreaker, exc: Exception | None = None) -> None:
+    """Run one failing call through the breaker."""
+    with pytest.raises(type(exc) if exc else RuntimeError):
+        async with breaker.guard():
+            raise exc or RuntimeError("provider down")
+
+
+async def _succeed(breaker: CircuitBreaker) -> None:
+    """Run one successful call through the breaker."""
+    async with breaker.guard():
+        pass
+
+
+class TestCircuitBreaker:
+    """Tests for the CircuitBreaker state machine."""
+
+    @pytest.mark.asyncio
+    async def test_opens_after_consecutive_failures(self) -> None:
+        """The circuit opens at the threshold and then rejects calls."""
+        breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout_seconds=60)
+
+        for _ in range(2):
+            await _fail(breaker)
+        assert breaker.state is CircuitState.CLOSED
+        await _fail(breaker)
+
+        assert breaker.state is CircuitState.OPEN
+        with pytest.raises(CircuitOpenError) as exc_info:
+            await _succeed(breaker)
+        assert exc_info.value.retry_after_seconds > 0
+        assert breaker.snapshot()["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_success_resets_failure_count(self) -> None:
+        """Only consecutive failures count."""
+        breaker = CircuitBreaker("test", failure_threshold=2)
+
+        await _fail(breaker)
+        await _succeed(breaker)
+        await _fail(breaker)
+
+        assert breaker.state is CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_half_open_probe_closes_or_reopens(self) -> None:
+        """After the timeout one probe is let through and decides the state."""
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout_seconds=0)
+
+        await _fail(breaker)
+        assert breaker.state is CircuitState.HALF_OPEN
+        await _fail(breaker)
+        assert breaker.snapshot()["timesOpened"] == 2
+
+        await _succeed(breaker)
+        assert breaker.state is CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_half_open_admits_a_single_probe(self) -> None:
+        """Concurrent calls are rejected while the probe is running."""
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout_seconds=0)
+        await _fail(breaker)
+        probe_started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def probe() -> None:
+            async with breaker.guard():
+                probe_started.set()
+                await release.wait()
+
+        task = asyncio.create_task(probe())
+        await probe_started.wait()
+        with pytest.raises(CircuitOpenError):
+            await _succeed(breaker)
+        release.set()
+        await task
+
+        assert breaker.state is CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_slow_calls_count_as_failures(self) -> None:
+        """Calls slower than the threshold trip the circuit even if they succeed."""
+        breaker = CircuitBreaker("test", failure_threshold=1, slow_call_seconds=0.01)
+
+        async with breaker.guard():
+            await asyncio.sleep(0.02)
+
+        assert breaker.state is CircuitState.OPEN
+
+    @pytest.mark.asyncio
+    async def test_ignored_errors_and_cancellation(self) -> None:
+        """Errors not caused by the provider and cancellations are not failures."""
+        breaker = CircuitBreaker(
+            "test",
+            failure_threshold=1,
+            is_failure=lambda exc: not isinstance(exc, ValueError),
+        )
+
+        await _fail(breaker, ValueError("bad request"))
+        with pytest.raises(asyncio.CancelledError):
+            async with breaker.guard():
+                raise asyncio.CancelledError()
+
+        assert breaker.state is CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_cancellation_is_not_a_success(self) -> None:
+        """A cancelled call neither resets failures nor closes the circuit."""
+        breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout_seconds=0)
+
+        async def cancelled() -> None:
+            with pytest.raises(asyncio.CancelledError):
+                async with breaker.guard():
+                    raise asyncio.CancelledError()
+
+        await _fail(breaker)
+        await _fail(breaker)
+        await cancelled()
+        assert breaker.snapshot()["consecutiveFailures"] == 2
+
+        await _fail(breaker)
+        assert breaker.state is CircuitState.HALF_OPEN
+        # A cancelled probe frees its slot but leaves the circuit half-open
+        await cancelled()
+        assert breaker.state is CircuitState.HALF_OPEN
+        await _fail(breaker)
+        assert breaker.snapshot()["timesOpened"] == 2
+
+
+class TestSoapExtractionCircuit:
+    """Tests for the circuit breaker around LLM calls."""
+
+    @pytest.mark.asyncio
+    @patch("app.services.soap_extraction.sentry_sdk")
+    @patch("app.services.soap_extraction.get_llm_client")
+    async def test_open_circuit_fails_fast(self, mock_get_client, mock_sentry) -> None:
+        """Once open, extraction fails without calling the LLM or retrying."""
+        mock_client = MagicMock()
+        mock_client.extract_soap_note = AsyncMock(side_effect=ConnectionError("down"))
+        mock_get_client.return_value = mock_client
+
+        with patch("app.services.soap_extraction._extract_with_retry.retry.sleep", AsyncMock()):
+            for _ in range(2):
+                with pytest.raises(SOAPExtractionError):
+                    await extract_soap_note("Transcript", "fr", template="## T")
+        calls = mock_client.extract_soap_note.await_count
+        assert calls == 5  # threshold reached on the second note's 2nd attempt
+
+        with pytest.raises(SOAPExtractionError, match="circuit open"):
+            await extract_soap_note("Transcript", "fr", template="## T")
+
+        assert mock_client.extract_soap_note.await_count == calls
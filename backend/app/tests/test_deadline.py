@@ -0,0 +1,155 @@
+"""Tests for per-request deadlines around external provider calls."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_fixed
+
+from app.core.deadline import (
+    Deadline,
+    DeadlineExceededError,
+    deadline_stats,
+    stop_at_deadline,
+    wait_within_deadline,
+)
+from app.services.deepgram import DeepgramTranscriptionError, transcribe_audio
+from app.services.soap_extraction import SOAPExtractionError, extract_soap_note
+
+
+class TestDeadline:
+    """Tests for the Deadline budget and the tenacity strategies."""
+
+    def test_timeout_is_bounded_by_remaining_time(self) -> None:
+        """Provider timeouts shrink to the time left."""
+        assert Deadline(60).timeout(30) == 30
+        assert Deadline(5).timeout(30) <= 5
+        assert Deadline(-1).timeout(30) == 0
+
+    def test_check_raises_and_counts(self) -> None:
+        """An expired deadline raises and is counted per stage."""
+        Deadline(60).check("transcription")
+
+        with pytest.raises(DeadlineExceededError, match="transcription"):
+            Deadline(0).check("transcription")
+
+        assert deadline_stats() == {"transcription": 1}
+
+    @pytest.mark.asyncio
+    async def test_retries_stop_when_no_attempt_fits(self) -> None:
+        """Waits are shortened to the budget and retries stop when it runs out."""
+        calls = 0
+
+        @retry(
+            stop=stop_after_attempt(10) | stop_at_deadline(0.15),
+            wait=wait_within_deadline(wait_fixed(60), 0.15),
+            retry=retry_if_exception_type(ConnectionError),
+            reraise=True,
+        )
+        async def flaky(deadline: Deadline | None = None) -> None:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.1)
+            raise ConnectionError("down")
+
+        with patch.object(flaky.retry, "sleep", AsyncMock(side_effect=asyncio.sleep)) as sleep:
+            with pytest.raises(ConnectionError):
+                await flaky(deadline=Deadline(0.5))
+
+        # The 60s wait is cut to what leaves room for one more attempt
+        assert calls == 2
+        assert sleep.await_count == 1
+        assert sleep.await_args.args[0] <= 0.25
+
+    @pytest.mark.asyncio
+    async def test_without_deadline_strategies_are_unchanged(self) -> None:
+        """Calls without a deadline keep the base stop and wait."""
+        calls = 0
+
+        @retry(
+            stop=stop_after_attempt(3) | stop_at_deadline(0.5),
+            wait=wait_within_deadline(wait_fixed(2), 0.5),
+            reraise=True,
+        )
+        async def flaky() -> None:
+            nonlocal calls
+            calls += 1
+            raise ConnectionError("down")
+
+        with patch.object(flaky.retry, "sleep", AsyncMock()) as sleep:
+            with pytest.raises(ConnectionError):
+                await flaky()
+
+        assert calls == 3
+        assert [call.args[0] for call in sleep.await_args_list] == [2, 2]
+
+
+def _deepgram_settings() -> MagicMock:
+    """Create mock settings with a Deepgram API key."""
+    settings = MagicMock()
+    settings.deepgram_api_key = "test-api-key"
+    settings.deepgram_model = "nova-3"
+    settings.deepgram_max_concurrency = 4
+    settings.deepgram_max_keepalive_connections = 2
+    return settings
+
+
+class TestServiceDeadlines:
+    """Tests for deadlines passed to the transcription and extraction services."""
+
+    @pytest.mark.asyncio
+    async def test_expired_deadline_skips_deepgram(self) -> None:
+        """No Deepgram call is made once the deadline has passed."""
+        with (
+            patch("app.services.deepgram.get_settings", return_value=_deepgram_settings()),
+            patch("app.services.deepgram._get_client") as mock_get_client,
+        ):
+            with pytest.raises(DeepgramTranscriptionError, match="Deadline exceeded"):
+                await transcribe_audio(b"fake audio", deadline=Deadline(0))
+
+        mock_get_client.assert_not_called()
+        assert deadline_stats() == {"transcription": 1}
+
+    @pytest.mark.asyncio
+    async def test_deepgram_timeout_follows_deadline(self) -> None:
+        """The Deepgram request timeout is the remaining budget."""
+        client = MagicMock()
+        client.listen.v1.media.transcribe_file = AsyncMock(
+            side_effect=ConnectionError("down")
+        )
+        with (
+            patch("app.services.deepgram.get_settings", return_value=_deepgram_settings()),
+            patch("app.services.deepgram._get_client", return_value=client),
+            patch("app.services.deepgram.sentry_sdk"),
+        ):
+            with pytest.raises(DeepgramTranscriptionError):
+                await transcribe_audio(b"fake audio", deadline=Deadline(0.8))
+
+        # Too little time left for a retry
+        assert client.listen.v1.media.transcribe_file.await_count == 1
+        options = client.listen.v1.media.transcribe_file.await_args.kwargs
+        assert options["request_options"]["timeout_in_seconds"] <= 0.8
+
+    @pytest.mark.asyncio
+    @patch("app.services.soap_extraction.sentry_sdk")
+    @patch("app.services.soap_extraction.get_llm_client")
+    async def test_slow_llm_is_cut_off_without_retry(
+        self, mock_get_client, mock_sentry
+    ) -> None:
+        """A call outliving the deadline fails once, without retries."""
+
+        async def slow(*args, **kwargs):
+            await asyncio.sleep(10)
+
+        mock_client = MagicMock()
+        mock_client.extract_soap_note = AsyncMock(side_effect=slow)
+        mock_get_client.return_value = mock_client
+
+        with pytest.raises(SOAPExtractionError):
+            await asyncio.wait_for(
+                extract_soap_note("Transcript", "fr", template="## T", deadline=Deadline(0.5)),
+                timeout=2,
+            )
+
+        assert mock_client.extract_soap_note.await_count == 1
+        assert deadline_stats() == {"soap_extraction": 1}
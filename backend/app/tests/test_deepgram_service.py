@@ -1,23 +1,40 @@
 """Tests for Deepgram transcription service."""
 
-from unittest.mock import MagicMock, patch
+import asyncio
+from collections.abc import AsyncIterator
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
+from starlette.requests import ClientDisconnect
 
 import app.services.deepgram as deepgram_module
+from app.core.circuit_breaker import CircuitState
 from app.services.deepgram import (
     DeepgramTranscriptionError,
     TranscriptionResult,
     transcribe_audio,
+    transcribe_audio_chunked,
+    transcribe_audio_stream,
 )
+from app.services.webm import AudioSegment
+
+
+def _mock_async_client() -> MagicMock:
+    """Create a mock AsyncDeepgramClient whose transcribe_file is awaitable."""
+    client = MagicMock()
+    client.listen.v1.media.transcribe_file = AsyncMock()
+    return client
 
 
 @pytest.fixture(autouse=True)
 def reset_singleton() -> None:
-    """Reset the singleton Deepgram client before each test."""
+    """Reset the singleton Deepgram clients before each test."""
     deepgram_module._client = None
+    deepgram_module._semaphore = None
     yield
     deepgram_module._client = None
+    deepgram_module._semaphore = None
 
 
 class TestDeepgramTranscriptionError:
@@ -72,6 +89,8 @@ class TestTranscribeAudio:
         settings = MagicMock()
         settings.deepgram_api_key = "test-api-key"
         settings.deepgram_model = "nova-3"
+        settings.deepgram_max_concurrency = 4
+        settings.deepgram_max_keepalive_connections = 2
         return settings
 
     @pytest.fixture
@@ -99,10 +118,10 @@ class TestTranscribeAudio:
         """Test successful transcription."""
         with (
             patch("app.services.deepgram.get_settings", return_value=mock_settings),
-            patch("app.services.deepgram.DeepgramClient") as mock_client_class,
+            patch("app.services.deepgram.AsyncDeepgramClient") as mock_client_class,
         ):
             # Setup mock
-            mock_client = MagicMock()
+            mock_client = _mock_async_client()
             mock_client_class.return_value = mock_client
             mock_client.listen.v1.media.transcribe_file.return_value = (
                 mock_deepgram_response
@@ -126,9 +145,9 @@ class TestTranscribeAudio:
         """Test transcription with specific language."""
         with (
             patch("app.services.deepgram.get_settings", return_value=mock_settings),
-            patch("app.services.deepgram.DeepgramClient") as mock_client_class,
+            patch("app.services.deepgram.AsyncDeepgramClient") as mock_client_class,
         ):
-            mock_client = MagicMock()
+            mock_client = _mock_async_client()
             mock_client_class.return_value = mock_client
             mock_client.listen.v1.media.transcribe_file.return_value = (
                 mock_deepgram_response
@@ -150,9 +169,9 @@ class TestTranscribeAudio:
         """Test transcription with multi-language detection."""
         with (
             patch("app.services.deepgram.get_settings", return_value=mock_settings),
-            patch("app.services.deepgram.DeepgramClient") as mock_client_class,
+            patch("app.services.deepgram.AsyncDeepgramClient") as mock_client_class,
         ):
-            mock_client = MagicMock()
+            mock_client = _mock_async_client()
             mock_client_class.return_value = mock_client
             mock_client.listen.v1.media.transcribe_file.return_value = (
                 mock_deepgram_response
@@ -195,9 +214,9 @@ class TestTranscribeAudio:
         """Test error when Deepgram returns empty channels."""
         with (
             patch("app.services.deepgram.get_settings", return_value=mock_settings),
-            patch("app.services.deepgram.DeepgramClient") as mock_client_class,
+            patch("app.services.deepgram.AsyncDeepgramClient") as mock_client_class,
         ):
-            mock_client = MagicMock()
+            mock_client = _mock_async_client()
             mock_client_class.return_value = mock_client
 
             mock_response = MagicMock()
@@ -214,9 +233,9 @@ class TestTranscribeAudio:
         """Test error when Deepgram returns no alternatives."""
         with (
             patch("app.services.deepgram.get_settings", return_value=mock_settings),
-            patch("app.services.deepgram.DeepgramClient") as mock_client_class,
+            patch("app.services.deepgram.AsyncDeepgramClient") as mock_client_class,
         ):
-            mock_client = MagicMock()
+            mock_client = _mock_async_client()
             mock_client_class.return_value = mock_client
 
             mock_response = MagicMock()
@@ -235,10 +254,10 @@ class TestTranscribeAudio:
         """Test error handling for API failures."""
         with (
             patch("app.services.deepgram.get_settings", return_value=mock_settings),
-            patch("app.services.deepgram.DeepgramClient") as mock_client_class,
+            patch("app.services.deepgram.AsyncDeepgramClient") as mock_client_class,
             patch("app.services.deepgram.sentry_sdk") as mock_sentry,
         ):
-            mock_client = MagicMock()
+            mock_client = _mock_async_client()
             mock_client_class.return_value = mock_client
             mock_client.listen.v1.media.transcribe_file.side_effect = Exception(
                 "API timeout"
@@ -257,10 +276,10 @@ class TestTranscribeAudio:
         """Test retry logic on transient ConnectionError."""
         with (
             patch("app.services.deepgram.get_settings", return_value=mock_settings),
-            patch("app.services.deepgram.DeepgramClient") as mock_client_class,
+            patch("app.services.deepgram.AsyncDeepgramClient") as mock_client_class,
             patch("app.services.deepgram.sentry_sdk"),
         ):
-            mock_client = MagicMock()
+            mock_client = _mock_async_client()
             mock_client_class.return_value = mock_client
 
             # First call fails with ConnectionError (retryable), second succeeds
@@ -280,10 +299,10 @@ class TestTranscribeAudio:
         """Test that generic exceptions are NOT retried (only ApiError, ConnectionError, TimeoutError)."""
         with (
             patch("app.services.deepgram.get_settings", return_value=mock_settings),
-            patch("app.services.deepgram.DeepgramClient") as mock_client_class,
+            patch("app.services.deepgram.AsyncDeepgramClient") as mock_client_class,
             patch("app.services.deepgram.sentry_sdk"),
         ):
-            mock_client = MagicMock()
+            mock_client = _mock_async_client()
             mock_client_class.return_value = mock_client
 
             # Generic ValueError should NOT be retried
@@ -304,9 +323,9 @@ class TestTranscribeAudio:
         """Test handling of empty transcript (silence)."""
         with (
             patch("app.services.deepgram.get_settings", return_value=mock_settings),
-            patch("app.services.deepgram.DeepgramClient") as mock_client_class,
+            patch("app.services.deepgram.AsyncDeepgramClient") as mock_client_class,
         ):
-            mock_client = MagicMock()
+            mock_client = _mock_async_client()
             mock_client_class.return_value = mock_client
 
             mock_response = MagicMock()
@@ -330,9 +349,9 @@ class TestTranscribeAudio:
         """Test that the singleton client is reused across calls."""
         with (
             patch("app.services.deepgram.get_settings", return_value=mock_settings),
-            patch("app.services.deepgram.DeepgramClient") as mock_client_class,
+            patch("app.services.deepgram.AsyncDeepgramClient") as mock_client_class,
         ):
-            mock_client = MagicMock()
+            mock_client = _mock_async_client()
             mock_client_class.return_value = mock_client
             mock_client.listen.v1.media.transcribe_file.return_value = (
                 mock_deepgram_response
@@ -342,12 +361,378 @@ class TestTranscribeAudio:
             await transcribe_audio(b"fake audio 1")
             await transcribe_audio(b"fake audio 2")
 
-            # DeepgramClient constructor should only be called once (singleton)
+            # AsyncDeepgramClient constructor should only be called once (singleton)
             assert mock_client_class.call_count == 1
             # But transcribe_file should be called twice
             assert mock_client.listen.v1.media.transcribe_file.call_count == 2
 
 
+class TestDeepgramConcurrency:
+    """Tests for the shared async client and its concurrency limit."""
+
+    @pytest.fixture
+    def mock_settings(self) -> MagicMock:
+        """Create mock settings allowing 2 concurrent requests."""
+        settings = MagicMock()
+        settings.deepgram_api_key = "test-api-key"
+        settings.deepgram_model = "nova-3"
+        settings.deepgram_max_concurrency = 2
+        settings.deepgram_max_keepalive_connections = 2
+        return settings
+
+    @pytest.mark.asyncio
+    async def test_in_flight_requests_are_bounded(
+        self, mock_settings: MagicMock
+    ) -> None:
+        """Test that no more than deepgram_max_concurrency requests run at once."""
+        in_flight = 0
+        max_in_flight = 0
+
+        alternative = MagicMock()
+        alternative.transcript = "ok"
+        channel = MagicMock()
+        channel.alternatives = [alternative]
+        response = MagicMock()
+        response.results.channels = [channel]
+
+        async def transcribe_file(**kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return response
+
+        with (
+            patch("app.services.deepgram.get_settings", return_value=mock_settings),
+            patch("app.services.deepgram.AsyncDeepgramClient") as mock_client_class,
+        ):
+            mock_client_class.return_value.listen.v1.media.transcribe_file = (
+                transcribe_file
+            )
+
+            results = await asyncio.gather(
+                *(transcribe_audio(b"audio") for _ in range(6))
+            )
+
+        assert [r.transcript for r in results] == ["ok"] * 6
+        assert max_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_waiting_for_a_slot_is_not_a_slow_call(
+        self, mock_settings: MagicMock, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Test that only the Deepgram call, not the queueing, is timed by the breaker."""
+        alternative = MagicMock()
+        alternative.transcript = "ok"
+        channel = MagicMock()
+        channel.alternatives = [alternative]
+        response = MagicMock()
+        response.results.channels = [channel]
+
+        async def transcribe_file(**kwargs):
+            await asyncio.sleep(0.03)
+            return response
+
+        with (
+            patch("app.services.deepgram.get_settings", return_value=mock_settings),
+            patch("app.services.deepgram.AsyncDeepgramClient") as mock_client_class,
+            patch.object(deepgram_module._breaker, "slow_call_seconds", 0.05),
+        ):
+            mock_client_class.return_value.listen.v1.media.transcribe_file = (
+                transcribe_file
+            )
+
+            await asyncio.gather(*(transcribe_audio(b"audio") for _ in range(6)))
+
+        assert "Slow call" not in caplog.text
+        assert deepgram_module._breaker.snapshot()["consecutiveFailures"] == 0
+
+    @pytest.mark.asyncio
+    async def test_client_uses_pooled_http_client(
+        self, mock_settings: MagicMock
+    ) -> None:
+        """Test that the SDK client is built on one keep-alive httpx client."""
+        with (
+            patch("app.services.deepgram.get_settings", return_value=mock_settings),
+            patch("app.services.deepgram.AsyncDeepgramClient") as mock_client_class,
+        ):
+            deepgram_module._get_client()
+            http_client = mock_client_class.call_args.kwargs["httpx_client"]
+
+            assert isinstance(http_client, httpx.AsyncClient)
+            assert deepgram_module._get_client() is mock_client_class.return_value
+
+            await deepgram_module.close_client()
+
+        assert http_client.is_closed
+        assert deepgram_module._client is None
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self, mock_settings: MagicMock) -> None:
+        """Test that an open Deepgram circuit rejects without calling the API."""
+        with (
+            patch("app.services.deepgram.get_settings", return_value=mock_settings),
+            patch("app.services.deepgram.AsyncDeepgramClient") as mock_client_class,
+            patch("app.services.deepgram.sentry_sdk"),
+            patch("app.services.deepgram._transcribe_with_retry.retry.sleep", AsyncMock()),
+        ):
+            transcribe_file = AsyncMock(side_effect=ConnectionError("down"))
+            mock_client_class.return_value.listen.v1.media.transcribe_file = transcribe_file
+
+            for _ in range(deepgram_module._breaker.failure_threshold):
+                with pytest.raises(DeepgramTranscriptionError):
+                    await transcribe_audio(b"audio")
+            calls = transcribe_file.await_count
+
+            with pytest.raises(DeepgramTranscriptionError, match="circuit open"):
+                await transcribe_audio(b"audio")
+
+        assert transcribe_file.await_count == calls
+
+
+class TestTranscribeAudioStream:
+    """Tests for transcribe_audio_stream function."""
+
+    @pytest.fixture
+    def mock_settings(self) -> MagicMock:
+        """Create mock settings with API key."""
+        settings = MagicMock()
+        settings.deepgram_api_key = "test-api-key"
+        settings.deepgram_model = "nova-3"
+        settings.deepgram_max_concurrency = 4
+        settings.deepgram_max_keepalive_connections = 2
+        return settings
+
+    @pytest.fixture
+    def mock_deepgram_response(self) -> MagicMock:
+        """Create mock Deepgram API response object."""
+        alternative = MagicMock()
+        alternative.transcript = "Le patient présente des douleurs lombaires."
+        channel = MagicMock()
+        channel.alternatives = [alternative]
+        channel.detected_language = "fr"
+        response = MagicMock()
+        response.results.channels = [channel]
+        response.metadata.duration = 30.5
+        return response
+
+    @staticmethod
+    async def _chunks(*chunks: bytes) -> AsyncIterator[bytes]:
+        """Yield audio chunks like Request.stream()."""
+        for chunk in chunks:
+            yield chunk
+
+    @pytest.mark.asyncio
+    async def test_forwards_chunks_without_buffering(
+        self, mock_settings: MagicMock, mock_deepgram_response: MagicMock
+    ) -> None:
+        """Test that the request body is an async iterator over the chunks."""
+        received: list[bytes] = []
+
+        async def transcribe_file(request, **kwargs):
+            assert not isinstance(request, bytes)
+            async for chunk in request:
+                received.append(chunk)
+            return mock_deepgram_response
+
+        with (
+            patch("app.services.deepgram.get_settings", return_value=mock_settings),
+            patch("app.services.deepgram.AsyncDeepgramClient") as mock_client_class,
+        ):
+            mock_client_class.return_value.listen.v1.media.transcribe_file = (
+                transcribe_file
+            )
+
+            result = await transcribe_audio_stream(self._chunks(b"ab", b"cd", b"ef"))
+
+        assert received == [b"ab", b"cd", b"ef"]
+        assert result.transcript == "Le patient présente des douleurs lombaires."
+        assert result.language_detected == "fr"
+
+    @pytest.mark.asyncio
+    async def test_stream_error_is_wrapped(self, mock_settings: MagicMock) -> None:
+        """Test that SDK errors surface as DeepgramTranscriptionError."""
+
+        async def transcribe_file(request, **kwargs):
+            raise ConnectionError("reset by peer")
+
+        with (
+            patch("app.services.deepgram.get_settings", return_value=mock_settings),
+            patch("app.services.deepgram.AsyncDeepgramClient") as mock_client_class,
+            patch("app.services.deepgram.sentry_sdk") as mock_sentry,
+        ):
+            mock_client_class.return_value.listen.v1.media.transcribe_file = (
+                transcribe_file
+            )
+
+            with pytest.raises(DeepgramTranscriptionError):
+                await transcribe_audio_stream(self._chunks(b"audio"))
+
+        mock_sentry.capture_exception.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_client_disconnect_is_not_a_provider_failure(
+        self, mock_settings: MagicMock
+    ) -> None:
+        """Test that aborted uploads never open the Deepgram circuit."""
+
+        async def aborted() -> AsyncIterator[bytes]:
+            yield b"audio"
+            raise ClientDisconnect()
+
+        async def transcribe_file(request, **kwargs):
+            try:
+                async for _ in request:
+                    pass
+            except Exception as e:
+                # The HTTP client wraps errors of the request body
+                raise httpx.WriteError("body failed") from e
+
+        with (
+            patch("app.services.deepgram.get_settings", return_value=mock_settings),
+            patch("app.services.deepgram.AsyncDeepgramClient") as mock_client_class,
+            patch("app.services.deepgram.sentry_sdk") as mock_sentry,
+        ):
+            mock_client_class.return_value.listen.v1.media.transcribe_file = (
+                transcribe_file
+            )
+
+            for _ in range(deepgram_module._breaker.failure_threshold + 1):
+                with pytest.raises(DeepgramTranscriptionError, match="interrupted"):
+                    await transcribe_audio_stream(aborted())
+
+        assert deepgram_module._breaker.state is CircuitState.CLOSED
+        mock_sentry.capture_exception.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_stream_no_api_key(self) -> None:
+        """Test error when API key is not configured."""
+        mock_settings = MagicMock()
+        mock_settings.deepgram_api_key = None
+
+        with patch("app.services.deepgram.get_settings", return_value=mock_settings):
+            with pytest.raises(DeepgramTranscriptionError):
+                await transcribe_audio_stream(self._chunks(b"audio"))
+
+
+class TestChunkedTranscription:
+    """Tests for parallel transcription of long recordings."""
+
+    @pytest.fixture
+    def mock_settings(self) -> MagicMock:
+        """Create mock settings with 2-minute segments, 2 at a time."""
+        settings = MagicMock()
+        settings.deepgram_chunk_seconds = 120
+        settings.deepgram_chunk_parallelism = 2
+        return settings
+
+    @pytest.mark.asyncio
+    async def test_segments_are_transcribed_in_parallel_and_stitched(
+        self, mock_settings: MagicMock
+    ) -> None:
+        """Transcripts are joined in order and the majority language wins."""
+        segments = [
+            AudioSegment(f"segment-{index}".encode(), index * 120.0, 120.0)
+            for index in range(5)
+        ]
+        languages = ["fr", "de", "fr", "fr", "de"]
+        in_flight = 0
+        max_in_flight = 0
+
+        async def transcribe(data: bytes, language: str, deadline=None, count_in_circuit=True):
+            nonlocal in_flight, max_in_flight
+            index = int(data.decode().split("-")[1])
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            # Later segments finish first
+            await asyncio.sleep(0.01 * (5 - index))
+            in_flight -= 1
+            return TranscriptionResult(f"part {index}", languages[index], 120.0, 10.0)
+
+        with (
+            patch("app.services.deepgram.get_settings", return_value=mock_settings),
+            patch("app.services.deepgram.split_webm", return_value=segments),
+            patch("app.services.deepgram.transcribe_audio", side_effect=transcribe),
+        ):
+            result = await transcribe_audio_chunked(b"long recording")
+
+        assert result.transcript == "part 0 part 1 part 2 part 3 part 4"
+        assert result.language_detected == "fr"
+        assert result.duration_seconds == 600.0
+        assert max_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_segment_fails_recording(self, mock_settings: MagicMock) -> None:
+        """One failed segment fails the transcription and cancels the others."""
+        segments = [AudioSegment(b"ok", 0.0, 120.0), AudioSegment(b"ko", 120.0, 120.0)]
+        cancelled = False
+
+        async def transcribe(data: bytes, language: str, deadline=None, count_in_circuit=True):
+            nonlocal cancelled
+            if data == b"ko":
+                raise DeepgramTranscriptionError("Transcription failed: 503")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+
+        with (
+            patch("app.services.deepgram.get_settings", return_value=mock_settings),
+            patch("app.services.deepgram.split_webm", return_value=segments),
+            patch("app.services.deepgram.transcribe_audio", side_effect=transcribe),
+        ):
+            with pytest.raises(DeepgramTranscriptionError, match="503"):
+                await transcribe_audio_chunked(b"long recording")
+            await asyncio.sleep(0)
+
+        assert cancelled
+
+    @pytest.mark.asyncio
+    async def test_failed_recording_counts_once_in_circuit(
+        self, mock_settings: MagicMock
+    ) -> None:
+        """A recording whose segments all fail is one failure for the circuit breaker."""
+        mock_settings.deepgram_api_key = "test-api-key"
+        mock_settings.deepgram_max_concurrency = 4
+        mock_settings.deepgram_max_keepalive_connections = 2
+        segments = [AudioSegment(b"segment", index * 120.0, 120.0) for index in range(4)]
+
+        with (
+            patch("app.services.deepgram.get_settings", return_value=mock_settings),
+            patch("app.services.deepgram.split_webm", return_value=segments),
+            patch("app.services.deepgram.AsyncDeepgramClient") as mock_client_class,
+            patch("app.services.deepgram.sentry_sdk"),
+            patch("app.services.deepgram._transcribe_with_retry.retry.sleep", AsyncMock()),
+        ):
+            mock_client_class.return_value.listen.v1.media.transcribe_file = AsyncMock(
+                side_effect=ConnectionError("down")
+            )
+            with pytest.raises(DeepgramTranscriptionError):
+                await transcribe_audio_chunked(b"long recording")
+
+        assert deepgram_module._breaker.snapshot()["consecutiveFailures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unsplittable_audio_is_sent_whole(
+        self, mock_settings: MagicMock
+    ) -> None:
+        """Audio that is not WebM falls back to a single request."""
+        expected = TranscriptionResult("whole", "fr", 400.0, 10.0)
+
+        with (
+            patch("app.services.deepgram.get_settings", return_value=mock_settings),
+            patch(
+                "app.services.deepgram.transcribe_audio", AsyncMock(return_value=expected)
+            ) as mock_transcribe,
+        ):
+            result = await transcribe_audio_chunked(b"not webm")
+
+        assert result is expected
+        mock_transcribe.assert_awaited_once_with(b"not webm", "multi", deadline=None)
+
+
 class TestTranscriptionLanguages:
     """Tests for language detection and configuration."""
 
@@ -357,6 +742,8 @@ class TestTranscriptionLanguages:
         settings = MagicMock()
         settings.deepgram_api_key = "test-api-key"
         settings.deepgram_model = "nova-3"
+        settings.deepgram_max_concurrency = 4
+        settings.deepgram_max_keepalive_connections = 2
         return settings
 
     def _create_mock_response(self, transcript: str, language: str) -> MagicMock:
@@ -386,9 +773,9 @@ class TestTranscriptionLanguages:
         """Test transcription with different language settings."""
         with (
             patch("app.services.deepgram.get_settings", return_value=mock_settings),
-            patch("app.services.deepgram.DeepgramClient") as mock_client_class,
+            patch("app.services.deepgram.AsyncDeepgramClient") as mock_client_class,
         ):
-            mock_client = MagicMock()
+            mock_client = _mock_async_client()
             mock_client_class.return_value = mock_client
             mock_client.listen.v1.media.transcribe_file.return_value = (
                 self._create_mock_response("Test transcript", expected)
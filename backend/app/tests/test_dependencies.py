@@ -5,7 +5,10 @@ from datetime import timedelta
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.database import get_db
 from app.core.dependencies import (
     COOKIE_NAME,
     get_current_admin_user,
@@ -13,8 +16,14 @@ from app.core.dependencies import (
     get_current_user_optional,
 )
 from app.core.exceptions import UnauthorizedException
+from app.core.principal import AuthPrincipal, principal_cache
 from app.core.security import create_access_token
+from app.main import app
+from app.models.plan import Plan
+from app.models.recording import Recording
 from app.models.user import User
+from app.services import auth as auth_service
+from app.services import subscription as subscription_service
 
 
 def create_mock_request(token: str | None = None) -> MagicMock:
@@ -145,3 +154,195 @@ class TestGetCurrentAdminUser:
             await get_current_admin_user(regular_user)
 
         assert exc_info.value.code == "FORBIDDEN"
+
+
+class TestAuthPrincipalLoading:
+    """Query-count regression tests for the auth principal loading mode."""
+
+    @pytest.fixture
+    async def user_with_history(self, db_session: AsyncSession) -> User:
+        """Create a user with a long recording history, then clear the identity map."""
+        user = User(
+            google_id="principal-google-id",
+            email="principal@example.com",
+            name="Heavy User",
+        )
+        db_session.add(user)
+        await db_session.flush()
+        db_session.add_all(
+            Recording(
+                user_id=user.id,
+                duration_seconds=300,
+                transcript_text="Transcription " * 200,
+                status="completed",
+            )
+            for _ in range(50)
+        )
+        await db_session.commit()
+        db_session.expunge_all()
+        return user
+
+    @pytest.mark.asyncio
+    async def test_principal_loaded_in_single_statement(
+        self,
+        db_session: AsyncSession,
+        user_with_history: User,
+        sql_statements: list[str],
+    ) -> None:
+        """Test that authenticating issues one query and never touches recordings."""
+        token = create_access_token(
+            user_id=user_with_history.id, email=user_with_history.email
+        )
+        request = create_mock_request(token=token)
+        sql_statements.clear()
+
+        user = await get_current_user(request, db_session)
+
+        assert user.id == user_with_history.id
+        assert len(sql_statements) == 1
+        assert "recordings" not in sql_statements[0]
+        assert "google_id" not in sql_statements[0]
+
+    @pytest.mark.asyncio
+    async def test_principal_is_detached_snapshot(
+        self, db_session: AsyncSession, user_with_history: User
+    ) -> None:
+        """Test that the principal carries no relationships to load lazily."""
+        token = create_access_token(
+            user_id=user_with_history.id, email=user_with_history.email
+        )
+        request = create_mock_request(token=token)
+
+        user = await get_current_user(request, db_session)
+
+        assert isinstance(user, AuthPrincipal)
+        assert not hasattr(user, "recordings")
+        assert user.has_subscription is False
+
+    @pytest.mark.asyncio
+    async def test_authenticated_request_statement_count(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        user_with_history: User,
+        sql_statements: list[str],
+    ) -> None:
+        """Test GET /auth/me cost is independent of the user's recording history."""
+
+        async def override_get_db():
+            yield db_session
+
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            token = create_access_token(
+                user_id=user_with_history.id, email=user_with_history.email
+            )
+            sql_statements.clear()
+
+            response = await client.get(
+                "/api/v1/auth/me", cookies={COOKIE_NAME: token}
+            )
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+
+        assert response.status_code == 200
+        assert response.json()["email"] == "principal@example.com"
+        # A single principal lookup (user + subscription status), nothing else
+        assert len(sql_statements) == 1
+        assert "FROM recordings" not in sql_statements[0]
+
+
+class TestPrincipalCache:
+    """Tests for the in-process authenticated principal cache."""
+
+    @pytest.fixture
+    async def test_user(self, db_session: AsyncSession) -> User:
+        """Create a persisted test user."""
+        user = User(
+            google_id="cache-google-id",
+            email="cache@example.com",
+            name="Cached User",
+        )
+        db_session.add(user)
+        await db_session.commit()
+        await db_session.refresh(user)
+        return user
+
+    @pytest.fixture
+    def override_db(self, db_session: AsyncSession):
+        """Route the app's get_db dependency to the test session."""
+
+        async def override_get_db():
+            yield db_session
+
+        app.dependency_overrides[get_db] = override_get_db
+        yield
+        app.dependency_overrides.pop(get_db, None)
+
+    @pytest.mark.asyncio
+    async def test_warm_request_skips_database(
+        self,
+        client: AsyncClient,
+        override_db: None,
+        test_user: User,
+        sql_statements: list[str],
+    ) -> None:
+        """Test that a second authenticated request is served from the cache."""
+        token = create_access_token(user_id=test_user.id, email=test_user.email)
+
+        await client.get("/api/v1/auth/me", cookies={COOKIE_NAME: token})
+        sql_statements.clear()
+        response = await client.get("/api/v1/auth/me", cookies={COOKIE_NAME: token})
+
+        assert response.status_code == 200
+        assert sql_statements == []
+        assert principal_cache.hits == 1
+        assert principal_cache.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_update_profile_invalidates(
+        self, db_session: AsyncSession, test_user: User
+    ) -> None:
+        """Test that updating the profile drops the cached principal."""
+        token = create_access_token(user_id=test_user.id, email=test_user.email)
+        await get_current_user(create_mock_request(token), db_session)
+
+        await auth_service.update_user_profile(db_session, test_user, name="Renamed")
+        user = await get_current_user(create_mock_request(token), db_session)
+
+        assert user.name == "Renamed"
+        assert principal_cache.misses == 2
+
+    @pytest.mark.asyncio
+    async def test_trial_activation_invalidates(
+        self, db_session: AsyncSession, test_user: User
+    ) -> None:
+        """Test that activating a subscription refreshes the principal's status."""
+        plan = Plan(name="starter", display_name="Starter", price_monthly=2900, quota_monthly=20)
+        db_session.add(plan)
+        await db_session.commit()
+        token = create_access_token(user_id=test_user.id, email=test_user.email)
+        before = await get_current_user(create_mock_request(token), db_session)
+
+        await subscription_service.create_trial_subscription(
+            db_session, test_user.id, plan.id
+        )
+        after = await get_current_user(create_mock_request(token), db_session)
+
+        assert before.has_subscription is False
+        assert after.has_subscription is True
+        assert after.subscription_status == "trial"
+        assert after.plan_id == plan.id
+
+    @pytest.mark.asyncio
+    async def test_logout_invalidates(
+        self, client: AsyncClient, db_session: AsyncSession, test_user: User
+    ) -> None:
+        """Test that logging out drops the cached principal."""
+        token = create_access_token(user_id=test_user.id, email=test_user.email)
+        await get_current_user(create_mock_request(token), db_session)
+        assert principal_cache.get(test_user.id) is not None
+
+        await client.post("/api/v1/auth/logout", cookies={COOKIE_NAME: token})
+
+        assert principal_cache.get(test_user.id) is None
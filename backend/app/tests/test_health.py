@@ -32,3 +32,19 @@ async def test_api_health_check(client: AsyncClient) -> None:
     assert data["status"] == "healthy"
     assert "version" in data
     assert "environment" in data
+    assert "hits" in data["caches"]["principal"]
+    assert "misses" in data["caches"]["principal"]
+
+
+@pytest.mark.asyncio
+async def test_api_health_reports_circuit_breakers(client: AsyncClient) -> None:
+    """
+    Test API health check exposes the provider circuit breaker states.
+
+    Args:
+        client: Async HTTP test client
+    """
+    response = await client.get("/api/v1/health")
+    breakers = response.json()["circuitBreakers"]
+    assert breakers["deepgram"]["state"] == "closed"
+    assert breakers["llm"]["state"] == "closed"
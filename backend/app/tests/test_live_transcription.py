@@ -0,0 +1,352 @@
+"""Tests for live transcription over WebSocket, against a local fake Deepgram server."""
+
+import asyncio
+import json
+import uuid
+from collections.abc import AsyncGenerator, AsyncIterator
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from websockets.asyncio.server import ServerConnection, serve
+
+from app.config import get_settings
+from app.core.database import get_db
+from app.core.security import create_access_token
+from app.main import app
+from app.models.plan import Plan
+from app.models.recording import Recording
+from app.models.subscription import Subscription, SubscriptionStatus
+from app.models.user import User
+from app.routers.auth import COOKIE_NAME
+from app.schemas.recording import RecordingStatus
+from app.services.deepgram import DeepgramTranscriptionError
+from app.services.deepgram_live import TranscriptSegment, transcribe_live
+
+settings = get_settings()
+
+
+class FakeDeepgramLive:
+    """
+    Minimal Deepgram live endpoint.
+
+    Sends an interim then a final result for every audio frame (the frame
+    bytes are the "spoken" text) and Metadata with the duration on CloseStream.
+    """
+
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.frames: list[bytes] = []
+        self.path: str | None = None
+        self.authorization: str | None = None
+
+    async def handler(self, ws: ServerConnection) -> None:
+        self.path = ws.request.path
+        self.authorization = ws.request.headers.get("Authorization")
+        async for message in ws:
+            if isinstance(message, bytes):
+                if self.fail:
+                    await ws.close(code=1011, reason="NET-0001")
+                    return
+                self.frames.append(message)
+                text = message.decode()
+                for is_final in (False, True):
+                    await ws.send(json.dumps({
+                        "type": "Results",
+                        "is_final": is_final,
+                        "channel": {"alternatives": [{"transcript": text}]},
+                    }))
+            elif json.loads(message).get("type") == "CloseStream":
+                await ws.send(json.dumps({"type": "Metadata", "duration": 42.4}))
+                await ws.close()
+                return
+
+
+@pytest.fixture
+async def fake_deepgram() -> AsyncGenerator[FakeDeepgramLive, None]:
+    """Run a fake Deepgram live server and point the settings at it."""
+    fake = FakeDeepgramLive()
+    async with serve(fake.handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        settings = MagicMock()
+        settings.deepgram_api_key = "test-api-key"
+        settings.deepgram_model = "nova-3"
+        settings.deepgram_live_url = f"ws://127.0.0.1:{port}/v1/listen"
+        with patch("app.services.deepgram_live.get_settings", return_value=settings):
+            yield fake
+
+
+async def _frames(*frames: bytes) -> AsyncIterator[bytes]:
+    """Yield audio frames like a recording client."""
+    for frame in frames:
+        yield frame
+
+
+class TestTranscribeLive:
+    """Tests for the live transcription relay."""
+
+    @pytest.mark.asyncio
+    async def test_accumulates_final_segments(self, fake_deepgram: FakeDeepgramLive) -> None:
+        """Test that final segments form the transcript and all segments are relayed."""
+        segments: list[TranscriptSegment] = []
+
+        async def on_segment(segment: TranscriptSegment) -> None:
+            segments.append(segment)
+
+        result = await transcribe_live(
+            _frames(b"Douleur au genou.", b"Depuis deux semaines."),
+            on_segment=on_segment,
+            language="fr",
+        )
+
+        assert result.transcript == "Douleur au genou. Depuis deux semaines."
+        assert result.duration_seconds == 42.4
+        assert fake_deepgram.frames == [b"Douleur au genou.", b"Depuis deux semaines."]
+        assert [s.is_final for s in segments] == [False, True, False, True]
+        assert fake_deepgram.authorization == "Token test-api-key"
+        assert "language=fr" in fake_deepgram.path
+        assert "interim_results=true" in fake_deepgram.path
+
+    @pytest.mark.asyncio
+    async def test_server_error_raises(self, fake_deepgram: FakeDeepgramLive) -> None:
+        """Test that an abnormal close from Deepgram surfaces as a transcription error."""
+        fake_deepgram.fail = True
+
+        with patch("app.services.deepgram_live.sentry_sdk"):
+            with pytest.raises(DeepgramTranscriptionError):
+                await transcribe_live(_frames(b"audio"))
+
+    @pytest.mark.asyncio
+    async def test_unreachable_server_raises(self) -> None:
+        """Test that connection failures surface as a transcription error."""
+        settings = MagicMock()
+        settings.deepgram_api_key = "test-api-key"
+        settings.deepgram_model = "nova-3"
+        settings.deepgram_live_url = "ws://127.0.0.1:1/v1/listen"
+
+        with (
+            patch("app.services.deepgram_live.get_settings", return_value=settings),
+            patch("app.services.deepgram_live.sentry_sdk"),
+        ):
+            with pytest.raises(DeepgramTranscriptionError):
+                await transcribe_live(_frames(b"audio"))
+
+
+class TestLiveRecordingEndpoint:
+    """Tests for the /recordings/live WebSocket endpoint."""
+
+    @pytest.fixture
+    async def test_user(self, db_session: AsyncSession) -> User:
+        """Create a user with an active subscription."""
+        user = User(google_id=f"google_{uuid.uuid4().hex[:8]}", email="live@example.com")
+        plan = Plan(
+            name="live_plan",
+            display_name="Live Plan",
+            price_monthly=0,
+            quota_monthly=5,
+            max_recording_minutes=10,
+            max_notes_retention=10,
+        )
+        db_session.add_all([user, plan])
+        await db_session.flush()
+        now = datetime.now(timezone.utc)
+        db_session.add(
+            Subscription(
+                user_id=user.id,
+                plan_id=plan.id,
+                status=SubscriptionStatus.ACTIVE.value,
+                quota_remaining=5,
+                quota_total=5,
+                current_period_start=now,
+                current_period_end=now + timedelta(days=30),
+            )
+        )
+        await db_session.commit()
+        return user
+
+    @pytest.fixture
+    async def override_db(self, db_session: AsyncSession) -> AsyncGenerator[None, None]:
+        """Route the app's get_db dependency to the test session."""
+
+        async def override_get_db():
+            yield db_session
+
+        app.dependency_overrides[get_db] = override_get_db
+        yield
+        app.dependency_overrides.pop(get_db, None)
+
+    async def _run(
+        self,
+        token: str | None,
+        client_messages: list[dict[str, Any]],
+        origin: str | None = settings.frontend_url,
+    ) -> list[dict[str, Any]]:
+        """Drive the ASGI app through one WebSocket session, return the ASGI messages sent."""
+        inbound: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        inbound.put_nowait({"type": "websocket.connect"})
+        for message in client_messages:
+            inbound.put_nowait(message)
+        sent: list[dict[str, Any]] = []
+
+        async def send(message: dict[str, Any]) -> None:
+            sent.append(message)
+
+        headers = [(b"host", b"test")]
+        if origin:
+            headers.append((b"origin", origin.encode()))
+        if token:
+            headers.append((b"cookie", f"{COOKIE_NAME}={token}".encode()))
+        scope = {
+            "type": "websocket",
+            "asgi": {"version": "3.0"},
+            "scheme": "ws",
+            "path": "/api/v1/recordings/live",
+            "raw_path": b"/api/v1/recordings/live",
+            "root_path": "",
+            "query_string": b"",
+            "headers": headers,
+            "client": ("127.0.0.1", 50000),
+            "server": ("test", 80),
+            "subprotocols": [],
+            "state": {},
+        }
+        await asyncio.wait_for(app(scope, inbound.get, send), timeout=5)
+        return sent
+
+    async def _session(
+        self, token: str | None, client_messages: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Drive an accepted WebSocket session, return sent JSON messages."""
+        sent = await self._run(token, client_messages)
+
+        assert sent[0]["type"] == "websocket.accept"
+        assert sent[-1]["type"] == "websocket.close"
+        return [json.loads(m["text"]) for m in sent if m["type"] == "websocket.send"]
+
+    @pytest.mark.asyncio
+    async def test_transcript_stored_when_recording_stops(
+        self,
+        db_session: AsyncSession,
+        override_db: None,
+        test_user: User,
+        fake_deepgram: FakeDeepgramLive,
+    ) -> None:
+        """Test segments are streamed back and the final transcript is stored."""
+        token = create_access_token(user_id=test_user.id, email=test_user.email)
+
+        messages = await self._session(
+            token,
+            [
+                {"type": "websocket.receive", "bytes": b"Douleur lombaire."},
+                {"type": "websocket.receive", "bytes": b"Irradiation jambe gauche."},
+                {"type": "websocket.receive", "text": json.dumps({"type": "stop"})},
+            ],
+        )
+
+        transcripts = [m for m in messages if m["type"] == "transcript"]
+        assert [m["isFinal"] for m in transcripts] == [False, True, False, True]
+        completed = messages[-1]
+        assert completed["type"] == "completed"
+        assert completed["recording"]["status"] == RecordingStatus.COMPLETED.value
+        assert completed["recording"]["transcriptText"] == (
+            "Douleur lombaire. Irradiation jambe gauche."
+        )
+        assert completed["recording"]["durationSeconds"] == 42
+
+        quota = await db_session.scalar(
+            select(Subscription.quota_remaining).where(
+                Subscription.user_id == test_user.id
+            )
+        )
+        assert quota == 4
+
+    @pytest.mark.asyncio
+    async def test_unauthenticated_connection_is_rejected(
+        self, override_db: None, fake_deepgram: FakeDeepgramLive
+    ) -> None:
+        """Test that a connection without a session cookie is closed with an error."""
+        messages = await self._session(None, [])
+
+        assert messages == [
+            {
+                "type": "error",
+                "error": {
+                    "code": "UNAUTHORIZED",
+                    "message": "Not authenticated",
+                    "details": None,
+                },
+            }
+        ]
+        assert fake_deepgram.frames == []
+
+    @pytest.mark.asyncio
+    async def test_deepgram_failure_marks_recording_failed(
+        self,
+        db_session: AsyncSession,
+        override_db: None,
+        test_user: User,
+        fake_deepgram: FakeDeepgramLive,
+    ) -> None:
+        """Test that a failed live session fails the recording without consuming quota."""
+        fake_deepgram.fail = True
+        token = create_access_token(user_id=test_user.id, email=test_user.email)
+
+        with patch("app.services.deepgram_live.sentry_sdk"):
+            messages = await self._session(
+                token, [{"type": "websocket.receive", "bytes": b"audio"}]
+            )
+
+        assert messages[-1]["type"] == "error"
+        assert messages[-1]["error"]["code"] == "TRANSCRIPTION_FAILED"
+        statuses = await db_session.scalars(
+            select(Recording.status).where(Recording.user_id == test_user.id)
+        )
+        assert list(statuses) == [RecordingStatus.FAILED.value]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("origin", ["https://evil.example.com", None])
+    async def test_foreign_origin_is_rejected(
+        self,
+        db_session: AsyncSession,
+        override_db: None,
+        test_user: User,
+        fake_deepgram: FakeDeepgramLive,
+        origin: str | None,
+    ) -> None:
+        """Test that a cross-site handshake is refused even with a valid cookie."""
+        token = create_access_token(user_id=test_user.id, email=test_user.email)
+
+        sent = await self._run(
+            token, [{"type": "websocket.receive", "bytes": b"audio"}], origin=origin
+        )
+
+        assert [m["type"] for m in sent] == ["websocket.close"]
+        assert sent[0]["code"] == 1008
+        assert await db_session.scalar(select(Recording.id)) is None
+        assert fake_deepgram.frames == []
+
+    @pytest.mark.asyncio
+    async def test_unexpected_text_messages_are_ignored(
+        self,
+        override_db: None,
+        test_user: User,
+        fake_deepgram: FakeDeepgramLive,
+    ) -> None:
+        """Test that malformed or non-object JSON messages do not end the session."""
+        token = create_access_token(user_id=test_user.id, email=test_user.email)
+
+        messages = await self._session(
+            token,
+            [
+                {"type": "websocket.receive", "text": "[1, 2]"},
+                {"type": "websocket.receive", "text": "not json"},
+                {"type": "websocket.receive", "bytes": b"Douleur lombaire."},
+                {"type": "websocket.receive", "text": json.dumps({"type": "stop"})},
+            ],
+        )
+
+        assert messages[-1]["type"] == "completed"
+        assert messages[-1]["recording"]["transcriptText"] == "Douleur lombaire."
@@ -0,0 +1,195 @@
+"""Tests for hedged and failover LLM requests (LLMRouter)."""
+
+import asyncio
+from collections.abc import AsyncIterator
+from unittest.mock import patch
+
+import pytest
+from pydantic import ValidationError
+
+from app.config import Settings
+from app.services.llm import factory
+from app.services.llm.base import BaseLLMClient, SOAPNoteOutput
+from app.services.llm.factory import get_llm_client
+from app.services.llm.router import LLMRouter
+
+
+def _note(source: str) -> SOAPNoteOutput:
+    """Build a SOAP note tagged with the client that produced it."""
+    return SOAPNoteOutput(subjective=source, objective="O", assessment="A", plan="P")
+
+
+class FakeClient(BaseLLMClient):
+    """LLM client answering after a fixed delay, or failing."""
+
+    def __init__(self, name: str, delay: float = 0.0, error: BaseException | None = None):
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.cancelled = False
+
+    async def extract_soap_note(
+        self, transcript, template, language, note_format="paragraph", verbosity="medium"
+    ) -> SOAPNoteOutput:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        return _note(self.name)
+
+    async def stream_soap_note(
+        self, transcript, template, language, note_format="paragraph", verbosity="medium"
+    ) -> AsyncIterator[str]:
+        self.calls += 1
+        if self.error:
+            raise self.error
+        yield _note(self.name).model_dump_json()
+
+
+def _router(*clients: FakeClient, hedge_delay: float = 0.05) -> LLMRouter:
+    """Route between the given clients with a short hedge delay."""
+    return LLMRouter(
+        [(client.name, client) for client in clients],
+        min_hedge_delay_seconds=hedge_delay,
+    )
+
+
+class TestLLMRouter:
+    """Tests for hedging, failover and client ranking."""
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self) -> None:
+        """A primary answering before the hedge delay is the only call."""
+        primary, secondary = FakeClient("primary"), FakeClient("secondary")
+
+        result = await _router(primary, secondary).extract_soap_note("t", "tpl", "fr")
+
+        assert result.subjective == "primary"
+        assert secondary.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged_and_cancelled(self) -> None:
+        """A slow primary triggers the secondary; the loser is cancelled."""
+        primary = FakeClient("primary", delay=5)
+        secondary = FakeClient("secondary", delay=0.01)
+
+        result = await asyncio.wait_for(
+            _router(primary, secondary).extract_soap_note("t", "tpl", "fr"), timeout=2
+        )
+        await asyncio.sleep(0)
+
+        assert result.subjective == "secondary"
+        assert primary.cancelled
+
+    @pytest.mark.asyncio
+    async def test_failure_fails_over_immediately(self) -> None:
+        """An error sends the request to the next client without waiting."""
+        primary = FakeClient("primary", error=RuntimeError("503"))
+        secondary = FakeClient("secondary")
+        router = _router(primary, secondary, hedge_delay=60)
+
+        result = await asyncio.wait_for(
+            router.extract_soap_note("t", "tpl", "fr"), timeout=2
+        )
+
+        assert result.subjective == "secondary"
+        assert router.stats()["primary"]["errorRatio"] == 1.0
+        assert router.stats()["secondary"]["calls"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_call_fails_over(self) -> None:
+        """A client call cancelled on its own side is skipped, not raised."""
+        primary = FakeClient("primary", error=asyncio.CancelledError())
+        secondary = FakeClient("secondary")
+
+        result = await asyncio.wait_for(
+            _router(primary, secondary, hedge_delay=60).extract_soap_note("t", "tpl", "fr"),
+            timeout=2,
+        )
+
+        assert result.subjective == "secondary"
+
+    @pytest.mark.asyncio
+    async def test_all_failures_raise_last_error(self) -> None:
+        """The last error is raised when every client fails."""
+        router = _router(
+            FakeClient("primary", error=RuntimeError("first")),
+            FakeClient("secondary", error=ValueError("second")),
+        )
+
+        with pytest.raises(ValueError, match="second"):
+            await router.extract_soap_note("t", "tpl", "fr")
+
+    @pytest.mark.asyncio
+    async def test_unhealthy_primary_is_tried_last(self) -> None:
+        """A mostly failing client moves behind the healthy ones."""
+        primary = FakeClient("primary", error=RuntimeError("503"))
+        secondary = FakeClient("secondary")
+        router = _router(primary, secondary)
+
+        await router.extract_soap_note("t", "tpl", "fr")
+        await router.extract_soap_note("t", "tpl", "fr")
+
+        assert [routed.name for routed in router.ranked()] == ["secondary", "primary"]
+        assert primary.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_stream_fails_over_before_output(self) -> None:
+        """A stream failing before any output is retried on the next client."""
+        router = _router(
+            FakeClient("primary", error=RuntimeError("503")), FakeClient("secondary")
+        )
+
+        deltas = [delta async for delta in router.stream_soap_note("t", "tpl", "fr")]
+
+        assert SOAPNoteOutput.model_validate_json("".join(deltas)).subjective == "secondary"
+
+
+class TestRouterFactory:
+    """Tests for building the router from settings."""
+
+    @pytest.fixture(autouse=True)
+    def reset_registry(self):
+        """Start every test with an empty client registry."""
+        factory._clients.clear()
+        factory._http_client = None
+        yield
+        factory._clients.clear()
+        factory._http_client = None
+
+    @patch("app.services.llm.factory.get_settings")
+    @patch("app.services.llm.mistral.get_settings")
+    @patch("app.services.llm.mistral.Mistral")
+    def test_fallback_provider_builds_router(
+        self, mock_mistral_cls, mock_mistral_settings, mock_settings
+    ) -> None:
+        """A configured fallback wraps both clients in an LLMRouter."""
+        mock_mistral_settings.return_value.mistral_api_key = "test-key"
+        settings = mock_settings.return_value
+        settings.llm_provider = "mistral"
+        settings.llm_fallback_provider = "mistral"
+        settings.llm_fallback_model = "mistral-small-latest"
+        settings.llm_hedge_percentile = 0.95
+        settings.llm_hedge_min_delay_seconds = 10.0
+        settings.llm_timeout_seconds = 60
+        settings.llm_max_connections = 32
+        settings.llm_max_keepalive_connections = 10
+
+        client = get_llm_client()
+
+        assert isinstance(client, LLMRouter)
+        assert [routed.name for routed in client.ranked()] == [
+            "mistral:mistral-large-2",
+            "mistral:mistral-small-latest",
+        ]
+        assert get_llm_client() is client
+
+    def test_unsupported_fallback_provider_is_rejected(self) -> None:
+        """A fallback that cannot extract SOAP notes fails settings validation."""
+        with pytest.raises(ValidationError, match="llm_fallback_provider"):
+            Settings(llm_fallback_provider="azure_openai")
@@ -6,9 +6,12 @@ Tests cover:
 - AzureOpenAILLMClient placeholder behavior
 - Factory function with provider selection
 - Prompt building and template loading functions
+- Incremental parsing of streamed SOAP JSON
+- Encrypted LLM result cache
 """
 
 import json
+import os
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -16,14 +19,26 @@ import pytest
 
 from app.services.llm.base import BaseLLMClient, SOAPNoteOutput
 from app.services.llm.azure_openai import AzureOpenAILLMClient
-from app.services.llm.factory import get_llm_client
+from app.services.llm import factory
+from app.services.llm.factory import close_llm_clients, get_llm_client
+from app.services.llm.map_reduce import (
+    estimate_tokens,
+    merge_soap_notes,
+    split_transcript,
+)
 from app.services.llm.mistral import MistralLLMClient
 from app.services.llm.prompts.soap_extraction import (
+    FORMAT_INSTRUCTIONS,
+    VERBOSITY_INSTRUCTIONS,
+    build_soap_messages,
     build_soap_system_prompt,
-    build_soap_user_prompt,
+    compile_soap_prompt,
     load_soap_template,
     validate_soap_json_structure,
 )
+from app.services.llm.prompts.templates import TemplateRegistry
+from app.services.llm.result_cache import LLMResultCache
+from app.services.llm.streaming import SOAPStreamParser
 
 
 # ─── SOAPNoteOutput Model Tests ───────────────────────────────────────────────
@@ -107,28 +122,47 @@ class TestBuildSoapSystemPrompt:
         assert "it" in prompt
 
 
-class TestBuildSoapUserPrompt:
-    """Tests for the user prompt builder."""
+class TestBuildSoapMessages:
+    """Tests for the compiled prompt and message layout."""
+
+    def setup_method(self):
+        """Start every test with an empty compiled prompt cache."""
+        compile_soap_prompt.cache_clear()
 
-    def test_includes_transcript_and_template(self):
-        """User prompt should include transcript and template."""
-        prompt = build_soap_user_prompt(
+    def test_transcript_only_in_last_message(self):
+        """The static prompt comes first; only the user message has the transcript."""
+        messages = build_soap_messages(
             transcript="Le patient dit avoir mal au genou",
             template="## Subjective\n## Objective",
             language="fr",
         )
-        assert "Le patient dit avoir mal au genou" in prompt
-        assert "## Subjective" in prompt
 
-    def test_includes_json_instruction(self):
-        """User prompt should instruct JSON-only response."""
-        prompt = build_soap_user_prompt("transcript", "template", "fr")
-        assert "JSON" in prompt
+        assert [m["role"] for m in messages] == ["system", "user"]
+        assert "## Subjective" in messages[0]["content"]
+        assert "JSON" in messages[0]["content"]
+        assert "Le patient dit avoir mal au genou" not in messages[0]["content"]
+        assert "Le patient dit avoir mal au genou" in messages[1]["content"]
 
-    def test_includes_language_in_prompt(self):
-        """User prompt should mention the target language."""
-        prompt = build_soap_user_prompt("transcript", "template", "de")
-        assert "allemand" in prompt or "deutsch" in prompt
+    def test_static_prefix_shared_across_transcripts(self):
+        """Different transcripts should reuse the same compiled system prompt."""
+        first = build_soap_messages("transcript A", "template", "de", "bullets", "concise")
+        second = build_soap_messages("transcript B", "template", "de", "bullets", "concise")
+
+        assert first[0]["content"] is second[0]["content"]
+        assert "allemand" in first[0]["content"] or "deutsch" in first[0]["content"]
+        assert compile_soap_prompt.cache_info().hits == 1
+
+    def test_format_and_verbosity_change_instructions(self):
+        """Format and verbosity preferences should be reflected in the prompt."""
+        paragraph = compile_soap_prompt("fr", "paragraph", "medium", "template")
+        bullets = compile_soap_prompt("fr", "bullets", "medium", "template")
+        concise = compile_soap_prompt("fr", "paragraph", "concise", "template")
+
+        assert FORMAT_INSTRUCTIONS["paragraph"] in paragraph
+        assert FORMAT_INSTRUCTIONS["bullets"] in bullets
+        assert VERBOSITY_INSTRUCTIONS["medium"] in paragraph
+        assert VERBOSITY_INSTRUCTIONS["concise"] in concise
+        assert len({paragraph, bullets, concise}) == 3
 
 
 class TestValidateSoapJsonStructure:
@@ -193,6 +227,74 @@ class TestLoadSoapTemplate:
             load_soap_template(tmp_path)
 
 
+class TestTemplateRegistry:
+    """Tests for the in-memory SOAP template registry."""
+
+    @staticmethod
+    def _write(path: Path, content: str, mtime_ns: int) -> None:
+        """Write a template with a fixed modification time."""
+        path.write_text(content)
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    def test_loads_named_templates_from_directory(self, tmp_path):
+        """Templates should be registered under their file name prefix."""
+        (tmp_path / "physiotherapy-note-template.md").write_text("## Physio")
+        (tmp_path / "osteopathy-note-template.md").write_text("## Osteo")
+        (tmp_path / "README.md").write_text("not a template")
+
+        registry = TemplateRegistry(tmp_path)
+
+        assert registry.get() == "## Physio"
+        assert registry.get("osteopathy") == "## Osteo"
+        assert registry.names() == ["osteopathy", "physiotherapy"]
+
+    def test_served_from_memory_between_checks(self, tmp_path):
+        """Changes should not be read before the check interval elapses."""
+        path = tmp_path / "physiotherapy-note-template.md"
+        self._write(path, "v1", 1_000_000_000)
+        registry = TemplateRegistry(tmp_path, check_interval_seconds=3600)
+        registry.load()
+
+        self._write(path, "v2", 2_000_000_000)
+
+        with patch.object(Path, "read_text", side_effect=AssertionError("disk read")):
+            assert registry.get() == "v1"
+
+    def test_reloads_when_file_changes(self, tmp_path):
+        """A new modification time should reload the template."""
+        path = tmp_path / "physiotherapy-note-template.md"
+        self._write(path, "v1", 1_000_000_000)
+        registry = TemplateRegistry(tmp_path, check_interval_seconds=0)
+        assert registry.get() == "v1"
+
+        self._write(path, "v2", 2_000_000_000)
+
+        assert registry.get() == "v2"
+
+    def test_keeps_last_version_if_file_removed(self, tmp_path):
+        """A deleted file should not break note generation."""
+        path = tmp_path / "physiotherapy-note-template.md"
+        path.write_text("v1")
+        registry = TemplateRegistry(tmp_path, check_interval_seconds=0)
+        registry.load()
+
+        path.unlink()
+
+        assert registry.get() == "v1"
+
+    def test_register_and_unknown_name(self, tmp_path):
+        """Extra templates can be registered; unknown names raise."""
+        custom = tmp_path / "custom.md"
+        custom.write_text("## Custom")
+        registry = TemplateRegistry(tmp_path / "missing")
+
+        registry.register("user-42", custom)
+
+        assert registry.get("user-42") == "## Custom"
+        with pytest.raises(FileNotFoundError, match="SOAP template not found"):
+            registry.get("dermatology")
+
+
 # ─── MistralLLMClient Tests ───────────────────────────────────────────────────
 
 
@@ -298,6 +400,193 @@ class TestMistralLLMClient:
         assert call_kwargs["temperature"] == 0.3
         assert call_kwargs["response_format"] == {"type": "json_object"}
 
+    @pytest.mark.asyncio
+    @patch("app.services.llm.mistral.get_settings")
+    @patch("app.services.llm.mistral.Mistral")
+    async def test_stream_soap_note_yields_deltas(self, mock_mistral_cls, mock_settings):
+        """stream_soap_note should yield the content deltas of the Mistral stream."""
+        mock_settings.return_value.mistral_api_key = "test-key"
+
+        def event(content):
+            return MagicMock(
+                data=MagicMock(choices=[MagicMock(delta=MagicMock(content=content))])
+            )
+
+        stream = MagicMock()
+        stream.__aenter__ = AsyncMock(return_value=stream)
+        stream.__aexit__ = AsyncMock(return_value=None)
+        stream.__aiter__.return_value = [event('{"subj'), event(None), event('ective": "x"}')]
+        mock_client_instance = MagicMock()
+        mock_client_instance.chat.stream_async = AsyncMock(return_value=stream)
+        mock_mistral_cls.return_value = mock_client_instance
+
+        client = MistralLLMClient()
+        deltas = [
+            delta
+            async for delta in client.stream_soap_note("Le patient a mal", "## T", "fr")
+        ]
+
+        assert deltas == ['{"subj', 'ective": "x"}']
+        call_kwargs = mock_client_instance.chat.stream_async.call_args[1]
+        assert call_kwargs["response_format"] == {"type": "json_object"}
+
+
+# ─── SOAPStreamParser Tests ───────────────────────────────────────────────────
+
+
+class TestSOAPStreamParser:
+    """Tests for incremental parsing of streamed SOAP JSON."""
+
+    NOTE = {
+        "subjective": "Douleur \"aiguë\" au genou\nDepuis 3 jours",
+        "objective": "Flexion à 90°",
+        "assessment": "Entorse",
+        "plan": "Repos",
+    }
+
+    def test_fields_emitted_when_complete(self):
+        """Each field should be returned by the delta containing its closing quote."""
+        parser = SOAPStreamParser()
+
+        assert parser.feed('{"subjective": "Douleur') == []
+        assert parser.feed(' au genou", "obj') == [("subjective", "Douleur au genou")]
+        assert parser.feed('ective": "Flexion"}') == [("objective", "Flexion")]
+        assert parser.text == '{"subjective": "Douleur au genou", "objective": "Flexion"}'
+
+    def test_any_chunking_gives_same_fields(self):
+        """Escapes and unicode must decode correctly however the text is split."""
+        text = json.dumps(self.NOTE, ensure_ascii=False)
+        raw = json.dumps(self.NOTE)
+
+        for source in (text, raw):
+            for size in (1, 2, 7):
+                parser = SOAPStreamParser()
+                fields = []
+                for i in range(0, len(source), size):
+                    fields.extend(parser.feed(source[i : i + size]))
+                assert dict(fields) == json.loads(source)
+                assert parser.text == source
+
+    def test_non_string_values_are_skipped(self):
+        """Nested and scalar values should be skipped without losing later fields."""
+        parser = SOAPStreamParser()
+
+        fields = parser.feed(
+            '{"meta": {"a": ["}", "\\\\"], "b": 1}, "n": 3, "subjective": "S", "plan": "P"}'
+        )
+
+        assert fields == [("subjective", "S"), ("plan", "P")]
+
+
+# ─── LLMResultCache Tests ─────────────────────────────────────────────────────
+
+
+class TestSplitTranscript:
+    """Tests for splitting long transcripts into overlapping chunks."""
+
+    def test_short_transcript_is_one_chunk(self) -> None:
+        """A transcript smaller than a chunk is kept whole."""
+        assert split_transcript("Bonjour. Ça va ?", 100, 10) == ["Bonjour. Ça va ?"]
+
+    def test_chunks_overlap_on_whole_sentences(self) -> None:
+        """Chunks stay under the target size and repeat the previous tail."""
+        sentences = [f"Phrase numéro {i} du patient." for i in range(40)]
+        transcript = " ".join(sentences)
+
+        chunks = split_transcript(transcript, chunk_tokens=50, overlap_tokens=10)
+
+        assert len(chunks) > 1
+        for chunk in chunks:
+            assert estimate_tokens(chunk) <= 50 + len(sentences[0])
+        for previous, chunk in zip(chunks, chunks[1:]):
+            last_sentence = previous.rsplit(". ", 1)[-1]
+            assert chunk.startswith(last_sentence)
+        # Every sentence is kept, in order
+        assert all(sentence in " ".join(chunks) for sentence in sentences)
+
+
+class TestMergeSoapNotes:
+    """Tests for merging partial SOAP notes."""
+
+    def test_repeated_statements_and_placeholders_are_dropped(self) -> None:
+        """Overlap duplicates appear once and placeholders yield to content."""
+        first = SOAPNoteOutput(
+            subjective="Douleur au genou droit. Depuis 2 semaines.",
+            objective="Non documenté",
+            assessment="Tendinopathie rotulienne.",
+            plan="À compléter",
+        )
+        second = SOAPNoteOutput(
+            subjective="Depuis 2 semaines. Pire en descendant les escaliers.",
+            objective="Flexion limitée à 90°.",
+            assessment="Tendinopathie rotulienne !",
+            plan="À compléter.",
+        )
+
+        merged = merge_soap_notes([first, second])
+
+        assert merged.subjective == (
+            "Douleur au genou droit. Depuis 2 semaines.\n\n"
+            "Pire en descendant les escaliers."
+        )
+        assert merged.objective == "Flexion limitée à 90°."
+        assert merged.assessment == "Tendinopathie rotulienne."
+        assert merged.plan == "À compléter"
+
+    def test_bullets_are_merged_line_by_line(self) -> None:
+        """Bullet notes are merged as one list without duplicate items."""
+        first = SOAPNoteOutput(subjective="- A\n- B", objective="- O", assessment="- X", plan="- P")
+        second = SOAPNoteOutput(subjective="- B\n- C", objective="- O", assessment="- Y", plan="- P")
+
+        merged = merge_soap_notes([first, second], note_format="bullets")
+
+        assert merged.subjective == "- A\n- B\n- C"
+        assert merged.assessment == "- X\n- Y"
+
+
+class TestLLMResultCache:
+    """Tests for the encrypted, content-addressed LLM result cache."""
+
+    NOTE = SOAPNoteOutput(
+        subjective="Douleur genou droit",
+        objective="Flexion limitée",
+        assessment="Entorse",
+        plan="Repos",
+    )
+
+    def test_key_covers_every_input(self):
+        """Changing any extraction input should change the key."""
+        base = ("transcript", "template", "fr", "paragraph", "medium", "model")
+        keys = {LLMResultCache.make_key(*base)}
+        for i in range(len(base)):
+            changed = list(base)
+            changed[i] = changed[i] + "-changed"
+            keys.add(LLMResultCache.make_key(*changed))
+
+        assert len(keys) == len(base) + 1
+        assert "transcript" not in LLMResultCache.make_key(*base)
+
+    def test_round_trip_stores_ciphertext(self):
+        """Notes should be returned intact but stored encrypted."""
+        cache = LLMResultCache(max_size=10, ttl_seconds=60)
+        key = LLMResultCache.make_key("t", "tpl", "fr", "paragraph", "medium", "m")
+
+        cache.set(key, self.NOTE)
+
+        assert cache.get(key) == self.NOTE
+        assert cache.stats()["hits"] == 1
+        assert b"genou" not in cache._entries.get(key)
+
+    def test_undecryptable_entry_is_dropped(self):
+        """An entry encrypted with another key should be treated as a miss."""
+        cache = LLMResultCache(max_size=10, ttl_seconds=60)
+        other = LLMResultCache(max_size=10, ttl_seconds=60)
+        other.set("key", self.NOTE)
+        cache._entries.set("key", other._entries.get("key"))
+
+        assert cache.get("key") is None
+        assert len(cache._entries) == 0
+
 
 # ─── AzureOpenAILLMClient Tests ───────────────────────────────────────────────
 
@@ -328,6 +617,24 @@ class TestAzureOpenAILLMClient:
 class TestGetLLMClient:
     """Tests for the LLM client factory function."""
 
+    @pytest.fixture(autouse=True)
+    def reset_registry(self):
+        """Start every test with an empty client registry."""
+        factory._clients.clear()
+        factory._http_client = None
+        yield
+        factory._clients.clear()
+        factory._http_client = None
+
+    @staticmethod
+    def _settings(mock_settings, provider: str) -> None:
+        """Configure the factory settings mock."""
+        mock_settings.return_value.llm_provider = provider
+        mock_settings.return_value.llm_fallback_provider = ""
+        mock_settings.return_value.llm_timeout_seconds = 60
+        mock_settings.return_value.llm_max_connections = 32
+        mock_settings.return_value.llm_max_keepalive_connections = 10
+
     @patch("app.services.llm.factory.get_settings")
     @patch("app.services.llm.mistral.get_settings")
     @patch("app.services.llm.mistral.Mistral")
@@ -335,7 +642,7 @@ class TestGetLLMClient:
         self, mock_mistral_cls, mock_mistral_settings, mock_factory_settings
     ):
         """Factory should return MistralLLMClient when provider is 'mistral'."""
-        mock_factory_settings.return_value.llm_provider = "mistral"
+        self._settings(mock_factory_settings, "mistral")
         mock_mistral_settings.return_value.mistral_api_key = "test-key"
 
         client = get_llm_client()
@@ -345,7 +652,7 @@ class TestGetLLMClient:
     @patch("app.services.llm.factory.get_settings")
     def test_returns_azure_openai(self, mock_settings):
         """Factory should return AzureOpenAILLMClient when configured."""
-        mock_settings.return_value.llm_provider = "azure_openai"
+        self._settings(mock_settings, "azure_openai")
 
         client = get_llm_client()
 
@@ -354,7 +661,32 @@ class TestGetLLMClient:
     @patch("app.services.llm.factory.get_settings")
     def test_raises_for_unknown_provider(self, mock_settings):
         """Factory should raise ValueError for unsupported providers."""
-        mock_settings.return_value.llm_provider = "unsupported_provider"
+        self._settings(mock_settings, "unsupported_provider")
 
         with pytest.raises(ValueError, match="Unsupported LLM provider"):
             get_llm_client()
+
+    @pytest.mark.asyncio
+    @patch("app.services.llm.factory.get_settings")
+    @patch("app.services.llm.mistral.get_settings")
+    @patch("app.services.llm.mistral.Mistral")
+    async def test_reuses_client_and_connection_pool(
+        self, mock_mistral_cls, mock_mistral_settings, mock_factory_settings
+    ):
+        """Factory should build the client once, on a shared pool closed at shutdown."""
+        self._settings(mock_factory_settings, "mistral")
+        mock_mistral_settings.return_value.mistral_api_key = "test-key"
+
+        first = get_llm_client()
+        second = get_llm_client()
+
+        assert first is second
+        mock_mistral_cls.assert_called_once()
+        http_client = mock_mistral_cls.call_args.kwargs["async_client"]
+        assert http_client is factory._http_client
+
+        await close_llm_clients()
+
+        assert http_client.is_closed
+        assert factory._clients == {}
+        assert get_llm_client() is not first
@@ -2,22 +2,31 @@
 
 Tests cover:
 - POST /api/v1/soap-notes - SOAP note generation
+- POST /api/v1/soap-notes/stream - streamed SOAP note generation (SSE)
 - Authentication requirements
 - Recording ownership validation
 - Missing transcript handling
 - Error handling for LLM failures
 """
 
+import json
 import uuid
+from collections.abc import AsyncIterator
 from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from sqlalchemy.ext.asyncio import AsyncSession
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.core.database import get_db, get_session_maker
+from app.core.security import create_access_token
+from app.main import app
 from app.models.note import Note
 from app.models.recording import Recording
 from app.models.user import User
+from app.routers.auth import COOKIE_NAME
 from app.services.llm.base import SOAPNoteOutput
 from app.services.soap_extraction import SOAPExtractionError
 
@@ -82,7 +91,7 @@ class TestCreateNoteEndpoint:
 
     @pytest.mark.asyncio
     @patch("app.services.soap_extraction.get_llm_client")
-    @patch("app.services.soap_extraction.load_soap_template")
+    @patch("app.services.soap_extraction.get_soap_template")
     async def test_successful_note_creation(
         self,
         mock_load_template,
@@ -202,7 +211,7 @@ class TestCreateNoteEndpoint:
 
     @pytest.mark.asyncio
     @patch("app.services.soap_extraction.get_llm_client")
-    @patch("app.services.soap_extraction.load_soap_template")
+    @patch("app.services.soap_extraction.get_soap_template")
     async def test_llm_failure_returns_500(
         self,
         mock_load_template,
@@ -233,3 +242,178 @@ class TestCreateNoteEndpoint:
                 current_user=test_user,
                 db=db_session,
             )
+
+
+def _streaming_client(*deltas: str) -> MagicMock:
+    """Mock LLM client whose stream_soap_note yields the given deltas."""
+
+    async def stream(*args, **kwargs) -> AsyncIterator[str]:
+        for delta in deltas:
+            yield delta
+
+    client = MagicMock()
+    client.stream_soap_note = stream
+    return client
+
+
+async def _read_events(response) -> list[tuple[str, dict]]:
+    """Consume an SSE StreamingResponse into (event, data) pairs."""
+    body = "".join([chunk async for chunk in response.body_iterator])
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestStreamNoteEndpoint:
+    """Tests for POST /api/v1/soap-notes/stream."""
+
+    @pytest.mark.asyncio
+    @patch("app.services.soap_extraction.get_llm_client")
+    @patch("app.services.soap_extraction.get_soap_template")
+    async def test_streams_sections_then_note(
+        self,
+        mock_load_template,
+        mock_get_client,
+        db_session: AsyncSession,
+        test_user: User,
+        test_recording: Recording,
+    ):
+        """Should emit one event per section, then the persisted note."""
+        mock_load_template.return_value = "## Template"
+        mock_get_client.return_value = _streaming_client(
+            json.dumps(MOCK_SOAP_OUTPUT.model_dump())[:40],
+            json.dumps(MOCK_SOAP_OUTPUT.model_dump())[40:],
+        )
+
+        from app.routers.notes import stream_note
+        from app.schemas.note import NoteCreate
+
+        response = await stream_note(
+            data=NoteCreate(recordingId=test_recording.id, language="fr"),
+            current_user=test_user,
+            db=db_session,
+            session_maker=async_sessionmaker(db_session.bind, expire_on_commit=False),
+        )
+        events = await _read_events(response)
+
+        assert response.media_type == "text/event-stream"
+        assert events[:4] == [
+            ("subjective", {"content": MOCK_SOAP_OUTPUT.subjective}),
+            ("objective", {"content": MOCK_SOAP_OUTPUT.objective}),
+            ("assessment", {"content": MOCK_SOAP_OUTPUT.assessment}),
+            ("plan", {"content": MOCK_SOAP_OUTPUT.plan}),
+        ]
+        event, note = events[4]
+        assert event == "note"
+        assert note["recordingId"] == str(test_recording.id)
+        assert await db_session.get(Note, uuid.UUID(note["id"])) is not None
+
+    @pytest.mark.asyncio
+    @patch("app.services.soap_extraction.sentry_sdk")
+    @patch("app.routers.notes.sentry_sdk")
+    @patch("app.services.soap_extraction.get_llm_client")
+    @patch("app.services.soap_extraction.get_soap_template")
+    async def test_invalid_note_emits_error_event(
+        self,
+        mock_load_template,
+        mock_get_client,
+        mock_router_sentry,
+        mock_service_sentry,
+        db_session: AsyncSession,
+        test_user: User,
+        test_recording: Recording,
+    ):
+        """Should send an error event, after already-streamed sections, if validation fails."""
+        mock_load_template.return_value = "## Template"
+        mock_get_client.return_value = _streaming_client('{"subjective": "S"}')
+
+        from app.routers.notes import stream_note
+        from app.schemas.note import NoteCreate
+
+        response = await stream_note(
+            data=NoteCreate(recordingId=test_recording.id, language="fr"),
+            current_user=test_user,
+            db=db_session,
+            session_maker=async_sessionmaker(db_session.bind, expire_on_commit=False),
+        )
+        events = await _read_events(response)
+
+        assert [event for event, _ in events] == ["subjective", "error"]
+        error = events[1][1]["error"]
+        assert error["code"] == "INTERNAL_ERROR"
+        assert error["details"]["recordingId"] == str(test_recording.id)
+
+    @pytest.mark.asyncio
+    async def test_recording_not_found_before_streaming(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+    ):
+        """Should raise 404 before any event is streamed."""
+        from app.core.exceptions import NotFoundException
+        from app.routers.notes import stream_note
+        from app.schemas.note import NoteCreate
+
+        with pytest.raises(NotFoundException):
+            await stream_note(
+                data=NoteCreate(recordingId=uuid.uuid4(), language="fr"),
+                current_user=test_user,
+                db=db_session,
+                session_maker=async_sessionmaker(db_session.bind, expire_on_commit=False),
+            )
+
+    @pytest.mark.asyncio
+    @patch("app.services.soap_extraction.get_llm_client")
+    @patch("app.services.soap_extraction.get_soap_template")
+    async def test_stream_outlives_request_session(
+        self,
+        mock_load_template,
+        mock_get_client,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        test_user: User,
+        test_recording: Recording,
+    ):
+        """Should save the streamed note after get_db committed and closed its session."""
+        mock_load_template.return_value = "## Template"
+        mock_get_client.return_value = _streaming_client(
+            json.dumps(MOCK_SOAP_OUTPUT.model_dump())
+        )
+        await db_session.commit()
+        session_maker = async_sessionmaker(db_session.bind, expire_on_commit=False)
+
+        async def override_get_db():
+            async with session_maker() as session:
+                try:
+                    yield session
+                    await session.commit()
+                except Exception:
+                    await session.rollback()
+                    raise
+                finally:
+                    await session.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_session_maker] = lambda: session_maker
+        try:
+            response = await client.post(
+                "/api/v1/soap-notes/stream",
+                json={"recordingId": str(test_recording.id), "language": "fr"},
+                cookies={
+                    COOKIE_NAME: create_access_token(
+                        user_id=test_user.id, email=test_user.email
+                    )
+                },
+            )
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            app.dependency_overrides.pop(get_session_maker, None)
+
+        assert response.status_code == 200
+        assert "event: note" in response.text
+        note_id = await db_session.scalar(
+            select(Note.id).where(Note.recording_id == test_recording.id)
+        )
+        assert note_id is not None
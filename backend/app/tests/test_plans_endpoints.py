@@ -1,10 +1,18 @@
 """Tests for plans API endpoints."""
 
+from unittest.mock import AsyncMock, patch
+
 import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.plan import Plan
+from app.services.plan_catalog import plan_catalog
+
+
+@pytest.fixture(autouse=True)
+def _test_db(db_session: AsyncSession) -> None:
+    """Create the test database, which the plan catalog loads from."""
 
 
 @pytest.fixture
@@ -155,3 +163,87 @@ async def test_get_plans_empty_database(client: AsyncClient) -> None:
     assert response.status_code == 200
     plans = response.json()
     assert plans == []
+
+
+@pytest.mark.asyncio
+async def test_get_plans_served_from_memory(
+    client: AsyncClient, seed_plans: list[Plan], sql_statements: list[str]
+) -> None:
+    """Test plans are loaded once, then served without database queries."""
+    await client.get("/api/v1/plans")
+    sql_statements.clear()
+
+    response = await client.get("/api/v1/plans")
+    await client.get(f"/api/v1/plans/{seed_plans[0].id}")
+
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    assert sql_statements == []
+    assert plan_catalog.loads == 1
+
+
+@pytest.mark.asyncio
+async def test_get_plans_conditional_request(
+    client: AsyncClient, seed_plans: list[Plan]
+) -> None:
+    """Test a matching If-None-Match gets a 304 without body."""
+    response = await client.get("/api/v1/plans")
+    etag = response.headers["etag"]
+
+    not_modified = await client.get("/api/v1/plans", headers={"If-None-Match": etag})
+    modified = await client.get("/api/v1/plans", headers={"If-None-Match": '"stale"'})
+
+    assert etag.startswith('"')
+    assert response.headers["cache-control"].startswith("public, max-age=")
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+    assert modified.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_get_plan_by_id_conditional_request(
+    client: AsyncClient, seed_plans: list[Plan]
+) -> None:
+    """Test each plan has its own ETag."""
+    starter = await client.get(f"/api/v1/plans/{seed_plans[0].id}")
+    pro = await client.get(f"/api/v1/plans/{seed_plans[1].id}")
+
+    not_modified = await client.get(
+        f"/api/v1/plans/{seed_plans[0].id}",
+        headers={"If-None-Match": starter.headers["etag"]},
+    )
+
+    assert starter.headers["etag"] != pro.headers["etag"]
+    assert not_modified.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_plan_change_reloads_catalog(
+    client: AsyncClient, db_session: AsyncSession, seed_plans: list[Plan]
+) -> None:
+    """Test a committed plan change is served with a new ETag."""
+    before = await client.get("/api/v1/plans")
+
+    seed_plans[0].price_monthly = 3900
+    await db_session.commit()
+    after = await client.get("/api/v1/plans")
+
+    assert after.headers["etag"] != before.headers["etag"]
+    assert [plan["priceMonthly"] for plan in after.json()] == [3900, 4900]
+    assert plan_catalog.loads == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_warm_up_loads_on_demand(
+    client: AsyncClient, seed_plans: list[Plan]
+) -> None:
+    """Test an unreachable database at startup does not stop plans from loading later."""
+    with patch.object(plan_catalog, "load", AsyncMock(side_effect=OSError("db down"))):
+        await plan_catalog.warm_up()
+
+    response = await client.get("/api/v1/plans")
+
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    assert plan_catalog.loads == 1
@@ -0,0 +1,333 @@
+"""Tests for POST /api/v1/recordings/with-note (transcribe-then-extract pipeline)."""
+
+import io
+import json
+import uuid
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import AsyncClient, Response
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.database import get_db, get_session_maker
+from app.core.security import create_access_token
+from app.main import app
+from app.models.note import Note
+from app.models.plan import Plan
+from app.models.recording import Recording
+from app.models.subscription import Subscription, SubscriptionStatus
+from app.models.user import User
+from app.routers.auth import COOKIE_NAME
+from app.services.deepgram import DeepgramTranscriptionError, TranscriptionResult
+from app.services.llm.base import SOAPNoteOutput
+
+MOCK_SOAP_OUTPUT = SOAPNoteOutput(
+    subjective="Le patient rapporte une douleur au genou droit",
+    objective="Flexion limitée à 90°, gonflement visible",
+    assessment="Syndrome fémoro-patellaire aigu",
+    plan="Glace 3x/jour, exercices de renforcement",
+)
+
+MOCK_TRANSCRIPTION = TranscriptionResult(
+    transcript="Le patient rapporte une douleur au genou droit depuis 3 jours.",
+    language_detected="fr",
+    duration_seconds=60.0,
+    latency_ms=800.0,
+)
+
+
+@pytest.fixture
+async def test_user(db_session: AsyncSession) -> User:
+    """Create a user with an active subscription."""
+    user = User(google_id=f"google_{uuid.uuid4().hex[:8]}", email="pipeline@example.com")
+    plan = Plan(
+        name="pipeline_plan",
+        display_name="Pipeline Plan",
+        price_monthly=0,
+        quota_monthly=5,
+        max_recording_minutes=10,
+        max_notes_retention=10,
+    )
+    db_session.add_all([user, plan])
+    await db_session.flush()
+    now = datetime.now(timezone.utc)
+    db_session.add(
+        Subscription(
+            user_id=user.id,
+            plan_id=plan.id,
+            status=SubscriptionStatus.ACTIVE.value,
+            quota_remaining=5,
+            quota_total=5,
+            current_period_start=now,
+            current_period_end=now + timedelta(days=30),
+        )
+    )
+    await db_session.commit()
+    return user
+
+
+@pytest.fixture
+def session_maker(db_session: AsyncSession) -> async_sessionmaker[AsyncSession]:
+    """Session factory bound to the test database."""
+    return async_sessionmaker(db_session.bind, expire_on_commit=False)
+
+
+@pytest.fixture
+async def override_db(
+    db_session: AsyncSession, session_maker: async_sessionmaker[AsyncSession]
+) -> AsyncGenerator[None, None]:
+    """Route the app's database dependencies to the test database."""
+
+    async def override_get_db():
+        yield db_session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_maker] = lambda: session_maker
+    yield
+    app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_session_maker, None)
+
+
+@pytest.fixture
+async def override_db_lifecycle(
+    session_maker: async_sessionmaker[AsyncSession],
+) -> AsyncGenerator[None, None]:
+    """Like override_db, with get_db's commit and close after the handler."""
+
+    async def override_get_db():
+        async with session_maker() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+            finally:
+                await session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_maker] = lambda: session_maker
+    yield
+    app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_session_maker, None)
+
+
+@pytest.fixture
+def llm_client() -> MagicMock:
+    """Mock LLM client returning a fixed SOAP note."""
+    client = MagicMock()
+    client.extract_soap_note = AsyncMock(return_value=MOCK_SOAP_OUTPUT)
+    with (
+        patch("app.services.soap_extraction.get_llm_client", return_value=client),
+        patch("app.services.soap_extraction.get_soap_template", return_value="## Template"),
+    ):
+        yield client
+
+
+async def _post(client: AsyncClient, user: User, stream: bool = False) -> Response:
+    """Upload audio to the pipeline endpoint."""
+    headers = {"Accept": "text/event-stream"} if stream else {}
+    return await client.post(
+        "/api/v1/recordings/with-note",
+        files={"audio": ("test.webm", io.BytesIO(b"audio"), "audio/webm")},
+        data={"duration": "60", "note_language": "fr", "note_format": "bullets"},
+        headers=headers,
+        cookies={COOKIE_NAME: create_access_token(user_id=user.id, email=user.email)},
+    )
+
+
+def _events(body: str) -> list[tuple[str, dict]]:
+    """Parse an SSE body into (event, data) pairs."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestRecordingWithNote:
+    """Tests for the combined transcription and SOAP extraction endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_returns_recording_and_note(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        override_db: None,
+        test_user: User,
+        llm_client: MagicMock,
+    ) -> None:
+        """Test that one request returns both the transcript and the SOAP note."""
+        with patch(
+            "app.routers.recordings.transcribe_audio",
+            AsyncMock(return_value=MOCK_TRANSCRIPTION),
+        ):
+            response = await _post(client, test_user)
+
+        assert response.status_code == 201
+        body = response.json()
+        assert body["recording"]["status"] == "completed"
+        assert body["recording"]["transcriptText"] == MOCK_TRANSCRIPTION.transcript
+        assert body["note"]["recordingId"] == body["recording"]["id"]
+        assert body["note"]["subjective"] == MOCK_SOAP_OUTPUT.subjective
+        assert body["note"]["format"] == "bullets"
+        # The transcript is handed to the LLM directly
+        assert llm_client.extract_soap_note.await_args.args[0] == (
+            MOCK_TRANSCRIPTION.transcript
+        )
+
+    @pytest.mark.asyncio
+    async def test_streams_progress_events(
+        self,
+        client: AsyncClient,
+        override_db: None,
+        test_user: User,
+        llm_client: MagicMock,
+    ) -> None:
+        """Test the SSE mode emits each stage, then the transcript and the note."""
+        with patch(
+            "app.routers.recordings.transcribe_audio",
+            AsyncMock(return_value=MOCK_TRANSCRIPTION),
+        ):
+            response = await _post(client, test_user, stream=True)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = _events(response.text)
+        assert [name for name, _ in events] == [
+            "status",
+            "transcript",
+            "status",
+            "note",
+        ]
+        assert events[0][1]["stage"] == "transcribing"
+        assert events[1][1]["transcriptText"] == MOCK_TRANSCRIPTION.transcript
+        assert events[2][1]["stage"] == "extracting"
+        assert events[3][1]["plan"] == MOCK_SOAP_OUTPUT.plan
+
+    @pytest.mark.asyncio
+    async def test_extraction_failure_keeps_recording(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        override_db: None,
+        test_user: User,
+        llm_client: MagicMock,
+    ) -> None:
+        """Test an LLM failure returns the recording id so the note can be retried."""
+        llm_client.extract_soap_note.side_effect = RuntimeError("LLM down")
+
+        with (
+            patch(
+                "app.routers.recordings.transcribe_audio",
+                AsyncMock(return_value=MOCK_TRANSCRIPTION),
+            ),
+            patch("app.services.soap_extraction._extract_with_retry.retry.sleep", AsyncMock()),
+            patch("app.services.soap_extraction.sentry_sdk"),
+            patch("app.routers.recordings.sentry_sdk"),
+        ):
+            response = await _post(client, test_user)
+
+        assert response.status_code == 500
+        error = response.json()["error"]
+        assert error["code"] == "INTERNAL_ERROR"
+        assert "recordingId" in error["details"]
+        assert await db_session.scalar(select(Note.id)) is None
+
+    @pytest.mark.asyncio
+    async def test_streamed_transcription_failure_emits_error(
+        self,
+        client: AsyncClient,
+        override_db: None,
+        test_user: User,
+        llm_client: MagicMock,
+    ) -> None:
+        """Test that errors after the stream started are sent as an error event."""
+        with patch(
+            "app.routers.recordings.transcribe_audio",
+            AsyncMock(side_effect=DeepgramTranscriptionError("timeout")),
+        ):
+            response = await _post(client, test_user, stream=True)
+
+        events = _events(response.text)
+        assert [name for name, _ in events] == ["status", "error"]
+        assert events[1][1]["error"]["code"] == "TRANSCRIPTION_FAILED"
+        llm_client.extract_soap_note.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_stream_outlives_request_session(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        override_db_lifecycle: None,
+        test_user: User,
+        llm_client: MagicMock,
+    ) -> None:
+        """Test the SSE pipeline completes after get_db closed the request session."""
+        with patch(
+            "app.routers.recordings.transcribe_audio",
+            AsyncMock(return_value=MOCK_TRANSCRIPTION),
+        ):
+            response = await _post(client, test_user, stream=True)
+
+        events = _events(response.text)
+        assert [name for name, _ in events] == ["status", "transcript", "status", "note"]
+        recording = await db_session.scalar(select(Recording))
+        await db_session.refresh(recording)
+        assert recording.status == "completed"
+        assert await db_session.scalar(select(Note.id)) is not None
+
+    @pytest.mark.asyncio
+    async def test_streamed_failure_releases_quota_after_request_session(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        override_db_lifecycle: None,
+        test_user: User,
+        llm_client: MagicMock,
+    ) -> None:
+        """Test a streamed transcription failure fails the recording and frees its unit."""
+        with patch(
+            "app.routers.recordings.transcribe_audio",
+            AsyncMock(side_effect=DeepgramTranscriptionError("timeout")),
+        ):
+            response = await _post(client, test_user, stream=True)
+
+        assert [name for name, _ in _events(response.text)] == ["status", "error"]
+        recording = await db_session.scalar(select(Recording))
+        await db_session.refresh(recording)
+        assert recording.status == "failed"
+        subscription = await db_session.scalar(select(Subscription))
+        await db_session.refresh(subscription)
+        assert subscription.quota_remaining == 5
+
+    @pytest.mark.asyncio
+    async def test_stream_emits_error_when_recording_is_gone(
+        self,
+        client: AsyncClient,
+        override_db: None,
+        session_maker: async_sessionmaker[AsyncSession],
+        test_user: User,
+        llm_client: MagicMock,
+    ) -> None:
+        """Test a recording deleted before the stream started ends it with an error event."""
+
+        @asynccontextmanager
+        async def session_without_recordings() -> AsyncIterator[AsyncSession]:
+            async with session_maker() as session:
+                await session.execute(delete(Recording))
+                yield session
+
+        app.dependency_overrides[get_session_maker] = lambda: session_without_recordings
+        transcribe = AsyncMock(return_value=MOCK_TRANSCRIPTION)
+        with patch("app.routers.recordings.transcribe_audio", transcribe):
+            response = await _post(client, test_user, stream=True)
+
+        events = _events(response.text)
+        assert [name for name, _ in events] == ["error"]
+        assert events[0][1]["error"]["code"] == "NOT_FOUND"
+        transcribe.assert_not_awaited()
@@ -7,12 +7,17 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.database import get_db
+from app.core.security import create_access_token
+from app.main import app
 from app.models.plan import Plan
 from app.models.recording import Recording
 from app.models.subscription import Subscription, SubscriptionStatus
 from app.models.user import User
+from app.routers.auth import COOKIE_NAME
 from app.routers.recordings import (
     ALLOWED_AUDIO_TYPES,
     AudioTooLongException,
@@ -303,7 +308,8 @@ class TestRecordingModel:
         db_session.add(recording)
         await db_session.commit()
         await db_session.refresh(recording)
-        await db_session.refresh(test_user)
+        # Recordings history is never loaded implicitly; load it explicitly
+        await db_session.refresh(test_user, ["recordings"])
 
         # Verify relationship
         assert recording.user.id == test_user.id
@@ -333,6 +339,267 @@ class TestRecordingModel:
         assert recording.transcript_text == "Transcribed text"
 
 
+class TestConnectionRelease:
+    """Tests that POST /recordings holds no DB transaction during Deepgram calls."""
+
+    @pytest.fixture
+    async def test_user(self, db_session: AsyncSession) -> User:
+        """Create a user with an active subscription."""
+        user = User(google_id="release-google", email="release@example.com")
+        plan = Plan(
+            name="release_plan",
+            display_name="Release Plan",
+            price_monthly=0,
+            quota_monthly=5,
+            max_recording_minutes=10,
+            max_notes_retention=10,
+        )
+        db_session.add_all([user, plan])
+        await db_session.flush()
+        now = datetime.now(timezone.utc)
+        db_session.add(
+            Subscription(
+                user_id=user.id,
+                plan_id=plan.id,
+                status=SubscriptionStatus.ACTIVE.value,
+                quota_remaining=5,
+                quota_total=5,
+                current_period_start=now,
+                current_period_end=now + timedelta(days=30),
+            )
+        )
+        await db_session.commit()
+        return user
+
+    @pytest.mark.asyncio
+    async def test_transcription_runs_outside_transaction(
+        self, client: AsyncClient, db_session: AsyncSession, test_user: User
+    ) -> None:
+        """Test the connection is back in the pool while Deepgram transcribes."""
+        in_transaction_during_call: list[bool] = []
+
+        async def transcribe(audio_data: bytes, deadline=None) -> TranscriptionResult:
+            in_transaction_during_call.append(db_session.in_transaction())
+            return TranscriptionResult(
+                transcript="Transcribed text",
+                language_detected="fr",
+                duration_seconds=60.0,
+                latency_ms=100.0,
+            )
+
+        async def override_get_db():
+            yield db_session
+
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            with patch("app.routers.recordings.transcribe_audio", transcribe):
+                response = await client.post(
+                    "/api/v1/recordings",
+                    files={"audio": ("test.webm", io.BytesIO(b"audio"), "audio/webm")},
+                    data={"duration": "60"},
+                    cookies={
+                        COOKIE_NAME: create_access_token(
+                            user_id=test_user.id, email=test_user.email
+                        )
+                    },
+                )
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+
+        assert response.status_code == 201
+        assert response.json()["status"] == "completed"
+        assert in_transaction_during_call == [False]
+
+    @pytest.mark.asyncio
+    async def test_failed_transcription_releases_quota(
+        self, client: AsyncClient, db_session: AsyncSession, test_user: User
+    ) -> None:
+        """Test the unit reserved when transcription starts is given back on failure."""
+        reserved_during_call: list[int] = []
+
+        async def transcribe(audio_data: bytes, deadline=None) -> TranscriptionResult:
+            subscription = await db_session.scalar(
+                select(Subscription).where(Subscription.user_id == test_user.id)
+            )
+            reserved_during_call.append(subscription.quota_remaining)
+            raise DeepgramTranscriptionError("Deepgram down")
+
+        async def override_get_db():
+            yield db_session
+
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            with patch("app.routers.recordings.transcribe_audio", transcribe):
+                response = await client.post(
+                    "/api/v1/recordings",
+                    files={"audio": ("test.webm", io.BytesIO(b"audio"), "audio/webm")},
+                    data={"duration": "60"},
+                    cookies={
+                        COOKIE_NAME: create_access_token(
+                            user_id=test_user.id, email=test_user.email
+                        )
+                    },
+                )
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+
+        subscription = await db_session.scalar(
+            select(Subscription).where(Subscription.user_id == test_user.id)
+        )
+        assert response.status_code == 500
+        assert reserved_during_call == [4]
+        assert subscription.quota_remaining == 5
+
+
+class TestStreamingUpload:
+    """Tests for POST /recordings/stream (raw body forwarded to Deepgram)."""
+
+    @pytest.fixture
+    async def test_user(self, db_session: AsyncSession) -> User:
+        """Create a user with an active subscription."""
+        user = User(google_id="stream-google", email="stream@example.com")
+        plan = Plan(
+            name="stream_plan",
+            display_name="Stream Plan",
+            price_monthly=0,
+            quota_monthly=5,
+            max_recording_minutes=10,
+            max_notes_retention=10,
+        )
+        db_session.add_all([user, plan])
+        await db_session.flush()
+        now = datetime.now(timezone.utc)
+        db_session.add(
+            Subscription(
+                user_id=user.id,
+                plan_id=plan.id,
+                status=SubscriptionStatus.ACTIVE.value,
+                quota_remaining=5,
+                quota_total=5,
+                current_period_start=now,
+                current_period_end=now + timedelta(days=30),
+            )
+        )
+        await db_session.commit()
+        return user
+
+    @pytest.fixture
+    async def override_db(self, db_session: AsyncSession):
+        """Route the app's get_db dependency to the test session."""
+
+        async def override_get_db():
+            yield db_session
+
+        app.dependency_overrides[get_db] = override_get_db
+        yield
+        app.dependency_overrides.pop(get_db, None)
+
+    @pytest.mark.asyncio
+    async def test_body_is_streamed_to_deepgram(
+        self, client: AsyncClient, override_db: None, test_user: User
+    ) -> None:
+        """Test that the body reaches Deepgram as chunks, never as one buffer."""
+        received: list[bytes] = []
+
+        async def transcribe_stream(chunks, deadline=None) -> TranscriptionResult:
+            async for chunk in chunks:
+                received.append(chunk)
+            return TranscriptionResult(
+                transcript="Streamed text",
+                language_detected="de",
+                duration_seconds=60.0,
+                latency_ms=100.0,
+            )
+
+        async def body():
+            for _ in range(4):
+                yield b"x" * 1024
+
+        with patch("app.routers.recordings.transcribe_audio_stream", transcribe_stream):
+            response = await client.post(
+                "/api/v1/recordings/stream",
+                params={"duration": 60},
+                content=body(),
+                headers={"Content-Type": "audio/webm;codecs=opus"},
+                cookies={
+                    COOKIE_NAME: create_access_token(
+                        user_id=test_user.id, email=test_user.email
+                    )
+                },
+            )
+
+        assert response.status_code == 201
+        assert response.json()["transcriptText"] == "Streamed text"
+        assert response.json()["languageDetected"] == "de"
+        assert b"".join(received) == b"x" * 4096
+
+    @pytest.mark.asyncio
+    async def test_rejects_non_audio_body(
+        self, client: AsyncClient, override_db: None, test_user: User
+    ) -> None:
+        """Test that the body's content type is validated before streaming."""
+        response = await client.post(
+            "/api/v1/recordings/stream",
+            params={"duration": 60},
+            content=b"not audio",
+            headers={"Content-Type": "text/plain"},
+            cookies={
+                COOKIE_NAME: create_access_token(
+                    user_id=test_user.id, email=test_user.email
+                )
+            },
+        )
+
+        assert response.status_code == 415
+
+    @pytest.mark.asyncio
+    async def test_rejects_recording_longer_than_plan_before_body(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        override_db: None,
+        test_user: User,
+        sql_statements: list[str],
+    ) -> None:
+        """Test the plan's limit is checked from cache, before the body is read."""
+        cookies = {
+            COOKIE_NAME: create_access_token(user_id=test_user.id, email=test_user.email)
+        }
+        plan = await db_session.scalar(select(Plan).where(Plan.name == "stream_plan"))
+        plan.max_recording_minutes = 5
+        await db_session.commit()
+        # Warm the principal and plan caches
+        await client.post(
+            "/api/v1/recordings/stream",
+            params={"duration": 301},
+            content=b"",
+            headers={"Content-Type": "audio/webm"},
+            cookies=cookies,
+        )
+        sql_statements.clear()
+        body_read = False
+
+        async def body():
+            nonlocal body_read
+            body_read = True
+            yield b"x" * 1024
+
+        with patch("app.routers.recordings.transcribe_audio_stream") as transcribe:
+            response = await client.post(
+                "/api/v1/recordings/stream",
+                params={"duration": 301},
+                content=body(),
+                headers={"Content-Type": "audio/webm"},
+                cookies=cookies,
+            )
+
+        assert response.status_code == 413
+        assert response.json()["error"]["details"] == {"duration": 301, "maxDuration": 300}
+        assert not body_read
+        assert sql_statements == []
+        transcribe.assert_not_called()
+
+
 class TestTranscriptionIntegration:
     """Tests for transcription integration with Deepgram."""
 
@@ -2,16 +2,20 @@
 
 import uuid
 from datetime import timedelta
+from unittest.mock import patch
 
 import pytest
 from freezegun import freeze_time
 
+from app.core import security
 from app.core.security import (
     InvalidTokenError,
     TokenExpiredError,
     create_access_token,
+    forget_token,
     get_token_payload,
     get_user_id_from_token,
+    verified_token_cache,
     verify_token,
 )
 
@@ -118,6 +122,65 @@ class TestVerifyToken:
             verify_token(tampered_token)
 
 
+class TestVerifiedTokenCache:
+    """Tests for the verified-token cache used by verify_token."""
+
+    def test_repeated_verification_skips_decode(self) -> None:
+        """Test that a token is only decoded once while it is cached."""
+        token = create_access_token(user_id=uuid.uuid4(), email="test@example.com")
+
+        with patch.object(security.jwt, "decode", wraps=security.jwt.decode) as decode:
+            first = verify_token(token)
+            second = verify_token(token)
+
+        assert decode.call_count == 1
+        assert first == second
+        assert verified_token_cache.hits == 1
+
+    def test_cached_payload_is_not_shared(self) -> None:
+        """Test that callers cannot mutate the cached payload."""
+        token = create_access_token(user_id=uuid.uuid4(), email="test@example.com")
+
+        verify_token(token)["sub"] = "mutated"
+
+        assert verify_token(token)["sub"] != "mutated"
+
+    @freeze_time("2026-01-22 12:00:00")
+    def test_cached_token_still_expires(self) -> None:
+        """Test that a cached token is rejected once its exp has passed."""
+        token = create_access_token(
+            user_id=uuid.uuid4(),
+            email="test@example.com",
+            expires_delta=timedelta(seconds=30),
+        )
+        verify_token(token)
+
+        with freeze_time("2026-01-22 12:01:00"):
+            with pytest.raises(TokenExpiredError):
+                verify_token(token)
+
+    def test_invalid_tokens_not_cached(self) -> None:
+        """Test that failed verifications are never cached."""
+        token = create_access_token(user_id=uuid.uuid4(), email="test@example.com")
+        parts = token.split(".")
+        tampered_token = parts[0] + ".tampered." + parts[2]
+
+        for _ in range(2):
+            with pytest.raises(InvalidTokenError):
+                verify_token(tampered_token)
+
+        assert len(verified_token_cache) == 0
+
+    def test_forget_token(self) -> None:
+        """Test that a forgotten token is decoded again on next use."""
+        token = create_access_token(user_id=uuid.uuid4(), email="test@example.com")
+        verify_token(token)
+
+        forget_token(token)
+
+        assert len(verified_token_cache) == 0
+
+
 class TestGetUserIdFromToken:
     """Tests for get_user_id_from_token function."""
 
@@ -65,7 +65,7 @@ class TestFullExtractionFlow:
 
     @pytest.mark.asyncio
     @patch("app.services.soap_extraction.get_llm_client")
-    @patch("app.services.soap_extraction.load_soap_template")
+    @patch("app.services.soap_extraction.get_soap_template")
     async def test_french_transcript_to_soap_note(
         self, mock_load_template, mock_get_client
     ):
@@ -95,7 +95,7 @@ class TestTemplateStructuredOutput:
 
     @pytest.mark.asyncio
     @patch("app.services.soap_extraction.get_llm_client")
-    @patch("app.services.soap_extraction.load_soap_template")
+    @patch("app.services.soap_extraction.get_soap_template")
     async def test_output_has_four_sections(
         self, mock_load_template, mock_get_client
     ):
@@ -125,7 +125,7 @@ class TestPerformance:
 
     @pytest.mark.asyncio
     @patch("app.services.soap_extraction.get_llm_client")
-    @patch("app.services.soap_extraction.load_soap_template")
+    @patch("app.services.soap_extraction.get_soap_template")
     async def test_extraction_completes_within_timeout(
         self, mock_load_template, mock_get_client
     ):
@@ -155,7 +155,7 @@ class TestMultilingual:
 
     @pytest.mark.asyncio
     @patch("app.services.soap_extraction.get_llm_client")
-    @patch("app.services.soap_extraction.load_soap_template")
+    @patch("app.services.soap_extraction.get_soap_template")
     async def test_french_transcript_french_output(
         self, mock_load_template, mock_get_client
     ):
@@ -177,7 +177,7 @@ class TestMultilingual:
 
     @pytest.mark.asyncio
     @patch("app.services.soap_extraction.get_llm_client")
-    @patch("app.services.soap_extraction.load_soap_template")
+    @patch("app.services.soap_extraction.get_soap_template")
     async def test_german_transcript_german_output(
         self, mock_load_template, mock_get_client
     ):
@@ -198,7 +198,7 @@ class TestMultilingual:
 
     @pytest.mark.asyncio
     @patch("app.services.soap_extraction.get_llm_client")
-    @patch("app.services.soap_extraction.load_soap_template")
+    @patch("app.services.soap_extraction.get_soap_template")
     async def test_english_transcript_french_output(
         self, mock_load_template, mock_get_client
     ):
@@ -227,7 +227,7 @@ class TestErrorHandling:
     @pytest.mark.asyncio
     @patch("app.services.soap_extraction.sentry_sdk")
     @patch("app.services.soap_extraction.get_llm_client")
-    @patch("app.services.soap_extraction.load_soap_template")
+    @patch("app.services.soap_extraction.get_soap_template")
     async def test_api_timeout_logged_to_sentry(
         self, mock_load_template, mock_get_client, mock_sentry
     ):
@@ -250,7 +250,7 @@ class TestErrorHandling:
     @pytest.mark.asyncio
     @patch("app.services.soap_extraction.sentry_sdk")
     @patch("app.services.soap_extraction.get_llm_client")
-    @patch("app.services.soap_extraction.load_soap_template")
+    @patch("app.services.soap_extraction.get_soap_template")
     async def test_api_failure_raises_extraction_error(
         self, mock_load_template, mock_get_client, mock_sentry
     ):
@@ -270,7 +270,7 @@ class TestErrorHandling:
 
     @pytest.mark.asyncio
     @patch("app.services.soap_extraction.get_llm_client")
-    @patch("app.services.soap_extraction.load_soap_template")
+    @patch("app.services.soap_extraction.get_soap_template")
     async def test_transcript_preserved_on_failure(
         self, mock_load_template, mock_get_client, db_session: AsyncSession
     ):
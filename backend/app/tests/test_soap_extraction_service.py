@@ -2,13 +2,17 @@
 
 Tests cover:
 - extract_soap_note with mock LLM client
+- extract_soap_note_streaming section callbacks and validation
+- Map-reduce extraction of long transcripts
 - create_note_from_transcript with database persistence
 - Retry logic on failure
 - Latency logging
 - Error handling with SOAPExtractionError
 """
 
+import asyncio
 import uuid
+from collections.abc import AsyncIterator
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -22,9 +26,9 @@ from app.services.soap_extraction import (
     SOAPExtractionError,
     create_note_from_transcript,
     extract_soap_note,
+    extract_soap_note_streaming,
 )
 
-
 MOCK_SOAP_OUTPUT = SOAPNoteOutput(
     subjective="Le patient rapporte une douleur au genou droit",
     objective="Flexion limitée à 90°, gonflement visible",
@@ -41,7 +45,7 @@ class TestExtractSoapNote:
 
     @pytest.mark.asyncio
     @patch("app.services.soap_extraction.get_llm_client")
-    @patch("app.services.soap_extraction.load_soap_template")
+    @patch("app.services.soap_extraction.get_soap_template")
     async def test_successful_extraction(self, mock_load_template, mock_get_client):
         """Should return SOAPNoteOutput on successful extraction."""
         mock_load_template.return_value = "## Template"
@@ -77,10 +81,45 @@ class TestExtractSoapNote:
         assert call_args[0][1] == "Custom template"
         assert call_args[0][2] == "de"
 
+    @pytest.mark.asyncio
+    @patch("app.services.soap_extraction.get_llm_client")
+    async def test_passes_format_and_verbosity(self, mock_get_client):
+        """Should forward the note format and verbosity preferences to the LLM."""
+        mock_client = MagicMock()
+        mock_client.extract_soap_note = AsyncMock(return_value=MOCK_SOAP_OUTPUT)
+        mock_get_client.return_value = mock_client
+
+        await extract_soap_note(
+            transcript="Transcript text",
+            user_language="fr",
+            template="Custom template",
+            note_format="bullets",
+            verbosity="concise",
+        )
+
+        call_kwargs = mock_client.extract_soap_note.call_args.kwargs
+        assert call_kwargs == {"note_format": "bullets", "verbosity": "concise"}
+
+    @pytest.mark.asyncio
+    @patch("app.services.soap_extraction.get_llm_client")
+    async def test_identical_extraction_served_from_cache(self, mock_get_client):
+        """Should not call the LLM again for identical inputs."""
+        mock_client = MagicMock()
+        mock_client.model = "mistral-large-2"
+        mock_client.extract_soap_note = AsyncMock(return_value=MOCK_SOAP_OUTPUT)
+        mock_get_client.return_value = mock_client
+
+        first = await extract_soap_note("Transcript", "fr", template="## T")
+        second = await extract_soap_note("Transcript", "fr", template="## T")
+        await extract_soap_note("Transcript", "fr", template="## T", verbosity="concise")
+
+        assert first == second == MOCK_SOAP_OUTPUT
+        assert mock_client.extract_soap_note.await_count == 2
+
     @pytest.mark.asyncio
     @patch("app.services.soap_extraction.sentry_sdk")
     @patch("app.services.soap_extraction.get_llm_client")
-    @patch("app.services.soap_extraction.load_soap_template")
+    @patch("app.services.soap_extraction.get_soap_template")
     async def test_raises_extraction_error_on_failure(
         self, mock_load_template, mock_get_client, mock_sentry
     ):
@@ -101,6 +140,142 @@ class TestExtractSoapNote:
         mock_sentry.capture_exception.assert_called_once()
 
 
+# ─── extract_soap_note_streaming Tests ────────────────────────────────────────
+
+
+def _streaming_client(*deltas: str) -> MagicMock:
+    """Mock LLM client whose stream_soap_note yields the given deltas."""
+
+    async def stream(*args, **kwargs) -> AsyncIterator[str]:
+        for delta in deltas:
+            yield delta
+
+    client = MagicMock()
+    client.stream_soap_note = stream
+    return client
+
+
+class TestExtractSoapNoteStreaming:
+    """Tests for the extract_soap_note_streaming function."""
+
+    @pytest.mark.asyncio
+    @patch("app.services.soap_extraction.get_llm_client")
+    async def test_reports_sections_as_they_complete(self, mock_get_client):
+        """Should call on_section for each SOAP section, before the stream ends."""
+        mock_get_client.return_value = _streaming_client(
+            '{"subjective": "S", "obj',
+            'ective": "O", "assessment": "A"',
+            ', "plan": "P"}',
+        )
+        sections: list[tuple[str, str]] = []
+
+        async def on_section(name: str, content: str) -> None:
+            sections.append((name, content))
+
+        result = await extract_soap_note_streaming(
+            transcript="Transcript",
+            user_language="fr",
+            on_section=on_section,
+            template="## Template",
+        )
+
+        assert sections == [
+            ("subjective", "S"),
+            ("objective", "O"),
+            ("assessment", "A"),
+            ("plan", "P"),
+        ]
+        assert result == SOAPNoteOutput(
+            subjective="S", objective="O", assessment="A", plan="P"
+        )
+
+    @pytest.mark.asyncio
+    @patch("app.services.soap_extraction.sentry_sdk")
+    @patch("app.services.soap_extraction.get_llm_client")
+    async def test_incomplete_note_raises_extraction_error(
+        self, mock_get_client, mock_sentry
+    ):
+        """Should validate the complete note and raise if sections are missing."""
+        mock_get_client.return_value = _streaming_client('{"subjective": "S"}')
+
+        with pytest.raises(SOAPExtractionError, match="Invalid SOAP response"):
+            await extract_soap_note_streaming(
+                transcript="Transcript",
+                user_language="fr",
+                on_section=AsyncMock(),
+                template="## Template",
+            )
+
+        mock_sentry.capture_exception.assert_called_once()
+
+
+class TestMapReduceExtraction:
+    """Tests for the map-reduce extraction of long transcripts."""
+
+    @pytest.fixture
+    def mock_settings(self):
+        """Use map-reduce above ~50 tokens, with 2 chunks at a time."""
+        settings = MagicMock()
+        settings.llm_map_reduce_threshold_tokens = 50
+        settings.llm_map_reduce_chunk_tokens = 40
+        settings.llm_map_reduce_overlap_tokens = 5
+        settings.llm_map_reduce_parallelism = 2
+        with patch("app.services.soap_extraction.get_settings", return_value=settings):
+            yield settings
+
+    @pytest.mark.asyncio
+    @patch("app.services.soap_extraction.get_llm_client")
+    async def test_long_transcript_is_extracted_by_chunks(
+        self, mock_get_client, mock_settings
+    ):
+        """Should extract each chunk concurrently and merge the partial notes."""
+        in_flight = 0
+        max_in_flight = 0
+
+        async def extract(transcript, template, language, **kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            first_sentence = transcript.split(".")[0]
+            return SOAPNoteOutput(
+                subjective=f"{first_sentence}.",
+                objective="Non documenté",
+                assessment="Lombalgie commune.",
+                plan="Exercices.",
+            )
+
+        mock_client = MagicMock()
+        mock_client.extract_soap_note = AsyncMock(side_effect=extract)
+        mock_get_client.return_value = mock_client
+        transcript = " ".join(f"Le patient décrit le point {i}." for i in range(30))
+
+        result = await extract_soap_note(transcript, "fr", template="## T")
+
+        calls = mock_client.extract_soap_note.await_count
+        assert calls > 2
+        assert max_in_flight == 2
+        assert result.subjective.startswith("Le patient décrit le point 0.")
+        assert len(result.subjective.split("\n\n")) == calls
+        assert result.objective == "Non documenté"
+        assert result.assessment == "Lombalgie commune."
+
+    @pytest.mark.asyncio
+    @patch("app.services.soap_extraction.get_llm_client")
+    async def test_short_transcript_is_extracted_at_once(
+        self, mock_get_client, mock_settings
+    ):
+        """Should keep a single call below the threshold."""
+        mock_client = MagicMock()
+        mock_client.extract_soap_note = AsyncMock(return_value=MOCK_SOAP_OUTPUT)
+        mock_get_client.return_value = mock_client
+
+        await extract_soap_note("Le patient a mal au dos.", "fr", template="## T")
+
+        mock_client.extract_soap_note.assert_awaited_once()
+
+
 # ─── create_note_from_transcript Tests ────────────────────────────────────────
 
 
@@ -109,7 +284,7 @@ class TestCreateNoteFromTranscript:
 
     @pytest.mark.asyncio
     @patch("app.services.soap_extraction.get_llm_client")
-    @patch("app.services.soap_extraction.load_soap_template")
+    @patch("app.services.soap_extraction.get_soap_template")
     async def test_creates_note_in_database(
         self, mock_load_template, mock_get_client, db_session: AsyncSession
     ):
@@ -163,7 +338,7 @@ class TestCreateNoteFromTranscript:
 
     @pytest.mark.asyncio
     @patch("app.services.soap_extraction.get_llm_client")
-    @patch("app.services.soap_extraction.load_soap_template")
+    @patch("app.services.soap_extraction.get_soap_template")
     async def test_creates_note_with_german_language(
         self, mock_load_template, mock_get_client, db_session: AsyncSession
     ):
@@ -203,3 +378,48 @@ class TestCreateNoteFromTranscript:
         # Verify LLM was called with German
         call_args = mock_client.extract_soap_note.call_args
         assert call_args[0][2] == "de"
+
+    @pytest.mark.asyncio
+    @patch("app.services.soap_extraction.get_llm_client")
+    @patch("app.services.soap_extraction.get_soap_template")
+    async def test_releases_connection_during_llm_call(
+        self, mock_load_template, mock_get_client, db_session: AsyncSession
+    ):
+        """Should not hold a database transaction while waiting on the LLM."""
+        mock_load_template.return_value = "## Template"
+        in_transaction_during_call: list[bool] = []
+
+        async def extract(*args, **kwargs) -> SOAPNoteOutput:
+            in_transaction_during_call.append(db_session.in_transaction())
+            return MOCK_SOAP_OUTPUT
+
+        mock_client = MagicMock()
+        mock_client.extract_soap_note = AsyncMock(side_effect=extract)
+        mock_get_client.return_value = mock_client
+
+        user = User(
+            id=uuid.uuid4(),
+            google_id="google-release-test",
+            email="release@example.com",
+        )
+        db_session.add(user)
+        await db_session.flush()
+        recording = Recording(
+            id=uuid.uuid4(),
+            user_id=user.id,
+            duration_seconds=60,
+            status="completed",
+        )
+        db_session.add(recording)
+        await db_session.flush()
+        assert db_session.in_transaction()
+
+        note = await create_note_from_transcript(
+            db=db_session,
+            user_id=user.id,
+            recording_id=recording.id,
+            transcript="Le patient a mal au dos",
+        )
+
+        assert in_transaction_during_call == [False]
+        assert note.id is not None
@@ -4,11 +4,14 @@ from datetime import datetime, timedelta, timezone
 
 import pytest
 from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.plan import Plan
+from app.models.recording import Recording
 from app.models.subscription import Subscription, SubscriptionStatus
 from app.models.user import User
+from app.services import subscription as subscription_service
 
 
 @pytest.fixture
@@ -274,3 +277,71 @@ async def test_user_subscription_relationship(
 
     assert test_user.subscription is not None
     assert test_user.subscription.status == SubscriptionStatus.TRIAL.value
+
+
+async def _add_subscribers(db_session: AsyncSession, plan: Plan, count: int) -> list[User]:
+    """Add `count` subscribers (each with some recordings) to a plan."""
+    start = len((await db_session.execute(select(User.id))).all())
+    users = [
+        User(google_id=f"subscriber_{start + i}", email=f"subscriber_{start + i}@example.com")
+        for i in range(count)
+    ]
+    db_session.add_all(users)
+    await db_session.flush()
+    for user in users:
+        db_session.add(
+            Subscription(
+                user_id=user.id,
+                plan_id=plan.id,
+                status=SubscriptionStatus.ACTIVE.value,
+                quota_remaining=20,
+                quota_total=20,
+            )
+        )
+        db_session.add_all(
+            Recording(user_id=user.id, duration_seconds=60, status="completed")
+            for _ in range(3)
+        )
+    await db_session.commit()
+    db_session.expunge_all()
+    return users
+
+
+@pytest.mark.asyncio
+async def test_subscription_load_cost_independent_of_customer_count(
+    db_session: AsyncSession, test_plan: Plan, sql_statements: list[str]
+) -> None:
+    """Benchmark: loading one subscription costs the same with 1 or 200 subscribers."""
+    first_user = (await _add_subscribers(db_session, test_plan, 1))[0]
+
+    sql_statements.clear()
+    await subscription_service.get_user_subscription(db_session, first_user.id)
+    baseline = list(sql_statements)
+    db_session.expunge_all()
+
+    await _add_subscribers(db_session, test_plan, 199)
+
+    sql_statements.clear()
+    subscription = await subscription_service.get_user_subscription(
+        db_session, first_user.id
+    )
+
+    assert subscription is not None
+    assert subscription.plan.name == "starter"
+    # Subscription, its user and its plan: one row each, nothing cascades
+    assert len(sql_statements) == len(baseline) == 3
+    assert not any("subscriptions.plan_id IN" in stmt for stmt in sql_statements)
+    assert not any("FROM recordings" in stmt for stmt in sql_statements)
+
+
+@pytest.mark.asyncio
+async def test_plan_subscriptions_never_loaded_implicitly(
+    db_session: AsyncSession, test_plan: Plan
+) -> None:
+    """Test Plan.subscriptions must be queried explicitly."""
+    await _add_subscribers(db_session, test_plan, 2)
+
+    plan = await db_session.get(Plan, test_plan.id)
+
+    with pytest.raises(InvalidRequestError):
+        _ = plan.subscriptions
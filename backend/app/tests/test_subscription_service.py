@@ -1,12 +1,15 @@
 """Tests for subscription service."""
 
+import asyncio
 from datetime import datetime, timedelta, timezone
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 import pytest
 from fastapi import HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from app.models.base import Base
 from app.models.plan import Plan
 from app.models.subscription import Subscription, SubscriptionStatus
 from app.models.user import User
@@ -346,6 +349,97 @@ async def test_decrement_quota_no_remaining(
     assert exc_info.value.detail["error"]["code"] == "QUOTA_EXCEEDED"
 
 
+@pytest.mark.asyncio
+async def test_reserve_and_release_quota(
+    db_session: AsyncSession, test_user: User, test_plan: Plan
+) -> None:
+    """Test a released reservation gives its unit back, never above quota_total."""
+    await subscription_service.create_trial_subscription(
+        db=db_session,
+        user_id=test_user.id,
+        plan_id=test_plan.id,
+    )
+
+    reservation = await subscription_service.reserve_quota(db_session, test_user.id)
+    assert reservation == subscription_service.QuotaReservation(4, 5)
+
+    await subscription_service.release_quota(db_session, test_user.id)
+    await subscription_service.release_quota(db_session, test_user.id)
+    await db_session.commit()
+
+    subscription = await subscription_service.get_user_subscription(
+        db_session, test_user.id
+    )
+    assert subscription.quota_remaining == 5
+
+
+@pytest.mark.asyncio
+async def test_reserve_quota_expired_trial(
+    db_session: AsyncSession, test_user: User, test_plan: Plan
+) -> None:
+    """Test no quota is reserved on a trial past its end date."""
+    db_session.add(
+        Subscription(
+            user_id=test_user.id,
+            plan_id=test_plan.id,
+            status=SubscriptionStatus.TRIAL.value,
+            quota_remaining=5,
+            quota_total=5,
+            trial_ends_at=datetime.now(timezone.utc) - timedelta(days=1),
+        )
+    )
+    await db_session.commit()
+
+    assert await subscription_service.reserve_quota(db_session, test_user.id) is None
+
+
+@pytest.mark.asyncio
+async def test_reserve_quota_concurrent_requests(tmp_path) -> None:
+    """Test concurrent reservations never spend more than the remaining quota."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'quota.db'}",
+        connect_args={"timeout": 30},
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_maker() as session:
+        user = User(google_id="concurrent", email="concurrent@example.com")
+        plan = Plan(name="starter", display_name="Starter", price_monthly=2900, quota_monthly=20)
+        session.add_all([user, plan])
+        await session.flush()
+        session.add(
+            Subscription(
+                user_id=user.id,
+                plan_id=plan.id,
+                status=SubscriptionStatus.ACTIVE.value,
+                quota_remaining=5,
+                quota_total=5,
+            )
+        )
+        await session.commit()
+
+    async def reserve() -> bool:
+        async with session_maker() as session:
+            reservation = await subscription_service.reserve_quota(session, user.id)
+            await asyncio.sleep(0)  # let the other requests interleave
+            await session.commit()
+            return reservation is not None
+
+    try:
+        results = await asyncio.gather(*(reserve() for _ in range(20)))
+
+        async with session_maker() as session:
+            subscription = await subscription_service.get_user_subscription(
+                session, user.id
+            )
+        assert results.count(True) == 5
+        assert subscription.quota_remaining == 0
+    finally:
+        await engine.dispose()
+
+
 @pytest.mark.asyncio
 async def test_expire_trial_if_needed(
     db_session: AsyncSession, test_user: User, test_plan: Plan
@@ -366,3 +460,187 @@ async def test_expire_trial_if_needed(
     updated = await subscription_service.expire_trial_if_needed(db_session, subscription)
 
     assert updated.status == SubscriptionStatus.EXPIRED.value
+
+
+@pytest.mark.asyncio
+async def test_expire_due_trials(db_session: AsyncSession, test_plan: Plan) -> None:
+    """Test expire_due_trials expires past trials only, in one statement."""
+    now = datetime.now(timezone.utc)
+    cases = {
+        "past_trial": (SubscriptionStatus.TRIAL, now - timedelta(days=1)),
+        "future_trial": (SubscriptionStatus.TRIAL, now + timedelta(days=1)),
+        "active": (SubscriptionStatus.ACTIVE, now - timedelta(days=1)),
+    }
+    users = {}
+    for name, (status, trial_ends_at) in cases.items():
+        user = User(google_id=name, email=f"{name}@example.com")
+        db_session.add(user)
+        await db_session.flush()
+        db_session.add(
+            Subscription(
+                user_id=user.id,
+                plan_id=test_plan.id,
+                status=status.value,
+                quota_remaining=5,
+                quota_total=5,
+                trial_ends_at=trial_ends_at,
+            )
+        )
+        users[name] = user
+    await db_session.commit()
+
+    expired = await subscription_service.expire_due_trials(db_session)
+
+    statuses = {}
+    for name, user in users.items():
+        subscription = await db_session.scalar(
+            select(Subscription)
+            .where(Subscription.user_id == user.id)
+            .execution_options(populate_existing=True)
+        )
+        statuses[name] = subscription.status
+    assert expired == 1
+    assert statuses == {
+        "past_trial": SubscriptionStatus.EXPIRED.value,
+        "future_trial": SubscriptionStatus.TRIAL.value,
+        "active": SubscriptionStatus.ACTIVE.value,
+    }
+    assert await subscription_service.expire_due_trials(db_session) == 0
+
+
+async def _add_subscriptions(
+    db_session: AsyncSession,
+    plan: Plan,
+    status: SubscriptionStatus,
+    period_end: datetime,
+    count: int,
+) -> list[UUID]:
+    """Add subscriptions with an empty quota and return their users."""
+    user_ids = []
+    for _ in range(count):
+        user = User(google_id=str(uuid4()), email=f"{uuid4()}@example.com")
+        db_session.add(user)
+        await db_session.flush()
+        db_session.add(
+            Subscription(
+                user_id=user.id,
+                plan_id=plan.id,
+                status=status.value,
+                quota_remaining=0,
+                quota_total=5,
+                current_period_start=period_end - timedelta(days=30),
+                current_period_end=period_end,
+            )
+        )
+        user_ids.append(user.id)
+    await db_session.commit()
+    return user_ids
+
+
+async def _quotas(db_session: AsyncSession, user_ids: list[UUID]) -> list[int]:
+    """Read the remaining quota of the given users' subscriptions."""
+    result = await db_session.execute(
+        select(Subscription.quota_remaining)
+        .where(Subscription.user_id.in_(user_ids))
+        .execution_options(populate_existing=True)
+    )
+    return list(result.scalars())
+
+
+async def _periods(
+    db_session: AsyncSession, user_ids: list[UUID]
+) -> list[tuple[datetime, datetime]]:
+    """Read the billing period of the given users' subscriptions (naive UTC on SQLite)."""
+    result = await db_session.execute(
+        select(Subscription.current_period_start, Subscription.current_period_end)
+        .where(Subscription.user_id.in_(user_ids))
+        .execution_options(populate_existing=True)
+    )
+    return [tuple(row) for row in result]
+
+
+@pytest.mark.asyncio
+async def test_rollover_due_periods(db_session: AsyncSession, test_plan: Plan) -> None:
+    """Test due active subscriptions are refilled from their plan, in batches."""
+    now = datetime.now(timezone.utc)
+    due = await _add_subscriptions(
+        db_session, test_plan, SubscriptionStatus.ACTIVE, now - timedelta(hours=1), 5
+    )
+    not_due = await _add_subscriptions(
+        db_session, test_plan, SubscriptionStatus.ACTIVE, now + timedelta(days=1), 1
+    )
+    cancelled = await _add_subscriptions(
+        db_session, test_plan, SubscriptionStatus.CANCELLED, now - timedelta(hours=1), 1
+    )
+
+    report = await subscription_service.rollover_due_periods(
+        db_session, now=now, batch_size=2
+    )
+
+    assert (report.renewed, report.batches) == (5, 3)
+    assert report.per_second > 0
+    assert await _quotas(db_session, due) == [test_plan.quota_monthly] * 5
+    assert await _quotas(db_session, not_due + cancelled) == [0, 0]
+    # The new period starts where the previous one ended, not at now
+    previous_end = (now - timedelta(hours=1)).replace(tzinfo=None)
+    assert await _periods(db_session, due) == [
+        (previous_end, previous_end + timedelta(days=30))
+    ] * 5
+    # Renewed periods end after now: running again changes nothing
+    report = await subscription_service.rollover_due_periods(
+        db_session, now=now, batch_size=2
+    )
+    assert report.renewed == 0
+
+
+@pytest.mark.asyncio
+async def test_rollover_due_periods_resumes(
+    db_session: AsyncSession, test_plan: Plan
+) -> None:
+    """Test an interrupted rollover is completed by the next run."""
+    now = datetime.now(timezone.utc)
+    due = await _add_subscriptions(
+        db_session, test_plan, SubscriptionStatus.ACTIVE, now - timedelta(hours=1), 3
+    )
+
+    first = await subscription_service.rollover_due_periods(
+        db_session, now=now, batch_size=2, max_batches=1
+    )
+    second = await subscription_service.rollover_due_periods(
+        db_session, now=now, batch_size=2
+    )
+
+    assert (first.renewed, second.renewed) == (2, 1)
+    assert await _quotas(db_session, due) == [test_plan.quota_monthly] * 3
+
+
+@pytest.mark.asyncio
+async def test_rollover_catches_up_overdue_periods(
+    db_session: AsyncSession, test_plan: Plan
+) -> None:
+    """Test a subscription overdue by several periods is caught up by later runs."""
+    now = datetime.now(timezone.utc)
+    ended = now - timedelta(days=65)
+    overdue = await _add_subscriptions(
+        db_session, test_plan, SubscriptionStatus.ACTIVE, ended, 1
+    )
+
+    renewed = [
+        (await subscription_service.rollover_due_periods(db_session, now=now)).renewed
+        for _ in range(4)
+    ]
+
+    assert renewed == [1, 1, 1, 0]
+    ended = ended.replace(tzinfo=None)
+    assert await _periods(db_session, overdue) == [
+        (ended + timedelta(days=60), ended + timedelta(days=90))
+    ]
+    assert await _quotas(db_session, overdue) == [test_plan.quota_monthly]
+
+
+def test_rollover_report_is_a_value_object() -> None:
+    """Test reports are built with their counts and do not share state."""
+    report = subscription_service.RolloverReport(renewed=10, batches=1, elapsed_seconds=2.0)
+
+    assert report.per_second == 5.0
+    assert subscription_service.RolloverReport().renewed == 0
@@ -0,0 +1,628 @@
+"""Tests for the background job queue and asynchronous transcription pipeline."""
+
+import asyncio
+import io
+import uuid
+from collections.abc import AsyncGenerator
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import AsyncClient, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.database import get_db
+from app.core.jobs import InProcessJobQueue, JobQueueFullError, PeriodicTask
+from app.core.security import create_access_token
+from app.main import app
+from app.models.plan import Plan
+from app.models.recording import Recording
+from app.models.subscription import Subscription, SubscriptionStatus
+from app.models.user import User
+from app.routers.auth import COOKIE_NAME
+from app.schemas.recording import RecordingStatus
+from app.services.deepgram import DeepgramTranscriptionError, TranscriptionResult
+from app.services.recording import complete_recording, fail_recording
+from app.services.transcription_jobs import (
+    TranscriptionJob,
+    mark_transcription_job_failed,
+    run_transcription_job,
+    sweep_stale_recordings,
+)
+
+
+class TestInProcessJobQueue:
+    """Tests for the in-process asyncio job queue."""
+
+    @pytest.mark.asyncio
+    async def test_processes_enqueued_jobs(self) -> None:
+        """Test that workers process every enqueued job."""
+        processed: list[int] = []
+
+        async def handler(job: int) -> None:
+            processed.append(job)
+
+        queue = InProcessJobQueue(handler=handler, workers=2, max_size=10)
+        await queue.start()
+        for i in range(5):
+            await queue.enqueue(i)
+        await queue.stop()
+
+        assert sorted(processed) == [0, 1, 2, 3, 4]
+        assert not queue.running
+
+    @pytest.mark.asyncio
+    async def test_enqueue_raises_when_full(self) -> None:
+        """Test that enqueue never blocks and rejects jobs beyond max_size."""
+        queue = InProcessJobQueue(handler=AsyncMock(), workers=1, max_size=1)
+
+        await queue.enqueue(1)
+        with pytest.raises(JobQueueFullError):
+            await queue.enqueue(2)
+        assert queue.pending == 1
+
+    @pytest.mark.asyncio
+    async def test_failing_job_does_not_kill_worker(self) -> None:
+        """Test that a handler exception is contained to its job."""
+        processed: list[int] = []
+
+        async def handler(job: int) -> None:
+            if job == 0:
+                raise RuntimeError("boom")
+            processed.append(job)
+
+        queue = InProcessJobQueue(handler=handler, workers=1, max_size=10)
+        await queue.start()
+        await queue.enqueue(0)
+        await queue.enqueue(1)
+        await queue.stop()
+
+        assert processed == [1]
+
+    @pytest.mark.asyncio
+    async def test_stop_abandons_jobs_after_timeout(self) -> None:
+        """Test that jobs in progress or queued after the shutdown timeout are abandoned."""
+        release = asyncio.Event()
+        abandoned: list[int] = []
+
+        async def handler(job: int) -> None:
+            await release.wait()
+
+        async def on_abandon(job: int) -> None:
+            abandoned.append(job)
+
+        queue = InProcessJobQueue(
+            handler=handler,
+            workers=1,
+            max_size=10,
+            on_abandon=on_abandon,
+            shutdown_timeout=0.05,
+        )
+        await queue.start()
+        await queue.enqueue(0)
+        await queue.enqueue(1)
+        await asyncio.sleep(0)
+        await queue.stop()
+
+        assert abandoned == [0, 1]
+
+    @pytest.mark.asyncio
+    async def test_failing_abandon_does_not_stop_shutdown(self) -> None:
+        """Test that an on_abandon error is contained to its job."""
+        abandoned: list[int] = []
+
+        async def handler(job: int) -> None:
+            await asyncio.Event().wait()
+
+        async def on_abandon(job: int) -> None:
+            if job == 0:
+                raise RuntimeError("database down")
+            abandoned.append(job)
+
+        queue = InProcessJobQueue(
+            handler=handler,
+            workers=1,
+            max_size=10,
+            on_abandon=on_abandon,
+            shutdown_timeout=0.05,
+        )
+        await queue.start()
+        await queue.enqueue(0)
+        await queue.enqueue(1)
+        await asyncio.sleep(0)
+        await queue.stop()
+
+        assert abandoned == [1]
+
+
+class TestPeriodicTask:
+    """Tests for the periodic background task."""
+
+    @pytest.mark.asyncio
+    async def test_runs_at_interval_despite_failures(self) -> None:
+        """Test that a failing run does not stop the next ones."""
+        runs = 0
+
+        async def func() -> None:
+            nonlocal runs
+            runs += 1
+            raise RuntimeError("boom")
+
+        task = PeriodicTask(func, interval_seconds=0.01)
+        await task.start()
+        await asyncio.sleep(0.1)
+        await task.stop()
+
+        assert runs >= 2
+        assert not task.running
+
+
+class TestTranscriptionPipeline:
+    """Tests for the asynchronous recording upload and polling endpoints."""
+
+    @pytest.fixture
+    async def test_user(self, db_session: AsyncSession) -> User:
+        """Create a user with an active subscription."""
+        user = User(
+            google_id=f"google_{uuid.uuid4().hex[:8]}",
+            email="jobs@example.com",
+            name="Jobs User",
+        )
+        plan = Plan(
+            name="jobs_plan",
+            display_name="Jobs Plan",
+            price_monthly=0,
+            quota_monthly=5,
+            max_recording_minutes=10,
+            max_notes_retention=10,
+            is_active=True,
+        )
+        db_session.add_all([user, plan])
+        await db_session.flush()
+        now = datetime.now(timezone.utc)
+        db_session.add(
+            Subscription(
+                user_id=user.id,
+                plan_id=plan.id,
+                status=SubscriptionStatus.ACTIVE.value,
+                quota_remaining=5,
+                quota_total=5,
+                current_period_start=now,
+                current_period_end=now + timedelta(days=30),
+            )
+        )
+        await db_session.commit()
+        await db_session.refresh(user)
+        return user
+
+    @pytest.fixture
+    def session_factory(
+        self, db_session: AsyncSession
+    ) -> async_sessionmaker[AsyncSession]:
+        """Session factory for workers, bound to the test database."""
+        return async_sessionmaker(db_session.bind, expire_on_commit=False)
+
+    @pytest.fixture
+    async def override_db(self, db_session: AsyncSession) -> AsyncGenerator[None, None]:
+        """Route the app's get_db dependency to the test session."""
+
+        async def override_get_db():
+            yield db_session
+
+        app.dependency_overrides[get_db] = override_get_db
+        yield
+        app.dependency_overrides.pop(get_db, None)
+
+    @pytest.fixture
+    def queue(self) -> AsyncMock:
+        """Replace the transcription queue with a recorder."""
+        fake_queue = AsyncMock()
+        with patch(
+            "app.routers.recordings.get_transcription_queue",
+            return_value=fake_queue,
+        ):
+            yield fake_queue
+
+    async def _upload(self, client: AsyncClient, user: User) -> Response:
+        """POST an audio file to the asynchronous upload endpoint."""
+        token = create_access_token(user_id=user.id, email=user.email)
+        response = await client.post(
+            "/api/v1/recordings/jobs",
+            files={"audio": ("test.webm", io.BytesIO(b"audio"), "audio/webm")},
+            data={"duration": "60"},
+            cookies={COOKIE_NAME: token},
+        )
+        return response
+
+    async def _quota_remaining(self, db: AsyncSession, user: User) -> int:
+        """Read the user's remaining quota straight from the database."""
+        result = await db.execute(
+            select(Subscription.quota_remaining).where(Subscription.user_id == user.id)
+        )
+        return result.scalar_one()
+
+    @pytest.mark.asyncio
+    async def test_upload_returns_202_and_enqueues(
+        self,
+        client: AsyncClient,
+        override_db: None,
+        test_user: User,
+        queue: AsyncMock,
+    ) -> None:
+        """Test that the upload is accepted without waiting for transcription."""
+        response = await self._upload(client, test_user)
+
+        assert response.status_code == 202
+        body = response.json()
+        assert body["status"] == RecordingStatus.TRANSCRIBING.value
+        queue.enqueue.assert_awaited_once()
+        job = queue.enqueue.await_args.args[0]
+        assert str(job.recording_id) == body["id"]
+        assert job.audio_data == b"audio"
+
+    @pytest.mark.asyncio
+    async def test_full_queue_returns_503_and_fails_recording(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        override_db: None,
+        test_user: User,
+        queue: AsyncMock,
+    ) -> None:
+        """Test that a saturated queue rejects the upload instead of blocking."""
+        queue.enqueue.side_effect = JobQueueFullError("full")
+
+        response = await self._upload(client, test_user)
+
+        assert response.status_code == 503
+        assert response.json()["error"]["code"] == "SERVICE_UNAVAILABLE"
+        await db_session.refresh(test_user, ["recordings"])
+        assert [r.status for r in test_user.recordings] == [RecordingStatus.FAILED.value]
+
+    @pytest.mark.asyncio
+    async def test_worker_completes_job_and_consumes_quota(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        session_factory: async_sessionmaker[AsyncSession],
+        override_db: None,
+        test_user: User,
+        queue: AsyncMock,
+    ) -> None:
+        """Test the full flow: upload, background transcription, then polling."""
+        response = await self._upload(client, test_user)
+        job = queue.enqueue.await_args.args[0]
+
+        result = TranscriptionResult(
+            transcript="Patient reports knee pain",
+            language_detected="en",
+            duration_seconds=60.0,
+            latency_ms=1200.0,
+        )
+        with patch(
+            "app.services.transcription_jobs.transcribe_audio",
+            AsyncMock(return_value=result),
+        ):
+            await run_transcription_job(job, session_factory=session_factory)
+
+        token = create_access_token(user_id=test_user.id, email=test_user.email)
+        poll = await client.get(
+            f"/api/v1/recordings/{response.json()['id']}",
+            cookies={COOKIE_NAME: token},
+        )
+
+        assert poll.status_code == 200
+        assert poll.json()["status"] == RecordingStatus.COMPLETED.value
+        assert poll.json()["transcriptText"] == "Patient reports knee pain"
+        assert await self._quota_remaining(db_session, test_user) == 4
+
+    @pytest.mark.asyncio
+    async def test_worker_failure_keeps_quota(
+        self,
+        db_session: AsyncSession,
+        session_factory: async_sessionmaker[AsyncSession],
+        test_user: User,
+    ) -> None:
+        """Test that a failed transcription marks the recording failed, quota intact."""
+        recording = Recording(
+            user_id=test_user.id,
+            duration_seconds=60,
+            status=RecordingStatus.TRANSCRIBING.value,
+        )
+        db_session.add(recording)
+        await db_session.commit()
+        job = TranscriptionJob(
+            recording_id=recording.id, user_id=test_user.id, audio_data=b"audio"
+        )
+
+        with patch(
+            "app.services.transcription_jobs.transcribe_audio",
+            AsyncMock(side_effect=DeepgramTranscriptionError("timeout")),
+        ):
+            await run_transcription_job(job, session_factory=session_factory)
+
+        await db_session.refresh(recording)
+        assert recording.status == RecordingStatus.FAILED.value
+        assert await self._quota_remaining(db_session, test_user) == 5
+
+    @pytest.mark.asyncio
+    async def test_unexpected_worker_error_fails_recording(
+        self,
+        db_session: AsyncSession,
+        session_factory: async_sessionmaker[AsyncSession],
+        test_user: User,
+    ) -> None:
+        """Test that any job error, not only Deepgram's, fails the recording."""
+        recording = Recording(
+            user_id=test_user.id,
+            duration_seconds=60,
+            status=RecordingStatus.TRANSCRIBING.value,
+        )
+        db_session.add(recording)
+        await db_session.commit()
+        job = TranscriptionJob(
+            recording_id=recording.id, user_id=test_user.id, audio_data=b"audio"
+        )
+
+        with patch(
+            "app.services.transcription_jobs.transcribe_audio",
+            AsyncMock(side_effect=RuntimeError("unexpected")),
+        ):
+            await run_transcription_job(job, session_factory=session_factory)
+
+        await db_session.refresh(recording)
+        assert recording.status == RecordingStatus.FAILED.value
+
+    @pytest.mark.asyncio
+    async def test_abandoned_job_keeps_completed_recording(
+        self,
+        db_session: AsyncSession,
+        session_factory: async_sessionmaker[AsyncSession],
+        test_user: User,
+    ) -> None:
+        """Test that a job interrupted after completing does not fail its recording."""
+        recording = Recording(
+            user_id=test_user.id,
+            duration_seconds=60,
+            status=RecordingStatus.COMPLETED.value,
+        )
+        db_session.add(recording)
+        await db_session.commit()
+
+        await mark_transcription_job_failed(
+            TranscriptionJob(
+                recording_id=recording.id, user_id=test_user.id, audio_data=b""
+            ),
+            session_factory=session_factory,
+        )
+
+        await db_session.refresh(recording)
+        assert recording.status == RecordingStatus.COMPLETED.value
+
+    @pytest.mark.asyncio
+    async def test_failing_twice_releases_one_unit(
+        self,
+        db_session: AsyncSession,
+        session_factory: async_sessionmaker[AsyncSession],
+        test_user: User,
+    ) -> None:
+        """Test that failing an already failed recording gives nothing back."""
+        recording = Recording(
+            user_id=test_user.id,
+            duration_seconds=60,
+            status=RecordingStatus.TRANSCRIBING.value,
+        )
+        db_session.add(recording)
+        subscription = await db_session.scalar(
+            select(Subscription).where(Subscription.user_id == test_user.id)
+        )
+        subscription.quota_remaining = 3
+        await db_session.commit()
+        job = TranscriptionJob(
+            recording_id=recording.id, user_id=test_user.id, audio_data=b""
+        )
+
+        await mark_transcription_job_failed(job, session_factory=session_factory)
+        await mark_transcription_job_failed(job, session_factory=session_factory)
+
+        assert await self._quota_remaining(db_session, test_user) == 4
+
+    async def _stale_copies(
+        self,
+        db_session: AsyncSession,
+        session_factory: async_sessionmaker[AsyncSession],
+        test_user: User,
+    ) -> tuple[Recording, Recording, AsyncSession]:
+        """A transcribing recording loaded in two sessions, with one unit reserved."""
+        recording = Recording(
+            user_id=test_user.id,
+            duration_seconds=60,
+            status=RecordingStatus.TRANSCRIBING.value,
+        )
+        db_session.add(recording)
+        subscription = await db_session.scalar(
+            select(Subscription).where(Subscription.user_id == test_user.id)
+        )
+        subscription.quota_remaining = 4
+        await db_session.commit()
+        other_session = session_factory()
+        stale = await other_session.get(Recording, recording.id)
+        return recording, stale, other_session
+
+    @pytest.mark.asyncio
+    async def test_failing_a_stale_instance_releases_one_unit(
+        self,
+        db_session: AsyncSession,
+        session_factory: async_sessionmaker[AsyncSession],
+        test_user: User,
+    ) -> None:
+        """Test that a second fail through an instance still showing TRANSCRIBING gives nothing back."""
+        recording, stale, other_session = await self._stale_copies(
+            db_session, session_factory, test_user
+        )
+        async with other_session:
+            await fail_recording(db_session, recording)
+            assert stale.status == RecordingStatus.TRANSCRIBING.value
+
+            await fail_recording(other_session, stale)
+
+            assert stale.status == RecordingStatus.FAILED.value
+        assert await self._quota_remaining(db_session, test_user) == 5
+
+    @pytest.mark.asyncio
+    async def test_completing_a_failed_recording_leaves_it_failed(
+        self,
+        db_session: AsyncSession,
+        session_factory: async_sessionmaker[AsyncSession],
+        test_user: User,
+    ) -> None:
+        """Test that a recording failed meanwhile is not completed on its released unit."""
+        recording, stale, other_session = await self._stale_copies(
+            db_session, session_factory, test_user
+        )
+        async with other_session:
+            await fail_recording(db_session, recording)
+
+            completed = await complete_recording(
+                other_session,
+                stale,
+                TranscriptionResult(
+                    transcript="Late transcript",
+                    language_detected="en",
+                    duration_seconds=60.0,
+                    latency_ms=1200.0,
+                ),
+            )
+
+            assert completed.status == RecordingStatus.FAILED.value
+            assert completed.transcript_text is None
+        assert await self._quota_remaining(db_session, test_user) == 5
+
+    @pytest.mark.asyncio
+    async def test_failing_a_completed_recording_keeps_its_unit(
+        self,
+        db_session: AsyncSession,
+        session_factory: async_sessionmaker[AsyncSession],
+        test_user: User,
+    ) -> None:
+        """Test that a stale fail after completion neither fails it nor gives its unit back."""
+        recording, stale, other_session = await self._stale_copies(
+            db_session, session_factory, test_user
+        )
+        async with other_session:
+            await complete_recording(
+                db_session,
+                recording,
+                TranscriptionResult(
+                    transcript="Done",
+                    language_detected="en",
+                    duration_seconds=60.0,
+                    latency_ms=1200.0,
+                ),
+            )
+
+            failed = await fail_recording(other_session, stale)
+
+            assert failed.status == RecordingStatus.COMPLETED.value
+        assert await self._quota_remaining(db_session, test_user) == 4
+
+    @pytest.mark.asyncio
+    async def test_sweep_fails_stale_recordings_and_releases_quota(
+        self,
+        db_session: AsyncSession,
+        session_factory: async_sessionmaker[AsyncSession],
+        test_user: User,
+    ) -> None:
+        """Test that recordings stuck in TRANSCRIBING are failed, their units given back."""
+        old = datetime.now(timezone.utc) - timedelta(days=1)
+        stale = [
+            Recording(
+                user_id=test_user.id,
+                duration_seconds=60,
+                status=RecordingStatus.TRANSCRIBING.value,
+                created_at=old,
+            )
+            for _ in range(2)
+        ]
+        completed = Recording(
+            user_id=test_user.id,
+            duration_seconds=60,
+            status=RecordingStatus.COMPLETED.value,
+            created_at=old,
+        )
+        fresh = Recording(
+            user_id=test_user.id,
+            duration_seconds=60,
+            status=RecordingStatus.TRANSCRIBING.value,
+        )
+        db_session.add_all([*stale, completed, fresh])
+        # Four units reserved: the two stale, the completed and the fresh one
+        subscription = await db_session.scalar(
+            select(Subscription).where(Subscription.user_id == test_user.id)
+        )
+        subscription.quota_remaining = 1
+        await db_session.commit()
+
+        failed = await sweep_stale_recordings(session_factory=session_factory)
+
+        assert failed == 2
+        for recording in (*stale, completed, fresh):
+            await db_session.refresh(recording)
+        assert [r.status for r in stale] == [RecordingStatus.FAILED.value] * 2
+        assert completed.status == RecordingStatus.COMPLETED.value
+        assert fresh.status == RecordingStatus.TRANSCRIBING.value
+        assert await self._quota_remaining(db_session, test_user) == 3
+
+    @pytest.mark.asyncio
+    async def test_abandoned_job_marks_recording_failed(
+        self,
+        db_session: AsyncSession,
+        session_factory: async_sessionmaker[AsyncSession],
+        test_user: User,
+    ) -> None:
+        """Test the shutdown hook for jobs that never reached a worker."""
+        recording = Recording(
+            user_id=test_user.id,
+            duration_seconds=60,
+            status=RecordingStatus.TRANSCRIBING.value,
+        )
+        db_session.add(recording)
+        await db_session.commit()
+
+        await mark_transcription_job_failed(
+            TranscriptionJob(
+                recording_id=recording.id, user_id=test_user.id, audio_data=b""
+            ),
+            session_factory=session_factory,
+        )
+
+        await db_session.refresh(recording)
+        assert recording.status == RecordingStatus.FAILED.value
+
+    @pytest.mark.asyncio
+    async def test_get_recording_of_other_user_returns_404(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        override_db: None,
+        test_user: User,
+    ) -> None:
+        """Test that users can only poll their own recordings."""
+        other = User(google_id="other-google", email="other@example.com")
+        db_session.add(other)
+        await db_session.flush()
+        recording = Recording(
+            user_id=other.id,
+            duration_seconds=60,
+            status=RecordingStatus.TRANSCRIBING.value,
+        )
+        db_session.add(recording)
+        await db_session.commit()
+
+        token = create_access_token(user_id=test_user.id, email=test_user.email)
+        response = await client.get(
+            f"/api/v1/recordings/{recording.id}", cookies={COOKIE_NAME: token}
+        )
+
+        assert response.status_code == 404
@@ -0,0 +1,112 @@
+"""Tests for splitting WebM recordings into segments."""
+
+import pytest
+
+from app.services.webm import WebMFormatError, split_webm
+
+LOUD = 120  # bytes per 20ms Opus frame of speech
+QUIET = 3  # bytes per 20ms Opus frame of silence
+
+
+def _element(element_id: int, payload: bytes, unknown_size: bool = False) -> bytes:
+    """Encode an EBML element with an 8-byte size field."""
+    id_bytes = element_id.to_bytes((element_id.bit_length() + 7) // 8, "big")
+    size = b"\x01\xff\xff\xff\xff\xff\xff\xff" if unknown_size else (
+        b"\x01" + len(payload).to_bytes(7, "big")
+    )
+    return id_bytes + size + payload
+
+
+def _cluster(start_ms: int, frame_sizes: list[int], unknown_size: bool) -> bytes:
+    """Build a Cluster of 20ms SimpleBlocks."""
+    blocks = [_element(0xE7, start_ms.to_bytes(4, "big"))]
+    for index, size in enumerate(frame_sizes):
+        header = b"\x81" + (index * 20).to_bytes(2, "big") + b"\x80"
+        blocks.append(_element(0xA3, header + b"\x00" * size))
+    return _element(0x1F43B675, b"".join(blocks), unknown_size)
+
+
+def _webm(
+    seconds: int,
+    quiet_at: tuple[int, ...] = (),
+    cluster_seconds: int = 5,
+    unknown_size: bool = False,
+) -> bytes:
+    """
+    Build a WebM recording with speech everywhere but around given times.
+
+    Args:
+        seconds: Recording duration
+        quiet_at: Times (seconds) with one second of silence around them
+        cluster_seconds: Duration of each Cluster
+        unknown_size: Write Segment and Clusters with unknown sizes, like
+            browsers recording with MediaRecorder
+    """
+    frames_per_cluster = cluster_seconds * 50
+    clusters = []
+    for start in range(0, seconds, cluster_seconds):
+        sizes = []
+        for index in range(frames_per_cluster):
+            at = start + index / 50
+            sizes.append(QUIET if any(abs(at - t) <= 1 for t in quiet_at) else LOUD)
+        clusters.append(_cluster(start * 1000, sizes, unknown_size))
+    info = _element(
+        0x1549A966,
+        _element(0x2AD7B1, (1_000_000).to_bytes(3, "big"))
+        + _element(0x4489, b"\x00" * 8),
+    )
+    tracks = _element(0x1654AE6B, _element(0xAE, _element(0x86, b"A_OPUS")))
+    header = _element(0x1A45DFA3, _element(0x4282, b"webm"))
+    return header + _element(
+        0x18538067,
+        info + tracks + b"".join(clusters),
+        unknown_size,
+    )
+
+
+class TestSplitWebM:
+    """Tests for split_webm."""
+
+    def test_short_recording_is_not_split(self) -> None:
+        """A recording shorter than two segments is returned unchanged."""
+        data = _webm(60)
+
+        segments = split_webm(data, segment_seconds=60)
+
+        assert len(segments) == 1
+        assert segments[0].data == data
+
+    def test_segments_cover_recording_in_order(self) -> None:
+        """Segments are consecutive, of about the requested duration."""
+        segments = split_webm(_webm(300), segment_seconds=60)
+
+        assert len(segments) == 5
+        assert [segment.start_seconds for segment in segments] == [0, 60, 120, 180, 240]
+        assert sum(segment.duration_seconds for segment in segments) == pytest.approx(
+            300, abs=0.1
+        )
+
+    def test_split_at_quiet_boundary(self) -> None:
+        """A pause near the target position is preferred to the target itself."""
+        segments = split_webm(_webm(240, quiet_at=(70,)), segment_seconds=60)
+
+        assert segments[1].start_seconds == 70
+
+    @pytest.mark.parametrize("unknown_size", [False, True])
+    def test_segments_are_standalone_files(self, unknown_size: bool) -> None:
+        """Each segment parses on its own, with the original Tracks."""
+        data = _webm(180, unknown_size=unknown_size)
+
+        segments = split_webm(data, segment_seconds=60)
+
+        assert len(segments) == 3
+        for segment in segments:
+            assert segment.data.startswith(data[:20])
+            assert b"A_OPUS" in segment.data
+            (reparsed,) = split_webm(segment.data, segment_seconds=600)
+            assert reparsed.duration_seconds == pytest.approx(60, abs=0.1)
+
+    def test_not_webm(self) -> None:
+        """Other formats are rejected."""
+        with pytest.raises(WebMFormatError):
+            split_webm(b"RIFF....WAVEfmt ", segment_seconds=60)
@@ -0,0 +1,7 @@
+"""Performance benchmarks for the backend.
+
+Standalone scripts, not part of the test suite. Run from the backend
+directory, e.g.:
+
+    python -m benchmarks.bench_token_verification
+"""
@@ -0,0 +1,101 @@
+"""Load test: sustained concurrent transcriptions, thread offload vs async client.
+
+Fires N concurrent transcriptions against a fake Deepgram endpoint with a
+fixed response latency. Compares the previous approach (synchronous SDK
+client called through asyncio.to_thread, bounded by the default executor
+of min(32, cpu + 4) threads) with transcribe_audio on the async client.
+
+Usage:
+    python -m benchmarks.bench_deepgram_concurrency [requests] [latency_s]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+os.environ.setdefault("DEEPGRAM_API_KEY", "benchmark")
+
+from deepgram import AsyncDeepgramClient, DeepgramClient  # noqa: E402
+
+from app.services import deepgram  # noqa: E402
+
+RESPONSE_BODY = {
+    "metadata": {
+        "request_id": "bench",
+        "sha256": "bench",
+        "created": "2026-01-01T00:00:00Z",
+        "duration": 60.0,
+        "channels": 1,
+        "models": [],
+        "model_info": {},
+    },
+    "results": {
+        "channels": [
+            {
+                "alternatives": [
+                    {"transcript": "transcript", "confidence": 0.9, "words": []}
+                ],
+                "detected_language": "fr",
+            }
+        ]
+    },
+}
+
+
+async def _threaded(requests: int, latency: float) -> float:
+    """Sync SDK client offloaded with asyncio.to_thread (previous behavior)."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        time.sleep(latency)
+        return httpx.Response(200, json=RESPONSE_BODY)
+
+    client = DeepgramClient(
+        api_key="benchmark",
+        httpx_client=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+
+    def transcribe() -> object:
+        return client.listen.v1.media.transcribe_file(request=b"audio", model="nova-3")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(asyncio.to_thread(transcribe) for _ in range(requests)))
+    return time.perf_counter() - start
+
+
+async def _native(requests: int, latency: float) -> float:
+    """transcribe_audio on the shared async client."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        return httpx.Response(200, json=RESPONSE_BODY)
+
+    deepgram._client = AsyncDeepgramClient(
+        api_key="benchmark",
+        httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    deepgram._semaphore = None
+
+    start = time.perf_counter()
+    await asyncio.gather(*(deepgram.transcribe_audio(b"audio") for _ in range(requests)))
+    return time.perf_counter() - start
+
+
+def main(requests: int = 200, latency: float = 0.5) -> None:
+    """Run the load test and print throughput for both clients."""
+    threaded = asyncio.run(_threaded(requests, latency))
+    native = asyncio.run(_native(requests, latency))
+
+    print(f"{requests} concurrent transcriptions, {latency * 1000:.0f}ms Deepgram latency")
+    print(f"default executor threads: {min(32, (os.cpu_count() or 1) + 4)}")
+    print(f"to_thread + sync client: {threaded:6.2f}s ({requests / threaded:7.1f} req/s)")
+    print(f"async client:            {native:6.2f}s ({requests / native:7.1f} req/s)")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 0.5,
+    )
@@ -0,0 +1,112 @@
+"""Per-note LLM client overhead: new client per note vs the shared registry client.
+
+Runs sequential chat completions against a local mock Mistral server (no
+generation latency), so the measured time is the client-side overhead:
+building a Mistral SDK instance with its own HTTP client and opening a
+connection for every note (previous behavior), versus reusing the
+registry's client on its keep-alive pool.
+
+Usage:
+    python -m benchmarks.bench_llm_client_reuse [notes]
+"""
+
+import asyncio
+import json
+import os
+import socket
+import sys
+import threading
+import time
+
+os.environ.setdefault("MISTRAL_API_KEY", "benchmark")
+
+import uvicorn  # noqa: E402
+from mistralai import Mistral  # noqa: E402
+
+from app.services.llm import factory  # noqa: E402
+
+COMPLETION = json.dumps({
+    "id": "bench",
+    "object": "chat.completion",
+    "model": "mistral-large-2",
+    "created": 0,
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+    "choices": [
+        {
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": "{}"},
+        }
+    ],
+}).encode()
+
+REQUEST = {
+    "model": "mistral-large-2",
+    "messages": [{"role": "user", "content": "transcript"}],
+    "response_format": {"type": "json_object"},
+}
+
+
+async def mock_llm(scope, receive, send) -> None:
+    """ASGI app answering every request with a fixed chat completion."""
+    if scope["type"] != "http":
+        return
+    while (await receive()).get("more_body"):
+        pass
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", b"application/json")],
+    })
+    await send({"type": "http.response.body", "body": COMPLETION})
+
+
+def _start_server() -> str:
+    """Run the mock server in a background thread, return its base URL."""
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(mock_llm, log_level="error"))
+    threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{port}"
+
+
+async def _per_note_client(url: str, notes: int) -> float:
+    """New SDK client for every note (previous get_llm_client behavior)."""
+    start = time.perf_counter()
+    for _ in range(notes):
+        client = Mistral(api_key="benchmark", server_url=url)
+        await client.chat.complete_async(**REQUEST)
+    return time.perf_counter() - start
+
+
+async def _shared_client(url: str, notes: int) -> float:
+    """One SDK client on the registry's pooled HTTP client."""
+    client = Mistral(
+        api_key="benchmark", server_url=url, async_client=factory._get_http_client()
+    )
+    await client.chat.complete_async(**REQUEST)  # open the connection
+    start = time.perf_counter()
+    for _ in range(notes):
+        await client.chat.complete_async(**REQUEST)
+    elapsed = time.perf_counter() - start
+    await factory.close_llm_clients()
+    return elapsed
+
+
+def main(notes: int = 300) -> None:
+    """Run both modes and print the per-note client overhead."""
+    url = _start_server()
+    per_note = asyncio.run(_per_note_client(url, notes))
+    shared = asyncio.run(_shared_client(url, notes))
+
+    print(f"{notes} sequential notes against a local mock LLM server")
+    print(f"client per note:      {per_note / notes * 1000:6.2f} ms/note")
+    print(f"shared pooled client: {shared / notes * 1000:6.2f} ms/note")
+    print(f"overhead removed:     {(per_note - shared) / notes * 1000:6.2f} ms/note")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
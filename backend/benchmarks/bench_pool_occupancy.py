@@ -0,0 +1,88 @@
+"""Load test: concurrent request throughput with a small connection pool.
+
+Simulates N concurrent transcription requests, each doing a short read,
+waiting on a slow external service, then writing the result. Compares
+holding the session's connection across the external call (previous
+behavior) with release_connection() before the call.
+
+Uses a temporary SQLite file with the same pool shape as production
+(pool_size=5, max_overflow=10), so at most 15 connections exist.
+
+Usage:
+    python -m benchmarks.bench_pool_occupancy [requests] [external_latency_s]
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import release_connection
+from app.models.base import Base
+from app.models.recording import Recording
+from app.models.user import User
+
+
+async def _request(
+    session_maker: async_sessionmaker[AsyncSession],
+    user_id: uuid.UUID,
+    latency: float,
+    release: bool,
+) -> None:
+    """One request: read, external call, write."""
+    async with session_maker() as db:
+        await db.execute(select(User.id).where(User.id == user_id))
+        if release:
+            await release_connection(db)
+        await asyncio.sleep(latency)  # Deepgram / LLM
+        db.add(Recording(user_id=user_id, duration_seconds=60, status="completed"))
+        await db.commit()
+
+
+async def _run(requests: int, latency: float, release: bool) -> float:
+    """Run all requests concurrently and return the wall time in seconds."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}",
+            pool_size=5,
+            max_overflow=10,
+            pool_timeout=600,
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+        async with session_maker() as db:
+            user = User(google_id="bench", email="bench@example.com")
+            db.add(user)
+            await db.commit()
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(_request(session_maker, user.id, latency, release) for _ in range(requests))
+        )
+        elapsed = time.perf_counter() - start
+        await engine.dispose()
+    return elapsed
+
+
+def main(requests: int = 60, latency: float = 0.5) -> None:
+    """Run the load test and print throughput for both strategies."""
+    held = asyncio.run(_run(requests, latency, release=False))
+    released = asyncio.run(_run(requests, latency, release=True))
+
+    print(f"{requests} concurrent requests, {latency * 1000:.0f}ms external latency")
+    print(f"connection held:     {held:6.2f}s  ({requests / held:7.1f} req/s)")
+    print(f"connection released: {released:6.2f}s  ({requests / released:7.1f} req/s)")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 60,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 0.5,
+    )
@@ -0,0 +1,43 @@
+"""Microbenchmark: per-request JWT verification overhead, with and without cache.
+
+Compares a full jose jwt.decode (what verify_token did on every request)
+with a cached verify_token call for the same cookie.
+
+Usage:
+    python -m benchmarks.bench_token_verification [iterations]
+"""
+
+import sys
+import timeit
+import uuid
+
+from jose import jwt
+
+from app.config import get_settings
+from app.core.security import create_access_token, verified_token_cache, verify_token
+
+
+def main(iterations: int = 20_000) -> None:
+    """Run the benchmark and print per-call timings."""
+    settings = get_settings()
+    token = create_access_token(user_id=uuid.uuid4(), email="bench@example.com")
+
+    def uncached() -> None:
+        jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
+
+    def cached() -> None:
+        verify_token(token)
+
+    verified_token_cache.clear()
+    verify_token(token)  # warm the cache
+
+    before = min(timeit.repeat(uncached, number=iterations, repeat=5)) / iterations
+    after = min(timeit.repeat(cached, number=iterations, repeat=5)) / iterations
+
+    print(f"jwt.decode per request:          {before * 1e6:8.2f} us")
+    print(f"cached verify_token per request: {after * 1e6:8.2f} us")
+    print(f"speedup:                        {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,145 @@
+"""Benchmark: expiring due trials in bulk vs one subscription at a time.
+
+Fills a temporary SQLite database with trial subscriptions, half of them
+past their end date, then compares:
+- per row: what GET /subscriptions/me and POST /recordings did on each
+  request (load the subscription, then expire_trial_if_needed's UPDATE,
+  commit and refresh), measured on a sample and extrapolated to every due trial;
+- sweep: expire_due_trials, one UPDATE over the trial_ends_at index.
+
+Usage:
+    python -m benchmarks.bench_trial_expiry [rows] [sample]
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.principal import invalidate_principal
+from app.models.base import Base
+from app.models.plan import Plan
+from app.models.subscription import Subscription, SubscriptionStatus
+from app.models.user import User
+from app.services import subscription as subscription_service
+
+BATCH_SIZE = 10_000
+
+
+async def _populate(session_maker: async_sessionmaker[AsyncSession], rows: int) -> list[uuid.UUID]:
+    """Insert rows trial subscriptions and return the users of the due ones."""
+    now = datetime.now(timezone.utc)
+    async with session_maker() as db:
+        plan = Plan(name="bench", display_name="Bench", price_monthly=0, quota_monthly=5)
+        db.add(plan)
+        await db.flush()
+        due: list[uuid.UUID] = []
+        for start in range(0, rows, BATCH_SIZE):
+            user_ids = [uuid.uuid4() for _ in range(start, min(rows, start + BATCH_SIZE))]
+            await db.execute(
+                insert(User),
+                [
+                    {"id": user_id, "google_id": str(user_id), "email": f"{user_id}@example.com"}
+                    for user_id in user_ids
+                ],
+            )
+            subscriptions = []
+            for offset, user_id in enumerate(user_ids):
+                is_due = (start + offset) % 2 == 0
+                if is_due:
+                    due.append(user_id)
+                subscriptions.append(
+                    {
+                        "id": uuid.uuid4(),
+                        "user_id": user_id,
+                        "plan_id": plan.id,
+                        "status": SubscriptionStatus.TRIAL.value,
+                        "quota_remaining": 5,
+                        "quota_total": 5,
+                        "trial_ends_at": now + timedelta(days=-1 if is_due else 1),
+                    }
+                )
+            await db.execute(insert(Subscription), subscriptions)
+        await db.commit()
+    return due
+
+
+async def _per_row(
+    session_maker: async_sessionmaker[AsyncSession], user_ids: list[uuid.UUID]
+) -> float:
+    """Expire the given users' trials one request at a time; return seconds."""
+    start = time.perf_counter()
+    for user_id in user_ids:
+        async with session_maker() as db:
+            subscription = await subscription_service.get_user_subscription(db, user_id)
+            # The writes of expire_trial_if_needed (SQLite returns naive
+            # datetimes, which is_trial_expired cannot compare)
+            subscription.status = SubscriptionStatus.EXPIRED.value
+            await db.commit()
+            await db.refresh(subscription)
+            invalidate_principal(user_id)
+    return time.perf_counter() - start
+
+
+async def _run(rows: int, sample: int) -> None:
+    """Build the database, run both strategies and print the results."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+        due = await _populate(session_maker, rows)
+
+        async with engine.connect() as conn:
+            plan = await conn.execute(
+                text(
+                    "EXPLAIN QUERY PLAN UPDATE subscriptions SET status = 'expired' "
+                    "WHERE status = 'trial' AND trial_ends_at < :now"
+                ),
+                {"now": datetime.now(timezone.utc)},
+            )
+            print("query plan:", "; ".join(row[-1] for row in plan))
+
+        per_row = await _per_row(session_maker, due[:sample])
+        per_row_total = per_row / sample * (len(due) - sample)
+
+        async with session_maker() as db:
+            start = time.perf_counter()
+            expired = await subscription_service.expire_due_trials(db)
+            sweep = time.perf_counter() - start
+            left = await db.scalar(
+                select(Subscription.id)
+                .where(
+                    Subscription.status == SubscriptionStatus.TRIAL.value,
+                    Subscription.trial_ends_at < datetime.now(timezone.utc),
+                )
+                .limit(1)
+            )
+        await engine.dispose()
+
+    print(f"{rows} trial subscriptions, {len(due)} due")
+    print(
+        f"per row: {per_row / sample * 1000:6.2f}ms per trial, "
+        f"~{per_row_total:7.2f}s for the {len(due) - sample} others (from {sample})"
+    )
+    print(f"sweep:   {sweep:6.2f}s for {expired} trials in one UPDATE")
+    assert left is None
+
+
+def main(rows: int = 100_000, sample: int = 1_000) -> None:
+    """Run the benchmark."""
+    asyncio.run(_run(rows, sample))
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 1_000,
+    )
@@ -0,0 +1,100 @@
+"""Memory benchmark: concurrent long uploads, buffered vs streamed to Deepgram.
+
+Simulates N concurrent uploads of a long recording arriving in 64 KiB
+chunks (like Request.stream()). The buffered path reads the whole body
+before transcribing (what POST /recordings does with audio.read()); the
+streamed path hands the chunks to transcribe_audio_stream. Deepgram is
+replaced by a fake client that consumes the body at network speed.
+
+Peak Python heap usage is measured with tracemalloc.
+
+Usage:
+    python -m benchmarks.bench_upload_memory [uploads] [size_mb]
+"""
+
+import asyncio
+import os
+import sys
+import tracemalloc
+from collections.abc import AsyncIterator
+from types import SimpleNamespace
+
+os.environ.setdefault("DEEPGRAM_API_KEY", "benchmark")
+
+from app.services import deepgram  # noqa: E402
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _fake_response() -> SimpleNamespace:
+    """Minimal Deepgram pre-recorded response."""
+    alternative = SimpleNamespace(transcript="transcript")
+    channel = SimpleNamespace(alternatives=[alternative], detected_language="fr")
+    return SimpleNamespace(
+        results=SimpleNamespace(channels=[channel]),
+        metadata=SimpleNamespace(duration=600.0),
+    )
+
+
+class _FakeMedia:
+    """Consumes the request body like an HTTP client sending it upstream."""
+
+    async def transcribe_file(self, request, **kwargs) -> SimpleNamespace:
+        if isinstance(request, bytes):
+            for _ in range(0, len(request), CHUNK_SIZE):
+                await asyncio.sleep(0)
+        else:
+            async for _ in request:
+                await asyncio.sleep(0)
+        return _fake_response()
+
+
+_fake_client = SimpleNamespace(listen=SimpleNamespace(v1=SimpleNamespace(media=_FakeMedia())))
+
+
+async def _body(size: int) -> AsyncIterator[bytes]:
+    """Yield an upload body chunk by chunk, as received from the network."""
+    for offset in range(0, size, CHUNK_SIZE):
+        yield os.urandom(min(CHUNK_SIZE, size - offset))
+        await asyncio.sleep(0)
+
+
+async def _buffered(size: int) -> None:
+    """Read the full body, then transcribe it."""
+    audio_data = b"".join([chunk async for chunk in _body(size)])
+    await _fake_client.listen.v1.media.transcribe_file(request=audio_data)
+    deepgram._build_result(_fake_response(), 0.0, len(audio_data))
+
+
+async def _streamed(size: int) -> None:
+    """Forward the body to the transcription client as it arrives."""
+    await deepgram.transcribe_audio_stream(_body(size))
+
+
+async def _peak_mb(upload, uploads: int, size: int) -> float:
+    """Run concurrent uploads and return peak traced memory in MiB."""
+    tracemalloc.start()
+    await asyncio.gather(*(upload(size) for _ in range(uploads)))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def main(uploads: int = 20, size_mb: int = 30) -> None:
+    """Run the benchmark and print peak memory for both paths."""
+    deepgram._client = _fake_client
+    size = size_mb * 1024 * 1024
+
+    buffered = asyncio.run(_peak_mb(_buffered, uploads, size))
+    streamed = asyncio.run(_peak_mb(_streamed, uploads, size))
+
+    print(f"{uploads} concurrent uploads of {size_mb} MiB")
+    print(f"buffered peak: {buffered:8.1f} MiB ({buffered / uploads:6.2f} MiB/upload)")
+    print(f"streamed peak: {streamed:8.1f} MiB ({streamed / uploads:6.2f} MiB/upload)")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 30,
+    )